@@ -86,6 +86,8 @@ for line in jax_req:  # inject jaxlib requirement
 EXTRAS_REQUIRE = {
     "test": ["pytest", "pytest-cov", "pytest-forked", "xarray"],
     "jax": jax_req,
+    "compression": ["hdf5plugin"],
+    "zarr": ["zarr>=3"],
 }
 
 
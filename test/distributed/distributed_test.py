@@ -22,11 +22,55 @@ def test_scatter():
     run_dist_kernel("scatter_kernel.py")
 
 
+def test_gather_scatter_roundtrip():
+    run_dist_kernel("roundtrip_kernel.py")
+
+
+def test_exchange():
+    run_dist_kernel("exchange_kernel.py")
+
+
+def test_exchange_plan():
+    run_dist_kernel("exchange_plan_kernel.py")
+
+
+def test_zarr_output(tmpdir):
+    pytest.importorskip("zarr")
+    os.chdir(tmpdir)
+    run_dist_kernel("zarr_kernel.py")
+
+
+def test_staged_restart(tmpdir):
+    pytest.importorskip("zarr")
+    os.chdir(tmpdir)
+    run_dist_kernel("staged_restart_kernel.py")
+
+
+def test_netcdf_output(tmpdir):
+    h5py = pytest.importorskip("h5py")
+
+    if not h5py.get_config().mpi:
+        pytest.skip("parallel netCDF output requires h5py with MPI support")
+
+    os.chdir(tmpdir)
+    run_dist_kernel("netcdf_kernel.py")
+
+
+def test_forcing_stream(tmpdir):
+    os.chdir(tmpdir)
+    run_dist_kernel("forcing_kernel.py")
+
+
+def test_north_atlantic_setup(tmpdir):
+    os.chdir(tmpdir)
+    run_dist_kernel("north_atlantic_kernel.py")
+
+
 def test_acc():
     run_dist_kernel("acc_kernel.py")
 
 
-@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc"])
+@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc", "krylov", "multigrid"])
 @pytest.mark.parametrize("streamfunction", [True, False])
 def test_linear_solver(solver, streamfunction):
     from veros import runtime_settings
@@ -0,0 +1,89 @@
+import sys
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import (
+    exchange_overlap,
+    start_exchange_overlap,
+    get_process_neighbors,
+    _get_overlap_slices,
+)
+
+
+def reference_exchange(arr, var_grid, cyclic):
+    # exchange one direction after another, without packing
+    arr = np.array(arr)
+    overlap_slices = _get_overlap_slices(var_grid)
+
+    if overlap_slices is None:
+        return arr
+
+    directions, overlap_slices_from, overlap_slices_to = overlap_slices
+    proc_neighbors = get_process_neighbors(cyclic)
+
+    for send_dir, recv_dir in directions:
+        send_proc = proc_neighbors[send_dir]
+        recv_proc = proc_neighbors[recv_dir]
+
+        recv_idx = overlap_slices_to[recv_dir]
+        recv_buf = np.empty_like(arr[recv_idx])
+
+        rs.mpi_comm.Sendrecv(
+            sendbuf=np.ascontiguousarray(arr[overlap_slices_from[send_dir]]),
+            dest=MPI.PROC_NULL if send_proc is None else send_proc,
+            recvbuf=recv_buf,
+            source=MPI.PROC_NULL if recv_proc is None else recv_proc,
+        )
+
+        if recv_proc is not None:
+            arr[recv_idx] = recv_buf
+
+    return arr
+
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    res = np.empty(1)
+    comm.Recv(res, 0)
+
+    assert res[0] == 0, res
+
+else:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+    from veros.core.operators import numpy as npx
+
+    var_grids = [("xt", "yt", "zt"), ("xu", "yt"), ("xt",), ("yu", "zt"), ("zt",), ("xt", "yt")]
+    shapes = [(8, 6, 3), (8, 6), (8,), (6, 3), (3,), (8, 6)]
+    dtypes = ["float64", "float64", "float64", "float32", "float64", "int32"]
+
+    max_diff = 0.0
+
+    for cyclic in (True, False):
+        rng = np.random.default_rng(rst.proc_rank)
+        arrs = [npx.asarray((100 * rng.random(shape)).astype(dtype)) for shape, dtype in zip(shapes, dtypes)]
+
+        expected = [reference_exchange(arr, var_grid, cyclic) for arr, var_grid in zip(arrs, var_grids)]
+
+        results = [[exchange_overlap(arr, var_grid, cyclic) for arr, var_grid in zip(arrs, var_grids)]]
+
+        # exchange twice to reuse packed buffers, plus two identical exchanges pending at once
+        for _ in range(2):
+            results.append(start_exchange_overlap(arrs, var_grids, cyclic).wait())
+
+        handles = [start_exchange_overlap(arrs, var_grids, cyclic) for _ in range(2)]
+        results.extend(handle.wait() for handle in handles)
+
+        for got in results:
+            for arr_expected, arr_got in zip(expected, got):
+                assert arr_got.dtype == arr_expected.dtype
+                max_diff = max(max_diff, float(np.abs(arr_expected - np.asarray(arr_got)).max()))
+
+    max_diff = rs.mpi_comm.allreduce(max_diff, op=MPI.MAX)
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array([max_diff]), 0)
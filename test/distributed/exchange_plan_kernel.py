@@ -0,0 +1,126 @@
+import sys
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import (
+    ExchangePlan,
+    build_exchange_plans,
+    get_exchange_plan,
+    get_process_neighbors,
+    start_exchange_overlap,
+    _exchange_plan_cache,
+    _get_overlap_slices,
+)
+
+
+def reference_exchange(arr, var_grid, cyclic):
+    # exchange one direction after another, without packing
+    arr = np.array(arr)
+    directions, overlap_slices_from, overlap_slices_to = _get_overlap_slices(var_grid)
+    proc_neighbors = get_process_neighbors(cyclic)
+
+    for send_dir, recv_dir in directions:
+        send_proc = proc_neighbors[send_dir]
+        recv_proc = proc_neighbors[recv_dir]
+
+        recv_idx = overlap_slices_to[recv_dir]
+        recv_buf = np.empty_like(arr[recv_idx])
+
+        rs.mpi_comm.Sendrecv(
+            sendbuf=np.ascontiguousarray(arr[overlap_slices_from[send_dir]]),
+            dest=MPI.PROC_NULL if send_proc is None else send_proc,
+            recvbuf=recv_buf,
+            source=MPI.PROC_NULL if recv_proc is None else recv_proc,
+        )
+
+        if recv_proc is not None:
+            arr[recv_idx] = recv_buf
+
+    return arr
+
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    res = np.empty(1)
+    comm.Recv(res, 0)
+
+    assert res[0] == 0, res
+
+else:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+    from veros.core.operators import numpy as npx
+
+    shapes = [(8, 6, 3), (8, 6)]
+    dtypes = ["float64", "float32"]
+    var_grids = [("xt", "yt"), ("xu", "yu")]
+
+    max_diff = 0.0
+    errors = []
+
+    for cyclic in (True, False):
+        build_exchange_plans([(shapes, dtypes, var_grids)], cyclic)
+        num_plans = len(_exchange_plan_cache)
+
+        rng = np.random.default_rng(rst.proc_rank)
+        arrs = [npx.asarray((100 * rng.random(shape)).astype(dtype)) for shape, dtype in zip(shapes, dtypes)]
+
+        plan = get_exchange_plan(arrs, var_grids, cyclic)
+
+        # several steps with changing data restart the same persistent requests
+        for step in range(3):
+            arrs = [arr + step for arr in arrs]
+            expected = [reference_exchange(arr, var_grid, cyclic) for arr, var_grid in zip(arrs, var_grids)]
+
+            arrs = start_exchange_overlap(arrs, var_grids, cyclic).wait()
+
+            if get_exchange_plan(arrs, var_grids, cyclic) is not plan:
+                errors.append("plan was not reused")
+
+            for arr_expected, arr_got in zip(expected, arrs):
+                max_diff = max(max_diff, float(np.abs(arr_expected - np.asarray(arr_got)).max()))
+
+        if len(_exchange_plan_cache) != num_plans:
+            errors.append("plan was rebuilt after setup")
+
+        # while the cached plan is in use, a non-persistent plan takes over
+        expected = [reference_exchange(arr, var_grid, cyclic) for arr, var_grid in zip(arrs, var_grids)]
+        handles = [start_exchange_overlap(arrs, var_grids, cyclic) for _ in range(2)]
+
+        if not isinstance(handles[1]._plan, ExchangePlan) or handles[1]._plan is plan:
+            errors.append("no fallback plan while cached plan is in use")
+
+        if handles[1]._plan._persistent:
+            errors.append("fallback plan uses persistent requests")
+
+        for handle in handles:
+            for arr_expected, arr_got in zip(expected, handle.wait()):
+                max_diff = max(max_diff, float(np.abs(arr_expected - np.asarray(arr_got)).max()))
+
+    # plans on a different communicator are built separately
+    comm = rs.mpi_comm
+    object.__setattr__(rs, "mpi_comm", comm.Dup())
+    try:
+        if get_exchange_plan(arrs, var_grids, False) is plan:
+            errors.append("plan was reused on another communicator")
+        arrs_dup = start_exchange_overlap(arrs, var_grids, False).wait()
+        for arr_expected, arr_got in zip(
+            [reference_exchange(arr, var_grid, False) for arr, var_grid in zip(arrs, var_grids)], arrs_dup
+        ):
+            max_diff = max(max_diff, float(np.abs(arr_expected - np.asarray(arr_got)).max()))
+    finally:
+        rs.mpi_comm.Free()
+        object.__setattr__(rs, "mpi_comm", comm)
+
+    if errors:
+        print(rst.proc_rank, errors, file=sys.stderr)
+        max_diff = float("inf")
+
+    max_diff = rs.mpi_comm.allreduce(max_diff, op=MPI.MAX)
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array([max_diff]), 0)
@@ -0,0 +1,52 @@
+import sys
+
+import h5py
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import gather
+
+rs.linear_solver = "scipy"
+rs.diskless_mode = True
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.acc import ACCSetup  # noqa: E402
+from veros.tools import ForcingStream  # noqa: E402
+
+times = np.array([0.0, 1.0, 3.0]) * 86400.0
+query_times = times[:2].mean(), times[1:].mean()
+
+if rst.proc_num == 1:
+    nx, ny = 30, 42
+    records = np.random.default_rng(1).normal(size=(len(times), ny, nx))
+
+    with h5py.File("forcing.h5", "w") as f:
+        f.create_dataset("time", data=times)
+        f.create_dataset("taux", data=records)
+
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    for query_time in query_times:
+        res = np.empty((nx + 4, ny + 4))
+        comm.Recv(res, 0)
+
+        expected = np.array([[np.interp(query_time, times, records[:, j, i]) for j in range(ny)] for i in range(nx)])
+        np.testing.assert_allclose(res[2:-2, 2:-2], expected, rtol=1e-12)
+
+        # cyclic boundaries
+        np.testing.assert_array_equal(res[:2, 2:-2], res[-4:-2, 2:-2])
+else:
+    sim = ACCSetup()
+    sim.setup()
+
+    with ForcingStream(sim.state, "forcing.h5", "taux") as stream:
+        for query_time in query_times:
+            res = gather(stream.get(query_time), sim.state.dimensions, ("xt", "yt"))
+
+            if rst.proc_rank == 0:
+                rs.mpi_comm.Get_parent().Send(np.array(res), 0)
@@ -0,0 +1,88 @@
+import sys
+
+import h5netcdf
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst, veros_routine
+from veros.diagnostics.transforms import OutputTransform
+
+rs.linear_solver = "scipy"
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.acc import ACCSetup  # noqa: E402
+
+
+class NetCDFSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        for name, diag in state.diagnostics.items():
+            diag.sampling_frequency = state.settings.dt_tracer
+            diag.output_frequency = state.settings.dt_tracer
+            diag.output_path = f"{{identifier}}.{name}.nc"
+
+        state.diagnostics["averages"].output_variables = ["temp", "u", "psi"]
+
+        # regions and strides cross subdomain boundaries, coarsened blocks do not
+        state.diagnostics["snapshot"].output_transforms = {
+            "temp": OutputTransform("coarse", coarsen=3),
+            "u": OutputTransform("box", region=(10, 30, -30, 0), levels=[0, -1]),
+            "psi": OutputTransform("sub", stride=(2, 3)),
+        }
+
+
+def compare_files(path_1, path_2):
+    with h5netcdf.File(path_1, "r") as file_1, h5netcdf.File(path_2, "r") as file_2:
+        assert set(file_1.variables) == set(file_2.variables)
+
+        for key in file_1.variables:
+            # salt is not used by this setup, contains only numerical noise
+            if "salt" in key:
+                continue
+
+            arr_1, arr_2 = file_1.variables[key][...], file_2.variables[key][...]
+            assert arr_1.shape == arr_2.shape, key
+            atol = 1e-10 * np.abs(arr_1).max() if arr_1.size else 0
+            np.testing.assert_allclose(arr_1, arr_2, rtol=1e-6, atol=atol, err_msg=key)
+
+
+dt_tracer = 86_400 / 2
+
+sim = NetCDFSetup(
+    override=dict(
+        identifier="serial" if rst.proc_num == 1 else "parallel",
+        dt_tracer=dt_tracer,
+        runlen=4 * dt_tracer,
+        restart_output_filename=None,
+    )
+)
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    try:
+        sim.setup()
+        sim.run()
+    except Exception as exc:
+        print(str(exc))
+        comm.Abort(1)
+        raise
+
+    # wait until all output is written
+    comm.Recv(np.empty(1), 0)
+
+    for name in ("snapshot", "averages", "energy", "overturning"):
+        compare_files(f"serial.{name}.nc", f"parallel.{name}.nc")
+else:
+    sim.setup()
+    sim.run()
+
+    # output files are closed at exit of the main loop
+    rs.mpi_comm.barrier()
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.zeros(1), 0)
@@ -0,0 +1,197 @@
+import sys
+
+import h5netcdf
+import numpy as np
+from PIL import Image
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst, veros_routine
+from veros.distributed import gather
+
+rs.linear_solver = "scipy"
+rs.diskless_mode = True
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.north_atlantic import north_atlantic  # noqa: E402
+
+MISSING = -1e20
+
+
+def write_file(path, dims, variables):
+    with h5netcdf.File(path, "w") as f:
+        f.dimensions.update(dims)
+        for key, (var_dims, data) in variables.items():
+            f.create_variable(key, var_dims, data=data)
+
+
+def create_input_files():
+    """Small stand-ins for the setup assets, with holes that cross subdomain boundaries."""
+    # topography
+    x, y = np.linspace(-100, 20, 241), np.linspace(-20, 72, 185)
+    xx, yy = np.meshgrid(x, y)
+    z = -4000 + 1500 * np.sin(xx / 15) * np.cos(yy / 10)
+    z[(xx + 50) ** 2 + (yy - 30) ** 2 < 15**2] = 100
+    write_file("topo.nc", {"x": x.size, "y": y.size}, {"x": (("x",), x), "y": (("y",), y), "z": (("y", "x"), z)})
+
+    mask = ((xx > 0) & (yy > 60)).astype("uint8")
+    Image.fromarray(np.flipud(mask)).save("topo_mask.png")
+
+    # forcing, longitudes in degrees east and depth in cm
+    xt, yt, zt = np.arange(250, 381, 1.5), np.arange(-25, 76, 1.5), np.linspace(500, 450_000, 15)
+    xu, yu = xt + 0.75, yt + 0.75
+    xx, yy, zz = np.meshgrid(xt - 360, yt, zt, indexing="ij")
+    land = (xx + 40) ** 2 + (yy - 20) ** 2 < (20 - zz / 50_000) ** 2
+    months = np.arange(12)[:, np.newaxis, np.newaxis]
+
+    def with_holes(data, holes):
+        return np.where(holes, MISSING, data)
+
+    temp = with_holes(20 * np.cos(yy / 40) - zz / 30_000, land).T
+    salt = with_holes(1e-3 * np.sin(xx / 20) * np.exp(-zz / 100_000), land).T
+    surface = (yy[..., 0] + xx[..., 0] / 10).T + months
+    surface = with_holes(surface, land[..., 0].T)
+    tau = with_holes(np.cos(yy[..., 0] / 20).T + 0.1 * months, land[..., 0].T)
+
+    write_file(
+        "forcing.nc",
+        {"xt": xt.size, "yt": yt.size, "zt": zt.size, "xu": xu.size, "yu": yu.size, "month": 12},
+        {
+            "xt": (("xt",), xt),
+            "yt": (("yt",), yt),
+            "zt": (("zt",), zt),
+            "xu": (("xu",), xu),
+            "yu": (("yu",), yu),
+            "temp_ic": (("zt", "yt", "xt"), temp),
+            "salt_ic": (("zt", "yt", "xt"), salt),
+            "taux": (("month", "yu", "xu"), tau),
+            "tauy": (("month", "yu", "xu"), -tau),
+            **{key: (("month", "yt", "xt"), surface) for key in ("sst_clim", "sss_clim", "sst_rest", "sss_rest")},
+        },
+    )
+
+    # restoring, depth in m (negative), zero marks missing data
+    rest_zt = np.linspace(-5000, -5, 12)
+    xx, yy, zz = np.meshgrid(xt - 360, yt, rest_zt, indexing="ij")
+    sponge = np.where((yy > 60) | (yy < -10), 1e-6, 0.0).T[np.newaxis]
+    star = np.where(land[..., :12] | (xx > 10), 0.0, 10 + yy / 10 + zz / 1000).T + months[..., np.newaxis]
+
+    write_file(
+        "restoring.nc",
+        {"xt": xt.size, "yt": yt.size, "zt": rest_zt.size, "month": 12, "record": 1},
+        {
+            "xt": (("xt",), xt),
+            "yt": (("yt",), yt),
+            "zt": (("zt",), rest_zt),
+            "tscl": (("record", "zt", "yt", "xt"), sponge),
+            "t_star": (("month", "zt", "yt", "xt"), star),
+            "s_star": (("month", "zt", "yt", "xt"), 35 - star / 100),
+        },
+    )
+
+
+north_atlantic.DATA_FILES = {"topography": "topo.nc", "forcing": "forcing.nc", "restoring": "restoring.nc"}
+north_atlantic.TOPO_MASK_FILE = "topo_mask.png"
+# holes are larger than that, so the halo used to fill them has to grow
+north_atlantic.FILL_HALO = 1
+
+
+def interpolate_baseline(vs):
+    """Forcing interpolated on the global grid, as done by the setup before it was distributed."""
+    from veros.tools import interpolate
+
+    def read(path, key):
+        with h5netcdf.File(path, "r") as f:
+            return np.asarray(f.variables[key]).T
+
+    t_hor = (vs.xt[2:-2], vs.yt[2:-2])
+    t_grid = t_hor + (vs.zt,)
+
+    forc_coords = [read("forcing.nc", k) for k in ("xt", "yt", "zt")]
+    forc_coords[0] = forc_coords[0] - 360
+    forc_coords[2] = -0.01 * forc_coords[2][::-1]
+    forc_u_coords = [read("forcing.nc", "xu") - 360, read("forcing.nc", "yu")]
+
+    rest_coords = [read("restoring.nc", k) for k in ("xt", "yt", "zt")]
+    rest_coords[0] = rest_coords[0] - 360
+
+    def monthly(coords, data, grid, **kwargs):
+        return np.stack([interpolate(coords, data[..., k], grid, **kwargs) for k in range(12)], axis=-1)
+
+    temp = interpolate(forc_coords, read("forcing.nc", "temp_ic")[..., ::-1], t_grid, missing_value=MISSING)
+    salt = interpolate(forc_coords, read("forcing.nc", "salt_ic")[..., ::-1], t_grid, missing_value=MISSING)
+
+    return {
+        "temp": vs.maskT[2:-2, 2:-2, :] * temp,
+        "salt": vs.maskT[2:-2, 2:-2, :] * (35.0 + 1000 * salt),
+        "taux": monthly(forc_u_coords, read("forcing.nc", "taux"), t_hor, missing_value=MISSING) / 10.0,
+        "tauy": monthly(forc_u_coords, read("forcing.nc", "tauy"), t_hor, missing_value=MISSING) / 10.0,
+        "sst_clim": monthly(forc_coords[:-1], read("forcing.nc", "sst_clim"), t_hor, missing_value=MISSING),
+        "sss_rest": monthly(forc_coords[:-1], read("forcing.nc", "sss_rest"), t_hor, missing_value=MISSING) / 100.0,
+        "rest_tscl": interpolate(rest_coords, read("restoring.nc", "tscl")[..., 0], t_grid),
+        "t_star": monthly(rest_coords, read("restoring.nc", "t_star"), t_grid, missing_value=0.0),
+    }
+
+
+class SyntheticNorthAtlanticSetup(north_atlantic.NorthAtlanticSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        state.diagnostics.clear()
+
+
+COMPARE_VARS = {
+    "kbot": ("xt", "yt"),
+    "temp": ("xt", "yt", "zt", "timesteps"),
+    "salt": ("xt", "yt", "zt", "timesteps"),
+    "taux": ("xt", "yt", "nmonths"),
+    "tauy": ("xt", "yt", "nmonths"),
+    "sst_clim": ("xt", "yt", "nmonths"),
+    "sss_clim": ("xt", "yt", "nmonths"),
+    "sst_rest": ("xt", "yt", "nmonths"),
+    "sss_rest": ("xt", "yt", "nmonths"),
+    "t_star": ("xt", "yt", "zt", "nmonths"),
+    "s_star": ("xt", "yt", "zt", "nmonths"),
+    "rest_tscl": ("xt", "yt", "zt"),
+}
+
+sim = SyntheticNorthAtlanticSetup(override=dict(nx=40, ny=40, nz=12, runlen=0))
+
+if rst.proc_num == 1:
+    create_input_files()
+
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    try:
+        sim.setup()
+    except Exception as exc:
+        print(str(exc))
+        comm.Abort(1)
+        raise
+
+    # serial results are the same as before the setup was distributed
+    for var, expected in interpolate_baseline(sim.state.variables).items():
+        actual = np.asarray(getattr(sim.state.variables, var))[2:-2, 2:-2]
+        if var in ("temp", "salt"):
+            actual = actual[..., sim.state.variables.tau]
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12, err_msg=var)
+
+    for var in COMPARE_VARS:
+        serial = np.asarray(getattr(sim.state.variables, var))
+        parallel = np.empty_like(serial)
+        comm.Recv(parallel, 0)
+
+        assert np.all(np.isfinite(serial)), var
+        # overlap at the global boundary is not set by the setup
+        np.testing.assert_array_equal(serial[2:-2, 2:-2], parallel[2:-2, 2:-2], err_msg=var)
+else:
+    sim.setup()
+
+    for var, dims in COMPARE_VARS.items():
+        var_global = gather(getattr(sim.state.variables, var), sim.state.dimensions, dims)
+
+        if rst.proc_rank == 0:
+            rs.mpi_comm.Get_parent().Send(np.array(var_global), 0)
@@ -0,0 +1,60 @@
+import sys
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst
+from veros.distributed import gather, scatter
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    res = np.empty(1)
+    comm.Recv(res, 0)
+
+    assert res[0] == 0, res
+
+else:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+    from veros.core.operators import numpy as npx
+
+    dimensions = dict(xt=4, yt=6)
+    var_grids = [("xt", "yt", "zt"), ("xt", "zt"), ("yt",), ("xt", "yt")]
+    global_shapes = [(8, 10, 3), (8, 3), (10,), (8, 10)]
+    local_shapes = [(6, 7, 3), (6, 3), (7,), (6, 7)]
+    dtypes = ["float64", "float64", "float32", "int32"]
+
+    rng = np.random.default_rng(42)
+    max_diff = 0.0
+
+    for var_grid, global_shape, local_shape, dtype in zip(var_grids, global_shapes, local_shapes, dtypes):
+        global_arr = (100 * rng.random(global_shape)).astype(dtype)
+
+        if rst.proc_rank == 0:
+            arr = npx.asarray(global_arr)
+        else:
+            arr = npx.empty(local_shape, dtype=dtype)
+
+        local_arr = scatter(arr, dimensions, var_grid)
+        assert local_arr.shape == local_shape, local_arr.shape
+        assert local_arr.dtype == global_arr.dtype
+
+        # whole local array must match the global array, including overlap
+        px, py = rst.proc_rank % 2, rst.proc_rank // 2
+        window = tuple(
+            slice(px * 2, px * 2 + 6) if dim == "xt" else slice(py * 3, py * 3 + 7) if dim == "yt" else slice(None)
+            for dim in var_grid
+        )
+        max_diff = max(max_diff, float(np.abs(np.asarray(local_arr) - global_arr[window]).max()))
+
+        gathered_arr = gather(local_arr, dimensions, var_grid)
+
+        if rst.proc_rank == 0:
+            max_diff = max(max_diff, float(np.abs(np.asarray(gathered_arr) - global_arr).max()))
+
+    max_diff = rs.mpi_comm.allreduce(max_diff, op=MPI.MAX)
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array([max_diff]), 0)
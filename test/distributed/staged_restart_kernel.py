@@ -0,0 +1,96 @@
+import os
+import sys
+
+import numpy as np
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst, veros_routine
+from veros.distributed import gather
+from veros.restart import flush_staged_restarts
+
+rs.linear_solver = "scipy"
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.acc import ACCSetup  # noqa: E402
+
+
+class StagedSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        state.diagnostics.clear()
+
+
+dt_tracer = 86_400 / 2
+timesteps = 3
+
+sim = StagedSetup(
+    override=dict(
+        identifier="serial" if rst.proc_num == 1 else "parallel",
+        dt_tracer=dt_tracer,
+        runlen=timesteps * dt_tracer,
+        restart_output_filename="{identifier}_{itt:0>4d}.restart.zarr",
+        restart_frequency=dt_tracer,
+        restart_num_deltas=2,
+        restart_delta_max_fraction=1.0,
+    )
+)
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    try:
+        sim.setup()
+        sim.run()
+    except Exception as exc:
+        print(str(exc))
+        comm.Abort(1)
+        raise
+
+    restarted_temp = np.empty_like(sim.state.variables.temp)
+    comm.Recv(restarted_temp, 0)
+
+    np.testing.assert_allclose(restarted_temp, sim.state.variables.temp, rtol=1e-6, atol=1e-10)
+
+    # all restarts are complete in their final location, no leftovers of the copies
+    for itt in range(1, timesteps + 1):
+        assert os.path.isdir(f"parallel_{itt:0>4d}.restart.zarr")
+
+    assert not [f for f in os.listdir() if f.startswith((".partial.", ".drained."))]
+else:
+    # all processes stage into the same directory, the last restart is a delta
+    object.__setattr__(rs, "restart_staging_dir", "staging")
+
+    sim.setup()
+    sim.run()
+    flush_staged_restarts()
+
+    # wait until restarts are copied by all processes
+    rs.mpi_comm.barrier()
+
+    # every process keeps its own copy of the latest restart
+    staged = [f for f in os.listdir("staging") if f.endswith(".zarr")]
+    assert len(staged) == rst.proc_num, staged
+    assert sum(f.startswith(f"rank{rst.proc_rank}.") for f in staged) == 1
+
+    restarted = StagedSetup(
+        override=dict(
+            identifier="restarted",
+            dt_tracer=dt_tracer,
+            runlen=timesteps * dt_tracer,
+            restart_input_filename=f"parallel_{timesteps:0>4d}.restart.zarr",
+            restart_output_filename=None,
+        )
+    )
+    restarted.setup()
+
+    dims = ("xt", "yt", "zt", "timesteps")
+    temp_global = gather(restarted.state.variables.temp, restarted.state.dimensions, dims)
+    temp_expected = gather(sim.state.variables.temp, sim.state.dimensions, dims)
+
+    if rst.proc_rank == 0:
+        np.testing.assert_array_equal(temp_global, temp_expected)
+        rs.mpi_comm.Get_parent().Send(np.array(temp_global), 0)
@@ -0,0 +1,110 @@
+import sys
+
+import numpy as np
+import zarr
+from mpi4py import MPI
+
+from veros import runtime_settings as rs, runtime_state as rst, veros_routine
+from veros.distributed import gather
+from veros.diagnostics.transforms import OutputTransform
+
+rs.linear_solver = "scipy"
+
+if rst.proc_num > 1:
+    rs.num_proc = (2, 2)
+    assert rst.proc_num == 4
+
+
+from veros.setups.acc import ACCSetup  # noqa: E402
+
+
+class ZarrSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        for name, diag in state.diagnostics.items():
+            diag.sampling_frequency = state.settings.dt_tracer
+            diag.output_frequency = state.settings.dt_tracer
+            diag.output_path = f"{{identifier}}.{name}.zarr"
+
+        state.diagnostics["averages"].output_variables = ["temp", "u", "psi"]
+
+        # regions and strides cross subdomain boundaries, coarsened blocks do not
+        state.diagnostics["snapshot"].output_transforms = {
+            "temp": OutputTransform("coarse", coarsen=3),
+            "u": OutputTransform("box", region=(10, 30, -30, 0), levels=[0, -1]),
+            "psi": OutputTransform("sub", stride=(2, 3)),
+        }
+
+
+def compare_groups(group_1, group_2):
+    assert set(group_1.array_keys()) == set(group_2.array_keys())
+    assert set(group_1.group_keys()) == set(group_2.group_keys())
+
+    for key in group_1.array_keys():
+        # salt is not used by this setup, contains only numerical noise
+        if "salt" in key:
+            continue
+
+        arr_1, arr_2 = group_1[key][...], group_2[key][...]
+        assert arr_1.shape == arr_2.shape, key
+        atol = 1e-10 * np.abs(arr_1).max() if arr_1.size else 0
+        np.testing.assert_allclose(arr_1, arr_2, rtol=1e-6, atol=atol, err_msg=key)
+
+    for key in group_1.group_keys():
+        compare_groups(group_1[key], group_2[key])
+
+
+dt_tracer = 86_400 / 2
+
+sim = ZarrSetup(
+    override=dict(
+        identifier="serial" if rst.proc_num == 1 else "parallel",
+        dt_tracer=dt_tracer,
+        runlen=4 * dt_tracer,
+        restart_output_filename="{identifier}.restart.zarr",
+    )
+)
+
+if rst.proc_num == 1:
+    comm = MPI.COMM_SELF.Spawn(sys.executable, args=["-m", "mpi4py", sys.argv[-1]], maxprocs=4)
+
+    try:
+        sim.setup()
+        sim.run()
+    except Exception as exc:
+        print(str(exc))
+        comm.Abort(1)
+        raise
+
+    # wait until all output is written and read back
+    restarted_temp = np.empty_like(sim.state.variables.temp)
+    comm.Recv(restarted_temp, 0)
+
+    for name in ("snapshot", "averages", "energy", "overturning", "restart"):
+        compare_groups(
+            zarr.open_group(f"serial.{name}.zarr", mode="r"), zarr.open_group(f"parallel.{name}.zarr", mode="r")
+        )
+
+    np.testing.assert_array_equal(restarted_temp, zarr.open_group("parallel.restart.zarr", mode="r")["core/temp"][...])
+else:
+    sim.setup()
+    sim.run()
+
+    # wait until restart is written by all processes
+    rs.mpi_comm.barrier()
+
+    restarted = ZarrSetup(
+        override=dict(
+            identifier="restarted",
+            dt_tracer=dt_tracer,
+            runlen=4 * dt_tracer,
+            restart_input_filename="parallel.restart.zarr",
+            restart_output_filename=None,
+        )
+    )
+    restarted.setup()
+
+    temp_global = gather(restarted.state.variables.temp, restarted.state.dimensions, ("xt", "yt", "zt", "timesteps"))
+
+    if rst.proc_rank == 0:
+        rs.mpi_comm.Get_parent().Send(np.array(temp_global), 0)
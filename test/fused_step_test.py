@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+
+from veros import veros_routine
+from veros.setups.acc import ACCSetup
+
+
+class FusedSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        for diag in state.diagnostics.values():
+            diag.sampling_frequency = state.settings.dt_tracer
+            diag.output_frequency = float("inf")
+
+
+@pytest.fixture(autouse=True)
+def set_options():
+    from veros import runtime_settings
+
+    object.__setattr__(runtime_settings, "diskless_mode", True)
+    try:
+        yield
+    finally:
+        object.__setattr__(runtime_settings, "diskless_mode", False)
+        object.__setattr__(runtime_settings, "fuse_timestep", False)
+
+
+def _run_setup(fuse_timestep, timesteps):
+    from veros import runtime_settings
+
+    object.__setattr__(runtime_settings, "fuse_timestep", fuse_timestep)
+
+    sim = FusedSetup(override=dict(runlen=timesteps * 86_400 / 2, dt_tracer=86_400 / 2))
+    sim.setup()
+    sim.run()
+    return sim
+
+
+def test_fused_timestep():
+    from veros import runtime_settings
+
+    if runtime_settings.backend != "jax":
+        pytest.skip("fused time steps require JAX")
+
+    sim_fused = _run_setup(fuse_timestep=True, timesteps=5)
+    sim_ref = _run_setup(fuse_timestep=False, timesteps=5)
+
+    from veros.core import momentum
+
+    # SciPy streamfunction solver cannot be traced, the rest of the momentum routine is fused
+    eager_routines = [routine for name, routine in sim_fused._fused_main_loop[1].segments if name is not None]
+    assert eager_routines == [momentum.solve_external_mode]
+
+    for var in sim_ref.state.variables.fields():
+        v1 = sim_fused.state.variables.get(var)
+        v2 = sim_ref.state.variables.get(var)
+        np.testing.assert_allclose(v1, v2, atol=1e-12, rtol=1e-8, err_msg=var)
@@ -75,7 +75,7 @@ def assert_solution(state, rhs, sol, boundary_val=None, tol=1e-8):
 
 
 @pytest.mark.parametrize("cyclic", [True, False])
-@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc"])
+@pytest.mark.parametrize("solver", ["scipy", "scipy_jax", "petsc", "krylov", "multigrid"])
 @pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
 def test_solver(solver, solver_state, cyclic, problem):
     from veros import runtime_settings
@@ -95,6 +95,14 @@ def test_solver(solver, solver_state, cyclic, problem):
     elif solver == "petsc":
         petsc_mod = pytest.importorskip("veros.core.external.solvers.petsc_")
         solver_class = petsc_mod.PETScSolver
+    elif solver == "krylov":
+        from veros.core.external.solvers.krylov import KrylovSolver
+
+        solver_class = KrylovSolver
+    elif solver == "multigrid":
+        from veros.core.external.solvers.multigrid import MultigridSolver
+
+        solver_class = MultigridSolver
     else:
         raise ValueError("unknown solver")
 
@@ -108,3 +116,96 @@ def test_solver(solver, solver_state, cyclic, problem):
 
     sol = solver_class(solver_state).solve(solver_state, rhs, x0, boundary_val=10)
     assert_solution(solver_state, rhs, sol, tol=1e-8, boundary_val=10)
+
+
+@pytest.mark.parametrize("cyclic", [False])
+@pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
+def test_scipy_solver_cache(solver_state, tmp_path, monkeypatch):
+    from veros import runtime_settings
+    from veros.core.operators import numpy as npx
+    from veros.core.external.solvers import scipy as scipy_solver
+
+    settings = solver_state.settings
+
+    rhs = npx.ones((settings.nx + 4, settings.ny + 4))
+    x0 = npx.asarray(np.random.rand(settings.nx + 4, settings.ny + 4))
+
+    object.__setattr__(runtime_settings, "solver_cache_dir", str(tmp_path))
+    try:
+        sol_uncached = scipy_solver.SciPySolver(solver_state).solve(solver_state, rhs, x0)
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+
+        def no_factorization(*args, **kwargs):
+            raise AssertionError("preconditioner should have been read from cache")
+
+        monkeypatch.setattr(scipy_solver.spalg, "spilu", no_factorization)
+        sol_cached = scipy_solver.SciPySolver(solver_state).solve(solver_state, rhs, x0)
+    finally:
+        object.__setattr__(runtime_settings, "solver_cache_dir", "")
+
+    assert_solution(solver_state, rhs, sol_cached, tol=1e-8)
+    np.testing.assert_allclose(sol_cached, sol_uncached, rtol=1e-10)
+
+
+@pytest.mark.parametrize("cyclic", [False])
+@pytest.mark.parametrize("problem", ["streamfunction", "pressure"])
+def test_solution_history(solver_state):
+    from veros.core.operators import numpy as npx
+    from veros.core.external.solvers.scipy import SciPySolver
+    from veros.core.external.solvers.history import SolutionHistory
+
+    settings = solver_state.settings
+    rng = np.random.default_rng(17)
+
+    solver = SciPySolver(solver_state)
+    history = SolutionHistory(size=2)
+
+    x0 = npx.zeros((settings.nx + 4, settings.ny + 4))
+    rhs_history = [npx.asarray(rng.random((settings.nx + 4, settings.ny + 4))) for _ in range(3)]
+
+    # without history, the initial guess is returned unchanged
+    assert history.initial_guess(solver_state, rhs_history[0], x0) is x0
+
+    for rhs in rhs_history:
+        history.append(rhs, solver.solve(solver_state, rhs, x0, boundary_val=0))
+
+    assert len(history) == 2
+
+    # right hand side in the span of the stored ones is solved by the initial guess
+    rhs = 2 * rhs_history[1] - 0.5 * rhs_history[2]
+    sol = solver.solve(solver_state, rhs, x0, boundary_val=0)
+    guess = history.initial_guess(solver_state, rhs, x0)
+    np.testing.assert_allclose(guess, sol, rtol=0, atol=1e-6 * np.abs(sol).max())
+
+
+@pytest.mark.parametrize("cyclic", [True, False])
+def test_multigrid_coarse_operator(cyclic):
+    from veros.core.external.solvers.multigrid import _global_coarse_operator, _local_coarse_inverse
+
+    nx, ny, num_levels = 10, 6, 2
+    offsets = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+
+    rng = np.random.default_rng(42)
+    diags = tuple(rng.random((nx, ny)) for _ in offsets)
+
+    # explicit fine grid matrix and piecewise constant interpolation on 4x4 aggregates
+    idx = np.arange(nx * ny).reshape(nx, ny)
+    matrix = np.zeros((nx * ny, nx * ny))
+    for diag, (dx, dy) in zip(diags, offsets):
+        for i in range(nx):
+            for j in range(ny):
+                ti, tj = i + dx, j + dy
+                if cyclic:
+                    ti %= nx
+                if 0 <= ti < nx and 0 <= tj < ny:
+                    matrix[idx[i, j], idx[ti, tj]] += diag[i, j]
+
+    coarse_idx = (idx // ny // 4) * 2 + (idx % ny) // 4
+    interpolation = np.zeros((nx * ny, 6))
+    interpolation[idx.ravel(), coarse_idx.ravel()] = 1
+
+    coarse_matrix = _global_coarse_operator(diags, offsets, num_levels, cyclic)
+    np.testing.assert_allclose(coarse_matrix.toarray(), interpolation.T @ matrix @ interpolation)
+
+    # single process owns all rows of the inverse
+    np.testing.assert_allclose(_local_coarse_inverse(coarse_matrix, 6) @ coarse_matrix.toarray(), np.eye(6), atol=1e-10)
@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+
+from veros import veros_routine
+from veros.setups.acc import ACCSetup
+
+
+class InplaceSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        state.diagnostics.clear()
+
+
+@pytest.fixture
+def inplace_ops():
+    from veros import runtime_settings
+
+    if runtime_settings.backend != "numpy":
+        pytest.skip("in-place updates are only supported by the NumPy backend")
+
+    from veros.core import operators
+
+    inplace_updates = runtime_settings.inplace_updates
+    object.__setattr__(runtime_settings, "inplace_updates", True)
+    try:
+        yield operators
+    finally:
+        object.__setattr__(runtime_settings, "inplace_updates", inplace_updates)
+
+
+def test_inplace_update(inplace_ops):
+    from veros.core.operators import at
+
+    arr = np.zeros(10)
+    arr.flags.writeable = False
+    arr_id = id(arr)
+    copied_bytes = inplace_ops.copy_counter.total_bytes
+
+    arr = inplace_ops.update(arr, at[:2], 1.0, inplace=True)
+    arr = inplace_ops.update_add(arr, at[1:3], 1.0, inplace=True)
+    arr = inplace_ops.update_multiply(arr, at[2:4], 2.0, inplace=True)
+
+    assert id(arr) == arr_id
+    assert not arr.flags.writeable
+    assert inplace_ops.copy_counter.total_bytes == copied_bytes
+    np.testing.assert_array_equal(arr[:4], [1.0, 2.0, 2.0, 0.0])
+
+
+def test_inplace_update_copy_without_ownership(inplace_ops):
+    from veros import runtime_settings
+    from veros.core.operators import at
+
+    arr = np.zeros(10)
+    copied_bytes = inplace_ops.copy_counter.total_bytes
+
+    # callers that do not pass inplace=True never see their input modified
+    out = inplace_ops.update(arr, at[...], 1.0)
+    assert out is not arr
+    assert np.all(arr == 0.0)
+    assert inplace_ops.copy_counter.total_bytes == copied_bytes + arr.nbytes
+
+    object.__setattr__(runtime_settings, "inplace_updates", False)
+    out = inplace_ops.update(arr, at[...], 1.0, inplace=True)
+    assert out is not arr
+    assert np.all(arr == 0.0)
+
+
+def test_inplace_update_copy_on_view(inplace_ops):
+    from veros.core.operators import at
+
+    base = np.zeros((10, 2))
+    view = base[..., 0]
+    view = inplace_ops.update(view, at[...], 1.0, inplace=True)
+    assert np.all(view == 1.0)
+    assert np.all(base == 0.0)
+
+    arr = np.zeros(10)
+    arr = inplace_ops.update(arr, at[2:], arr[:-2] + 1, inplace=True)
+    arr = inplace_ops.update(arr, at[:2], arr[-2:], inplace=True)
+    np.testing.assert_array_equal(arr[:4], [1.0, 1.0, 1.0, 1.0])
+
+
+def _run_setup(inplace_updates, timesteps):
+    from veros import runtime_settings
+    from veros.core.operators import copy_counter
+
+    object.__setattr__(runtime_settings, "inplace_updates", inplace_updates)
+
+    sim = InplaceSetup(override=dict(runlen=timesteps * 86_400 / 2, dt_tracer=86_400 / 2))
+    sim.setup()
+
+    copied_bytes = copy_counter.total_bytes
+    sim.run()
+    return sim, copy_counter.total_bytes - copied_bytes
+
+
+def test_inplace_updates_bitwise_identical(inplace_ops):
+    from veros import runtime_settings
+
+    object.__setattr__(runtime_settings, "diskless_mode", True)
+    try:
+        sim_inplace, copied_inplace = _run_setup(inplace_updates=True, timesteps=3)
+        sim_ref, copied_ref = _run_setup(inplace_updates=False, timesteps=3)
+    finally:
+        object.__setattr__(runtime_settings, "diskless_mode", False)
+
+    assert copied_inplace < copied_ref
+
+    for var in sim_ref.state.variables.fields():
+        np.testing.assert_array_equal(
+            sim_inplace.state.variables.get(var), sim_ref.state.variables.get(var), err_msg=var
+        )
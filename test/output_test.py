@@ -0,0 +1,364 @@
+import os
+
+import pytest
+import numpy as np
+
+from veros import veros_routine
+from veros.setups.acc import ACCSetup
+
+
+class OutputSetup(ACCSetup):
+    @veros_routine
+    def set_diagnostics(self, state):
+        for diag in ("snapshot", "averages", "energy", "overturning"):
+            state.diagnostics[diag].sampling_frequency = state.settings.dt_tracer
+            state.diagnostics[diag].output_frequency = state.settings.dt_tracer
+
+        state.diagnostics["averages"].output_variables = ["temp", "u", "psi"]
+
+
+def run_output_setup(identifier, setup_class=OutputSetup):
+    dt_tracer = 86_400 / 2
+    sim = setup_class(
+        override=dict(
+            identifier=identifier,
+            restart_output_filename=None,
+            dt_tracer=dt_tracer,
+            runlen=4 * dt_tracer,
+        )
+    )
+    sim.setup()
+    sim.run()
+
+
+def assert_files_equal(file_1, file_2):
+    import h5py
+
+    with h5py.File(file_1, "r") as f1, h5py.File(file_2, "r") as f2:
+        assert set(f1.keys()) == set(f2.keys())
+
+        for key in f1.keys():
+            if not isinstance(f1[key], h5py.Dataset):
+                continue
+
+            np.testing.assert_array_equal(f1[key][...], f2[key][...], err_msg=key)
+
+
+@pytest.mark.parametrize("async_output, output_flush_interval", [(True, 0), (False, 3), (True, 3)])
+def test_output_modes(tmpdir, async_output, output_flush_interval):
+    from veros import runtime_settings
+
+    os.chdir(tmpdir)
+
+    run_output_setup("reference")
+
+    object.__setattr__(runtime_settings, "async_output", async_output)
+    object.__setattr__(runtime_settings, "output_flush_interval", output_flush_interval)
+    try:
+        run_output_setup("test")
+    finally:
+        object.__setattr__(runtime_settings, "async_output", False)
+        object.__setattr__(runtime_settings, "output_flush_interval", 0)
+
+    for diag in ("snapshot", "averages", "energy", "overturning"):
+        assert_files_equal(f"reference.{diag}.nc", f"test.{diag}.nc")
+
+
+@pytest.mark.parametrize("codec", ["none", "gzip:4", "shuffle+lzf", "shuffle+zstd:3"])
+def test_output_compression(tmpdir, codec):
+    import h5py
+
+    if "zstd" in codec:
+        pytest.importorskip("hdf5plugin")
+
+    class CompressedOutputSetup(OutputSetup):
+        @veros_routine
+        def set_diagnostics(self, state):
+            super().set_diagnostics(state)
+            snapshot = state.diagnostics["snapshot"]
+            snapshot.output_compression = {"temp": codec, "u": codec}
+            snapshot.output_significant_bits = {"u": 8}
+
+    os.chdir(tmpdir)
+
+    run_output_setup("reference")
+    run_output_setup("compressed", setup_class=CompressedOutputSetup)
+
+    with h5py.File("reference.snapshot.nc", "r") as f_ref, h5py.File("compressed.snapshot.nc", "r") as f:
+        np.testing.assert_array_equal(f["temp"][...], f_ref["temp"][...])
+
+        fill_value = f["u"].fillvalue
+        u, u_ref = f["u"][...], f_ref["u"][...]
+        np.testing.assert_array_equal(u == fill_value, u_ref == fill_value)
+        np.testing.assert_allclose(u, u_ref, rtol=2**-9, atol=0)
+
+        if codec == "none":
+            assert not f["temp"]._filters
+        else:
+            assert f["temp"]._filters
+
+
+def test_zarr_output(tmpdir):
+    zarr = pytest.importorskip("zarr")
+
+    diagnostics = ("snapshot", "averages", "energy", "overturning")
+
+    class ZarrOutputSetup(OutputSetup):
+        @veros_routine
+        def set_diagnostics(self, state):
+            super().set_diagnostics(state)
+            for diag in diagnostics:
+                state.diagnostics[diag].output_path = f"{{identifier}}.{diag}.zarr"
+
+            state.diagnostics["snapshot"].output_compression = {"temp": "shuffle+zstd:3", "u": "none"}
+
+    os.chdir(tmpdir)
+
+    run_output_setup("reference")
+    run_output_setup("test", setup_class=ZarrOutputSetup)
+
+    import h5py
+
+    for diag in diagnostics:
+        with h5py.File(f"reference.{diag}.nc", "r") as f_ref:
+            group = zarr.open_group(f"test.{diag}.zarr", mode="r")
+            ref_keys = {key for key, val in f_ref.items() if isinstance(val, h5py.Dataset)}
+            assert ref_keys == set(group.array_keys())
+
+            for key in ref_keys:
+                np.testing.assert_array_equal(group[key][...], f_ref[key][...], err_msg=f"{diag}.{key}")
+                assert group[key].attrs["long_name"] == f_ref[key].attrs["long_name"]
+
+
+def test_output_transforms(tmpdir):
+    import h5py
+    from veros.diagnostics.transforms import OutputTransform
+
+    region = (10, 30, -30, 0)
+
+    class TransformedOutputSetup(OutputSetup):
+        @veros_routine
+        def set_diagnostics(self, state):
+            super().set_diagnostics(state)
+            state.diagnostics["snapshot"].output_transforms = {
+                "temp": OutputTransform("coarse", coarsen=2),
+                "u": OutputTransform("box", region=region, levels=[0, -1]),
+                "psi": OutputTransform("sub", stride=(2, 3)),
+            }
+
+    os.chdir(tmpdir)
+
+    run_output_setup("reference")
+    run_output_setup("test", setup_class=TransformedOutputSetup)
+
+    with h5py.File("reference.snapshot.nc", "r") as f_ref, h5py.File("test.snapshot.nc", "r") as f:
+        # strided subsampling
+        np.testing.assert_array_equal(f["psi"][...], f_ref["psi"][:, ::3, ::2])
+        np.testing.assert_array_equal(f["xu_sub"][...], f_ref["xu"][::2])
+        np.testing.assert_array_equal(f["yu_sub"][...], f_ref["yu"][::3])
+
+        # region and vertical levels
+        xu, yt = f_ref["xu"][...], f_ref["yt"][...]
+        in_x = (xu >= region[0]) & (xu <= region[1])
+        in_y = (yt >= region[2]) & (yt <= region[3])
+        np.testing.assert_array_equal(f["u"][...], f_ref["u"][:, [0, -1]][:, :, in_y][:, :, :, in_x])
+        np.testing.assert_array_equal(f["xu_box"][...], xu[in_x])
+        np.testing.assert_array_equal(f["zt_box"][...], f_ref["zt"][[0, -1]])
+
+        # area-weighted coarsening of 2x2 blocks, ignoring land
+        temp = f_ref["temp"][...]
+        fill_value = f_ref["temp"].fillvalue
+        weights = np.where(temp != fill_value, f_ref["area_t"][...], 0)
+
+        def block_sum(arr):
+            return arr.reshape(arr.shape[:-2] + (arr.shape[-2] // 2, 2, arr.shape[-1] // 2, 2)).sum(axis=(-3, -1))
+
+        block_weights = block_sum(weights)
+        expected = block_sum(np.where(weights > 0, temp, 0) * weights) / np.where(block_weights > 0, block_weights, 1)
+        expected = np.where(block_weights > 0, expected, fill_value)
+        np.testing.assert_allclose(f["temp"][...], expected, rtol=1e-12)
+        np.testing.assert_allclose(f["xt_coarse"][...], f_ref["xt"][...].reshape(-1, 2).mean(axis=1))
+
+    with pytest.raises(ValueError):
+        OutputTransform("invalid", stride=0)
+
+
+def test_round_significant_bits():
+    from veros.io_tools.netcdf import round_significant_bits
+
+    rng = np.random.default_rng(17)
+
+    for dtype in ("float32", "float64"):
+        arr = rng.normal(size=1000).astype(dtype)
+        arr[:3] = (np.nan, np.inf, -1e18)
+
+        rounded = round_significant_bits(arr, 7)
+        assert rounded.dtype == arr.dtype
+
+        finite = np.isfinite(arr)
+        np.testing.assert_array_equal(rounded[~finite], arr[~finite])
+        np.testing.assert_allclose(rounded[finite], arr[finite], rtol=2**-8, atol=0)
+
+        # dropped mantissa bits are zero
+        nmant = np.finfo(dtype).nmant
+        bits = rounded[finite].view(f"uint{8 * rounded.itemsize}")
+        assert np.all(bits & ((1 << (nmant - 7)) - 1) == 0)
+
+    # round to nearest, ties to even
+    np.testing.assert_array_equal(
+        round_significant_bits(np.array([1.125, 1.375, 1.3], dtype="float32"), 2),
+        np.array([1.0, 1.5, 1.25], dtype="float32"),
+    )
+
+
+def test_compression_options():
+    from veros import runtime_settings
+    from veros.io_tools.hdf5 import get_compression_options
+
+    assert get_compression_options("gzip:4") == dict(compression="gzip", compression_opts=4)
+
+    for codec in ("lz4:5", "lzf:2", "shuffle:1"):
+        with pytest.raises(ValueError):
+            get_compression_options(codec)
+
+    object.__setattr__(runtime_settings, "hdf5_gzip_compression", False)
+    try:
+        # legacy switch only disables the default codec
+        assert get_compression_options() == {}
+        assert get_compression_options("gzip:4") == dict(compression="gzip", compression_opts=4)
+
+        object.__setattr__(runtime_settings, "hdf5_compression", "shuffle+lzf")
+        try:
+            with pytest.raises(ValueError):
+                get_compression_options()
+        finally:
+            object.__setattr__(runtime_settings, "hdf5_compression", "gzip:1")
+    finally:
+        object.__setattr__(runtime_settings, "hdf5_gzip_compression", True)
+
+
+def test_background_writer_error():
+    from veros.io_tools.writer import BackgroundWriter
+
+    writer = BackgroundWriter()
+    written = []
+
+    def failing_job():
+        raise ValueError("disk full")
+
+    writer.submit(written.append, 1)
+    writer.submit(failing_job)
+    writer.submit(written.append, 2)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        writer.flush()
+
+    assert isinstance(excinfo.value.__cause__, ValueError)
+    # jobs after the error are dropped
+    assert written == [1]
+
+    writer.submit(written.append, 3)
+    writer.flush()
+    assert written == [1, 3]
+
+
+def test_averages_statistics(tmpdir):
+    import h5py
+
+    bin_edges = np.linspace(0, 20, 21)
+    percentiles = [10, 50, 90]
+
+    class StatisticsSetup(OutputSetup):
+        @veros_routine
+        def set_diagnostics(self, state):
+            super().set_diagnostics(state)
+            averages = state.diagnostics["averages"]
+            averages.output_frequency = 4 * state.settings.dt_tracer
+            averages.output_statistics = {"temp": ["variance", "std", "min", "max"], "u": ["max"]}
+            averages.output_histograms = {"temp": bin_edges}
+            averages.output_percentiles = {"temp": percentiles}
+
+    os.chdir(tmpdir)
+
+    run_output_setup("test", setup_class=StatisticsSetup)
+
+    with h5py.File("test.snapshot.nc", "r") as f_snap, h5py.File("test.averages.nc", "r") as f_avg:
+        samples = f_snap["temp"][...]
+        fill_value = f_snap["temp"].fillvalue
+        mask = samples[0] == fill_value
+        assert samples.shape[0] == 4
+
+        np.testing.assert_allclose(f_avg["temp"][0], samples.mean(axis=0), rtol=1e-10)
+        np.testing.assert_allclose(f_avg["temp_variance"][0][~mask], samples.var(axis=0)[~mask], rtol=1e-6, atol=1e-12)
+        np.testing.assert_allclose(f_avg["temp_std"][0][~mask], samples.std(axis=0)[~mask], rtol=1e-6, atol=1e-6)
+        np.testing.assert_array_equal(f_avg["temp_min"][0], samples.min(axis=0))
+        np.testing.assert_array_equal(f_avg["temp_max"][0], samples.max(axis=0))
+        np.testing.assert_array_equal(f_avg["u_max"][0], f_snap["u"][...].max(axis=0))
+        assert "temp_m2" not in f_avg
+
+        histogram = f_avg["temp_histogram"][0]
+        assert histogram.shape == (len(bin_edges) - 1,) + samples.shape[1:]
+        np.testing.assert_array_equal(f_avg["temp_histogram"].attrs["bin_edges"], bin_edges)
+
+        bin_idx = np.clip(np.searchsorted(bin_edges, samples[:, ~mask], side="right") - 1, 0, len(bin_edges) - 2)
+        expected = np.stack([(bin_idx == i).mean(axis=0) for i in range(len(bin_edges) - 1)])
+        np.testing.assert_allclose(histogram[:, ~mask], expected)
+
+        # percentiles lie within the bin containing the exact percentile
+        percentile_values = f_avg["temp_percentiles"][0]
+        assert percentile_values.shape == (len(percentiles),) + samples.shape[1:]
+        exact = np.percentile(samples[:, ~mask], percentiles, axis=0, method="inverted_cdf")
+        exact_bin = np.clip(np.searchsorted(bin_edges, exact, side="right") - 1, 0, len(bin_edges) - 2)
+        assert np.all(percentile_values[:, ~mask] >= bin_edges[exact_bin] - 1e-6)
+        assert np.all(percentile_values[:, ~mask] <= bin_edges[exact_bin + 1] + 1e-6)
+
+
+def test_averages_statistics_without_samples(tmpdir):
+    import h5py
+
+    class NoSamplesSetup(OutputSetup):
+        @veros_routine
+        def set_diagnostics(self, state):
+            super().set_diagnostics(state)
+            averages = state.diagnostics["averages"]
+            averages.sampling_frequency = float("inf")
+            averages.output_statistics = {"temp": ["min", "max"]}
+
+    os.chdir(tmpdir)
+
+    run_output_setup("test", setup_class=NoSamplesSetup)
+
+    with h5py.File("test.averages.nc", "r") as f_avg:
+        for key in ("temp_min", "temp_max"):
+            assert np.all(f_avg[key][...] == f_avg[key].fillvalue)
+
+
+def test_averages_statistics_validation():
+    from veros.diagnostics.averages import Averages
+    from veros.variables import Variable
+
+    temp = Variable("Temperature", ("xt", "yt", "zt"), "deg C")
+
+    averages = Averages(None)
+    averages.output_statistics = {"temp": ["median"]}
+
+    with pytest.raises(ValueError, match="Unknown statistics"):
+        averages._register_statistics("temp", temp)
+
+    averages.output_statistics = {}
+    averages.output_percentiles = {"temp": [50]}
+
+    with pytest.raises(ValueError, match="require a histogram"):
+        averages._register_statistics("temp", temp)
+
+
+def test_sum_above_isopycnals():
+    from veros.diagnostics.overturning import _sum_above_isopycnals
+
+    rng = np.random.default_rng(42)
+    sig = rng.choice(np.linspace(20, 30, 41), size=(7, 50))
+    weights = rng.normal(size=(3, 7, 50))
+    sigma = np.linspace(19, 31, 25)
+
+    expected = np.stack([np.sum(weights * (sig > sigma_level), axis=-1) for sigma_level in sigma], axis=-1)
+    np.testing.assert_allclose(_sum_above_isopycnals(sig, weights, sigma), expected, atol=1e-12)
@@ -1,4 +1,6 @@
 import os
+
+import pytest
 import numpy as np
 
 from veros import veros_routine
@@ -24,14 +26,17 @@ class RestartSetup(ACCSetup):
             diag.output_frequency = float("inf")
 
 
-def test_restart(tmpdir):
+@pytest.mark.parametrize("restart_file", ["restart.h5", "restart.zarr"])
+def test_restart(tmpdir, restart_file):
+    if restart_file.endswith(".zarr"):
+        pytest.importorskip("zarr")
+
     os.chdir(tmpdir)
 
     timesteps_1 = 5
     timesteps_2 = 5
 
     dt_tracer = 86_400 / 2
-    restart_file = "restart.h5"
 
     acc_no_restart = RestartSetup(
         override=dict(
@@ -101,3 +106,216 @@ def test_restart(tmpdir):
                 continue
 
             check_diag_var(diag, var)
+
+
+@pytest.mark.parametrize("restart_ext", ["h5", "zarr"])
+def test_delta_restart(tmpdir, restart_ext):
+    import h5py
+
+    if restart_ext == "zarr":
+        zarr = pytest.importorskip("zarr")
+
+    os.chdir(tmpdir)
+
+    dt_tracer = 86_400 / 2
+    timesteps = 5
+
+    acc = RestartSetup(
+        override=dict(
+            identifier="ACC_delta",
+            restart_input_filename=None,
+            restart_output_filename="{identifier}_{itt:0>4d}.restart." + restart_ext,
+            restart_frequency=dt_tracer,
+            restart_num_deltas=2,
+            restart_delta_max_fraction=1.0,
+            dt_tracer=dt_tracer,
+            runlen=timesteps * dt_tracer,
+        )
+    )
+    acc.setup()
+    acc.run()
+
+    def get_delta_base(itt):
+        filename = f"ACC_delta_{itt:0>4d}.restart.{restart_ext}"
+        if restart_ext == "zarr":
+            return zarr.open_group(filename, mode="r").attrs.get("delta_base")
+
+        with h5py.File(filename, "r") as f:
+            return f.attrs.get("delta_base")
+
+    assert [get_delta_base(itt) for itt in range(1, timesteps + 1)] == [
+        None,
+        f"ACC_delta_0001.restart.{restart_ext}",
+        f"ACC_delta_0001.restart.{restart_ext}",
+        None,
+        f"ACC_delta_0004.restart.{restart_ext}",
+    ]
+
+    acc_restart = RestartSetup(
+        override=dict(
+            identifier="ACC_delta_restart",
+            restart_input_filename=f"ACC_delta_{timesteps:0>4d}.restart.{restart_ext}",
+            restart_output_filename=None,
+            dt_tracer=dt_tracer,
+            runlen=timesteps * dt_tracer,
+        )
+    )
+    acc_restart.setup()
+
+    def restart_vars(var_meta):
+        return [var for var, meta in var_meta.items() if meta.write_to_restart and meta.active]
+
+    for var in restart_vars(acc.state.var_meta):
+        np.testing.assert_array_equal(acc_restart.state.variables.get(var), acc.state.variables.get(var), err_msg=var)
+
+    for diag in acc.state.diagnostics:
+        if not acc.state.diagnostics[diag].var_meta:
+            continue
+
+        for var in restart_vars(acc.state.diagnostics[diag].var_meta):
+            np.testing.assert_array_equal(
+                acc_restart.state.diagnostics[diag].variables.get(var),
+                acc.state.diagnostics[diag].variables.get(var),
+                err_msg=f"{diag}.{var}",
+            )
+
+
+def test_delta_restart_size_limit(tmpdir):
+    import h5py
+
+    os.chdir(tmpdir)
+
+    dt_tracer = 86_400 / 2
+    timesteps = 3
+
+    acc = RestartSetup(
+        override=dict(
+            identifier="ACC_delta",
+            restart_input_filename=None,
+            restart_output_filename="{identifier}_{itt:0>4d}.restart.h5",
+            restart_frequency=dt_tracer,
+            restart_num_deltas=2,
+            restart_delta_max_fraction=0.0,
+            dt_tracer=dt_tracer,
+            runlen=timesteps * dt_tracer,
+        )
+    )
+    acc.setup()
+    acc.run()
+
+    # every delta would be larger than allowed, so only full restarts are written
+    for itt in range(1, timesteps + 1):
+        with h5py.File(f"ACC_delta_{itt:0>4d}.restart.h5", "r") as f:
+            assert "delta_base" not in f.attrs
+
+
+def test_staged_restart(tmpdir):
+    from veros import runtime_settings
+    from veros.restart import flush_staged_restarts, _get_staging_path, _find_restart_file
+
+    os.chdir(tmpdir)
+
+    dt_tracer = 86_400 / 2
+    timesteps = 3
+
+    object.__setattr__(runtime_settings, "restart_staging_dir", str(tmpdir / "staging"))
+    try:
+        acc = RestartSetup(
+            override=dict(
+                identifier="ACC_staged",
+                restart_input_filename=None,
+                restart_output_filename="{identifier}_{itt:0>4d}.restart.h5",
+                restart_frequency=dt_tracer,
+                dt_tracer=dt_tracer,
+                runlen=timesteps * dt_tracer,
+            )
+        )
+        acc.setup()
+        acc.run()
+        flush_staged_restarts()
+
+        restart_files = [f"ACC_staged_{itt:0>4d}.restart.h5" for itt in range(1, timesteps + 1)]
+        assert set(restart_files) <= set(os.listdir(tmpdir))
+
+        # only the latest restart is kept in the staging area, along with its completion marker
+        staging_path = _get_staging_path(restart_files[-1])
+        assert sorted(os.listdir(tmpdir / "staging")) == sorted(
+            [os.path.basename(staging_path), os.path.basename(staging_path) + ".complete"]
+        )
+
+        # restarts with the same name in different directories are staged separately
+        assert _get_staging_path(os.path.join("other", restart_files[-1])) != staging_path
+
+        # staged copy is used even if the final one is lost
+        os.remove(restart_files[-1])
+        assert _find_restart_file(restart_files[-1]) == staging_path
+
+        # but only if it is complete
+        os.rename(staging_path + ".complete", staging_path + ".backup")
+        assert _find_restart_file(restart_files[-1]) == restart_files[-1]
+        os.rename(staging_path + ".backup", staging_path + ".complete")
+
+        acc_restart = RestartSetup(
+            override=dict(
+                identifier="ACC_staged_restart",
+                restart_input_filename=restart_files[-1],
+                restart_output_filename=None,
+                dt_tracer=dt_tracer,
+                runlen=timesteps * dt_tracer,
+            )
+        )
+        acc_restart.setup()
+    finally:
+        object.__setattr__(runtime_settings, "restart_staging_dir", "")
+
+    for var, meta in acc.state.var_meta.items():
+        if meta.write_to_restart and meta.active:
+            np.testing.assert_array_equal(
+                acc_restart.state.variables.get(var), acc.state.variables.get(var), err_msg=var
+            )
+
+
+@pytest.mark.parametrize("compression", [True, False])
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_restart_roundtrip(tmpdir, compression, memory_map):
+    import h5py
+    from veros import runtime_settings
+    from veros.restart import write_to_h5, read_from_h5
+    from veros.variables import Variable
+
+    dimensions = dict(xt=8, yt=6, zt=3)
+    var_meta = {
+        "a": Variable("a", ("xt", "yt", "zt")),
+        "b": Variable("b", ("yt",), dtype="int32"),
+        "c": Variable("c", ("zt",)),
+        "d": Variable("d", None),
+    }
+
+    rng = np.random.default_rng(42)
+    var_data = {
+        "a": rng.normal(size=(12, 10, 3)),
+        "b": rng.integers(0, 100, size=10, dtype="int32"),
+        "c": rng.normal(size=3),
+        "d": np.array(1.5),
+    }
+
+    object.__setattr__(runtime_settings, "hdf5_gzip_compression", compression)
+    object.__setattr__(runtime_settings, "restart_memory_map", memory_map)
+    try:
+        with h5py.File(tmpdir / "restart.h5", "w") as f:
+            write_to_h5(dimensions, var_meta, var_data, f, "core", attributes=dict(foo=1))
+
+        with h5py.File(tmpdir / "restart.h5", "r") as f:
+            # uncompressed datasets are contiguous, so they can be memory-mapped
+            assert (f["core/a"].chunks is None) == (not compression)
+            attributes, restart_data = read_from_h5(dimensions, var_meta, f, "core", False)
+    finally:
+        object.__setattr__(runtime_settings, "hdf5_gzip_compression", True)
+        object.__setattr__(runtime_settings, "restart_memory_map", False)
+
+    assert attributes == dict(foo=1)
+    assert restart_data.keys() == var_data.keys()
+
+    for key, val in var_data.items():
+        assert restart_data[key].dtype == val.dtype
+        np.testing.assert_array_equal(restart_data[key], val, err_msg=key)
@@ -8,7 +8,7 @@ def dummy_state():
     from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
     from veros.settings import SETTINGS
 
-    return VerosState(VARIABLES, SETTINGS, DIM_TO_SHAPE_VAR)
+    return VerosState(VARIABLES, SETTINGS, dict(DIM_TO_SHAPE_VAR))
 
 
 @pytest.fixture
@@ -23,7 +23,7 @@ def dummy_variables():
     from veros.variables import VARIABLES, DIM_TO_SHAPE_VAR
     from veros.settings import SETTINGS
 
-    dummy_state = VerosState(VARIABLES, SETTINGS, DIM_TO_SHAPE_VAR)
+    dummy_state = VerosState(VARIABLES, SETTINGS, dict(DIM_TO_SHAPE_VAR))
     dummy_state.initialize_variables()
     return dummy_state.variables
 
@@ -0,0 +1,242 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def acc_state():
+    from veros import runtime_settings
+
+    object.__setattr__(runtime_settings, "diskless_mode", True)
+    try:
+        from veros.setups.acc import ACCSetup
+
+        sim = ACCSetup()
+        sim.setup()
+    finally:
+        object.__setattr__(runtime_settings, "diskless_mode", False)
+
+    return sim.state
+
+
+def write_forcing_file(path, times, records):
+    if path.endswith(".zarr"):
+        import zarr
+
+        group = zarr.open_group(path, mode="w")
+        group.create_array("time", data=times)
+        group.create_array("taux", data=records, chunks=(1,) + records.shape[1:])
+    else:
+        import h5py
+
+        with h5py.File(path, "w") as f:
+            f.create_dataset("time", data=times)
+            f.create_dataset("taux", data=records)
+
+
+@pytest.mark.parametrize("file_format", ["h5", "zarr"])
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_forcing_stream(tmpdir, acc_state, file_format, prefetch):
+    from veros.tools import ForcingStream
+
+    if file_format == "zarr":
+        pytest.importorskip("zarr")
+
+    nx, ny = acc_state.dimensions["xt"], acc_state.dimensions["yt"]
+    rng = np.random.default_rng(17)
+    times = np.array([0.0, 6.0, 12.0, 30.0, 36.0])
+    records = rng.normal(size=(len(times), ny, nx))
+
+    path = str(tmpdir / f"forcing.{file_format}")
+    write_forcing_file(path, times, records)
+
+    with ForcingStream(acc_state, path, "taux", time_unit="hours", prefetch=prefetch) as stream:
+        for hours in (-3.0, 0.0, 4.5, 12.0, 20.0, 33.0, 36.0, 50.0, 1.0):
+            expected = np.array([np.interp(hours, times, records[:, j, i]) for i in range(nx) for j in range(ny)])
+            res = np.asarray(stream.get(hours * 3600.0))
+            assert res.shape == (nx + 4, ny + 4)
+            np.testing.assert_allclose(res[2:-2, 2:-2].reshape(-1), expected, rtol=1e-12)
+
+            # cyclic boundaries
+            np.testing.assert_array_equal(res[:2, 2:-2], res[-4:-2, 2:-2])
+
+            assert len(stream._records) <= 2
+
+
+def test_forcing_stream_cyclic(tmpdir, acc_state):
+    from veros.tools import ForcingStream, get_periodic_interval
+
+    nx, ny = acc_state.dimensions["xt"], acc_state.dimensions["yt"]
+    year_in_seconds = 360 * 86400.0
+    records = np.arange(12, dtype="float64")[:, np.newaxis, np.newaxis] * np.ones((12, ny, nx))
+
+    path = str(tmpdir / "climatology.h5")
+    write_forcing_file(path, np.arange(12) * year_in_seconds / 12, records)
+
+    with ForcingStream(acc_state, path, "taux", cycle_length=year_in_seconds) as stream:
+        for current_time in np.linspace(0, 2 * year_in_seconds, 17):
+            (n1, f1), (n2, f2) = get_periodic_interval(current_time, year_in_seconds, year_in_seconds / 12, 12)
+            (m1, g1), (m2, g2) = stream.get_interval(current_time)
+            assert (m1, m2) == (int(n1), int(n2))
+            np.testing.assert_allclose((g1, g2), (float(f1), float(f2)), atol=1e-12)
+
+            np.testing.assert_allclose(stream.get(current_time)[2:-2, 2:-2], f1 * n1 + f2 * n2, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        ForcingStream(acc_state, path, "taux", times=np.zeros(12))
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_interpolation_window(descending):
+    from veros.tools import interpolate, get_interpolation_window
+
+    rng = np.random.default_rng(17)
+    lon = np.linspace(-100, 20, 97)
+    lat = np.linspace(-20, 70, 61)
+    if descending:
+        lat = lat[::-1]
+
+    data = rng.normal(size=(lon.size, lat.size))
+    data[30:50, 20:25] = -1e20
+
+    target = (np.linspace(-98, 18, 120), np.linspace(-18, 68, 90))
+    reference = interpolate((lon, lat), data, target, missing_value=-1e20)
+
+    # pieces of a 3x2 decomposition of the target grid
+    for target_x in np.array_split(target[0], 3):
+        for target_y in np.array_split(target[1], 2):
+            window = get_interpolation_window((lon, lat), (target_x, target_y), margin=(0, 2))
+            assert window[0].stop - window[0].start < lon.size
+            assert window[1].stop - window[1].start < lat.size
+
+            local = interpolate((lon[window[0]], lat[window[1]]), data[window], (target_x, target_y), fill=False)
+            local_reference = interpolate((lon, lat), data, (target_x, target_y), fill=False)
+            np.testing.assert_allclose(local, local_reference)
+
+    # windows of all pieces cover the whole target grid
+    window = get_interpolation_window((lon, lat), target, margin=0)
+    local = interpolate((lon[window[0]], lat[window[1]]), data[window], target, missing_value=-1e20)
+    np.testing.assert_allclose(local, reference)
+
+
+def test_fill_holes():
+    from veros.tools import fill_holes
+
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(30, 20, 4))
+    data[5:20, 3:15, :3] = np.nan
+    data[rng.random(data.shape) < 0.1] = np.nan
+
+    filled = np.asarray(fill_holes(data))
+    assert not np.any(np.isnan(filled))
+
+    valid = np.argwhere(~np.isnan(data))
+    for hole in np.argwhere(np.isnan(data)):
+        # filled value is from one of the nearest valid cells
+        distance = np.sum((valid - hole) ** 2, axis=1)
+        candidates = valid[distance == distance.min()]
+        assert any(filled[tuple(hole)] == data[tuple(cell)] for cell in candidates)
+
+    np.testing.assert_array_equal(filled[~np.isnan(data)], data[~np.isnan(data)])
+
+
+def test_fill_holes_axes():
+    from veros.tools import fill_holes
+
+    data = np.full((6, 5, 3), np.nan)
+    data[0, 0, 0] = 1.0
+    data[5, 4, 1] = 2.0
+
+    # fill horizontally, every level on its own
+    filled = np.asarray(fill_holes(data, axes=(0, 1)))
+    np.testing.assert_array_equal(filled[..., 0], 1.0)
+    np.testing.assert_array_equal(filled[..., 1], 2.0)
+    assert np.all(np.isnan(filled[..., 2]))
+
+    filled = np.asarray(fill_holes(data, axes=(-1,)))
+    np.testing.assert_array_equal(filled[0, 0], 1.0)
+    np.testing.assert_array_equal(filled[5, 4], 2.0)
+    assert np.isnan(filled[1, 1, 1])
+
+    with pytest.raises(ValueError):
+        fill_holes(data, axes=(3,))
+
+
+def test_fill_holes_without_data():
+    from veros.tools import fill_holes
+
+    data = np.full((4, 5), np.nan)
+    assert np.all(np.isnan(fill_holes(data)))
+
+
+@pytest.mark.parametrize("kind", ["linear", "nearest"])
+def test_regridder(tmpdir, kind):
+    from veros.tools import interpolate, Regridder
+
+    rng = np.random.default_rng(42)
+    lon = np.linspace(0, 360, 73)
+    lat = np.linspace(80, -80, 41)
+    depth = np.linspace(-5000, 0, 9)
+
+    data = rng.normal(size=(lon.size, lat.size, depth.size, 3))
+    data[20:30, 10:15, :4] = -1e20
+    data[50:60, 30:35, :, 1] = -1e20
+
+    # includes points outside of the source grid and on grid nodes
+    target = (np.linspace(-5, 365, 111), lat[::3], np.linspace(-4500, 0, 12))
+
+    regridder = Regridder((lon, lat, depth), target, kind=kind)
+    result = regridder(data, missing_value=-1e20)
+    assert result.shape == (111, lat[::3].size, 12, 3)
+
+    for record in range(data.shape[-1]):
+        expected = interpolate((lon, lat, depth), data[..., record], target, missing_value=-1e20, kind=kind)
+        np.testing.assert_allclose(result[..., record], expected, rtol=1e-12, atol=1e-12)
+
+        expected = interpolate((lon, lat, depth), data[..., record], target, missing_value=-1e20, kind=kind, fill=False)
+        unfilled = regridder(data[..., record], missing_value=-1e20, fill=False)
+        np.testing.assert_array_equal(np.isnan(unfilled), np.isnan(expected))
+        np.testing.assert_allclose(unfilled, expected, rtol=1e-12, atol=1e-12)
+
+    outfile = str(tmpdir / "weights.npz")
+    regridder.save(outfile)
+
+    restored = Regridder.load(outfile, coords=(lon, lat, depth), interp_coords=target, kind=kind)
+    np.testing.assert_array_equal(restored(data, missing_value=-1e20), result)
+
+    with pytest.raises(ValueError):
+        Regridder.load(outfile, coords=(lon + 1, lat, depth))
+
+    with pytest.raises(ValueError):
+        regridder(data[:-1])
+
+
+@pytest.mark.parametrize("spherical", [False, True])
+def test_coastline_distance(spherical):
+    from veros.tools import get_coastline_distance
+
+    rng = np.random.default_rng(5)
+    lon, lat = np.meshgrid(np.linspace(0.5, 359.5, 72), np.linspace(-87.5, 87.5, 36), indexing="ij")
+    land_mask = rng.random(lon.shape) < 0.05
+    land_mask[30:40, 10:20] = True
+
+    radius = 6370e3 if spherical else None
+    distance = np.asarray(get_coastline_distance((lon, lat), land_mask, spherical=spherical, radius=radius))
+
+    if spherical:
+        lon1, lat1 = np.radians(lon)[..., np.newaxis], np.radians(lat)[..., np.newaxis]
+        lon2, lat2 = np.radians(lon[land_mask]), np.radians(lat[land_mask])
+        # haversine formula
+        hav = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        expected = (2 * radius * np.arcsin(np.sqrt(hav))).min(axis=-1)
+    else:
+        expected = np.hypot(lon[..., np.newaxis] - lon[land_mask], lat[..., np.newaxis] - lat[land_mask]).min(axis=-1)
+
+    np.testing.assert_allclose(distance, expected, rtol=1e-8, atol=1e-6)
+    assert np.all(distance[land_mask] == 0)
+
+    # distances on a subdomain take land cells outside of it into account
+    subset = (slice(20, 50), slice(5, 12))
+    local_distance = get_coastline_distance(
+        (lon, lat), land_mask, spherical=spherical, radius=radius, subset=subset, chunk_size=17
+    )
+    np.testing.assert_allclose(local_distance, distance[subset], rtol=1e-12)
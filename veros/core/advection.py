@@ -63,6 +63,7 @@ def adv_flux_2nd(state, var):
         adv_fe,
         at[1:-2, 2:-2, :],
         0.5 * (var[1:-2, 2:-2, :] + var[2:-1, 2:-2, :]) * vs.u[1:-2, 2:-2, :, vs.tau] * vs.maskU[1:-2, 2:-2, :],
+        inplace=True,
     )
     adv_fn = update(
         adv_fn,
@@ -72,13 +73,15 @@ def adv_flux_2nd(state, var):
         * (var[2:-2, 1:-2, :] + var[2:-2, 2:-1, :])
         * vs.v[2:-2, 1:-2, :, vs.tau]
         * vs.maskV[2:-2, 1:-2, :],
+        inplace=True,
     )
     adv_ft = update(
         adv_ft,
         at[2:-2, 2:-2, :-1],
         0.5 * (var[2:-2, 2:-2, :-1] + var[2:-2, 2:-2, 1:]) * vs.w[2:-2, 2:-2, :-1, vs.tau] * vs.maskW[2:-2, 2:-2, :-1],
+        inplace=True,
     )
-    adv_ft = update(adv_ft, at[:, :, -1], 0.0)
+    adv_ft = update(adv_ft, at[:, :, -1], 0.0, inplace=True)
 
     return adv_fe, adv_fn, adv_ft
 
@@ -106,10 +109,16 @@ def adv_flux_superbee(state, var):
     adv_fn = allocate(state.dimensions, ("xt", "yt", "zt"))
     adv_ft = allocate(state.dimensions, ("xt", "yt", "zt"))
 
-    adv_fe = update(adv_fe, at[1:-2, 2:-2, :], _adv_superbee(state, vs.u[..., vs.tau], var, vs.maskU, vs.dxt, 0))
-    adv_fn = update(adv_fn, at[2:-2, 1:-2, :], _adv_superbee(state, vs.v[..., vs.tau], var, vs.maskV, vs.dyt, 1))
-    adv_ft = update(adv_ft, at[2:-2, 2:-2, :-1], _adv_superbee(state, vs.w[..., vs.tau], var, vs.maskW, vs.dzt, 2))
-    adv_ft = update(adv_ft, at[..., -1], 0.0)
+    adv_fe = update(
+        adv_fe, at[1:-2, 2:-2, :], _adv_superbee(state, vs.u[..., vs.tau], var, vs.maskU, vs.dxt, 0), inplace=True
+    )
+    adv_fn = update(
+        adv_fn, at[2:-2, 1:-2, :], _adv_superbee(state, vs.v[..., vs.tau], var, vs.maskV, vs.dyt, 1), inplace=True
+    )
+    adv_ft = update(
+        adv_ft, at[2:-2, 2:-2, :-1], _adv_superbee(state, vs.w[..., vs.tau], var, vs.maskW, vs.dzt, 2), inplace=True
+    )
+    adv_ft = update(adv_ft, at[..., -1], 0.0, inplace=True)
 
     return adv_fe, adv_fn, adv_ft
 
@@ -229,17 +238,23 @@ def adv_flux_superbee_wgrid(state, var):
     adv_ft = allocate(state.dimensions, ("xt", "yt", "zt"))
 
     maskUtr = allocate(state.dimensions, ("xt", "yt", "zw"))
-    maskUtr = update(maskUtr, at[:-1, :, :], vs.maskW[1:, :, :] * vs.maskW[:-1, :, :])
-    adv_fe = update(adv_fe, at[1:-2, 2:-2, :], _adv_superbee(state, vs.u_wgrid, var, maskUtr, vs.dxt, axis=0))
+    maskUtr = update(maskUtr, at[:-1, :, :], vs.maskW[1:, :, :] * vs.maskW[:-1, :, :], inplace=True)
+    adv_fe = update(
+        adv_fe, at[1:-2, 2:-2, :], _adv_superbee(state, vs.u_wgrid, var, maskUtr, vs.dxt, axis=0), inplace=True
+    )
 
     maskVtr = allocate(state.dimensions, ("xt", "yt", "zw"))
-    maskVtr = update(maskVtr, at[:, :-1, :], vs.maskW[:, 1:, :] * vs.maskW[:, :-1, :])
-    adv_fn = update(adv_fn, at[2:-2, 1:-2, :], _adv_superbee(state, vs.v_wgrid, var, maskVtr, vs.dyt, axis=1))
+    maskVtr = update(maskVtr, at[:, :-1, :], vs.maskW[:, 1:, :] * vs.maskW[:, :-1, :], inplace=True)
+    adv_fn = update(
+        adv_fn, at[2:-2, 1:-2, :], _adv_superbee(state, vs.v_wgrid, var, maskVtr, vs.dyt, axis=1), inplace=True
+    )
 
     maskWtr = allocate(state.dimensions, ("xt", "yt", "zw"))
-    maskWtr = update(maskWtr, at[:, :, :-1], vs.maskW[:, :, 1:] * vs.maskW[:, :, :-1])
-    adv_ft = update(adv_ft, at[2:-2, 2:-2, :-1], _adv_superbee(state, vs.w_wgrid, var, maskWtr, vs.dzw, axis=2))
-    adv_ft = update(adv_ft, at[..., -1], 0.0)
+    maskWtr = update(maskWtr, at[:, :, :-1], vs.maskW[:, :, 1:] * vs.maskW[:, :, :-1], inplace=True)
+    adv_ft = update(
+        adv_ft, at[2:-2, 2:-2, :-1], _adv_superbee(state, vs.w_wgrid, var, maskWtr, vs.dzw, axis=2), inplace=True
+    )
+    adv_ft = update(adv_ft, at[..., -1], 0.0, inplace=True)
 
     return adv_fe, adv_fn, adv_ft
 
@@ -262,6 +277,7 @@ def adv_flux_upwind_wgrid(state, var):
         at[1:-2, 2:-2, :],
         vs.u_wgrid[1:-2, 2:-2, :] * (var[2:-1, 2:-2, :] + var[1:-2, 2:-2, :]) * 0.5
         - npx.abs(vs.u_wgrid[1:-2, 2:-2, :]) * rj * 0.5,
+        inplace=True,
     )
 
     maskVtr = vs.maskW[2:-2, 2:-1, :] * vs.maskW[2:-2, 1:-2, :]
@@ -274,6 +290,7 @@ def adv_flux_upwind_wgrid(state, var):
         * (var[2:-2, 2:-1, :] + var[2:-2, 1:-2, :])
         * 0.5
         - npx.abs(vs.cosu[npx.newaxis, 1:-2, npx.newaxis] * vs.v_wgrid[2:-2, 1:-2, :]) * rj * 0.5,
+        inplace=True,
     )
 
     maskWtr = vs.maskW[2:-2, 2:-2, 1:] * vs.maskW[2:-2, 2:-2, :-1]
@@ -283,7 +300,8 @@ def adv_flux_upwind_wgrid(state, var):
         at[2:-2, 2:-2, :-1],
         vs.w_wgrid[2:-2, 2:-2, :-1] * (var[2:-2, 2:-2, 1:] + var[2:-2, 2:-2, :-1]) * 0.5
         - npx.abs(vs.w_wgrid[2:-2, 2:-2, :-1]) * rj * 0.5,
+        inplace=True,
     )
-    adv_ft = update(adv_ft, at[:, :, -1], 0.0)
+    adv_ft = update(adv_ft, at[:, :, -1], 0.0, inplace=True)
 
     return adv_fe, adv_fn, adv_ft
@@ -31,6 +31,7 @@ def compute_dissipation(state, int_drhodX, flux_east, flux_north):
             + (int_drhodX[1:-1, 1:-1, :] - int_drhodX[1:-1, :-2, :]) * flux_north[1:-1, :-2, :]
         )
         / (vs.dyt[npx.newaxis, 1:-1, npx.newaxis] * vs.cost[npx.newaxis, 1:-1, npx.newaxis]),
+        inplace=True,
     )
 
     return diss
@@ -56,8 +57,9 @@ def dissipation_on_wgrid(state, diss, ks):
         )
         * edge_mask[:, :, :-1]
         + 0.5 * (diss[:, :, :-1] + diss[:, :, 1:]) * water_mask[:, :, :-1],
+        inplace=True,
     )
-    diss_w = update(diss_w, at[:, :, -1], diss[:, :, -1] * land_mask)
+    diss_w = update(diss_w, at[:, :, -1], diss[:, :, -1] * land_mask, inplace=True)
 
     return diss_w
 
@@ -152,6 +154,7 @@ def tempsalt_sources(state):
                 vs.int_drhodT[1:-1, 1:-1, :, vs.tau] * vs.temp_source[1:-1, 1:-1]
                 + vs.int_drhodS[1:-1, 1:-1, :, vs.tau] * vs.salt_source[1:-1, 1:-1]
             ),
+            inplace=True,
         )
 
         vs.P_diss_sources = dissipation_on_wgrid(state, diss, vs.kbot)
@@ -180,6 +183,7 @@ def biharmonic_diffusion(state, tr, diffusivity):
         * (tr[1:, :, :] - tr[:-1, :, :])
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
 
     flux_north = update(
@@ -190,6 +194,7 @@ def biharmonic_diffusion(state, tr, diffusivity):
         / vs.dyu[npx.newaxis, :-1, npx.newaxis]
         * vs.maskV[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
 
     del2 = update(
@@ -200,6 +205,7 @@ def biharmonic_diffusion(state, tr, diffusivity):
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         + (flux_north[1:, 1:, :] - flux_north[1:, :-1, :])
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis]),
+        inplace=True,
     )
 
     del2 = utilities.enforce_boundaries(del2, settings.enable_cyclic_x)
@@ -211,6 +217,7 @@ def biharmonic_diffusion(state, tr, diffusivity):
         * (del2[1:, :, :] - del2[:-1, :, :])
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
     flux_north = update(
         flux_north,
@@ -220,10 +227,11 @@ def biharmonic_diffusion(state, tr, diffusivity):
         / vs.dyu[npx.newaxis, :-1, npx.newaxis]
         * vs.maskV[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
 
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     dtr = update(
         dtr,
@@ -232,6 +240,7 @@ def biharmonic_diffusion(state, tr, diffusivity):
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         + (flux_north[1:, 1:, :] - flux_north[1:, :-1, :])
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis]),
+        inplace=True,
     )
 
     dtr = dtr * vs.maskT
@@ -260,8 +269,9 @@ def horizontal_diffusion(state, tr, diffusivity):
         * (tr[1:, :, :] - tr[:-1, :, :])
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
 
     flux_north = update(
         flux_north,
@@ -271,15 +281,16 @@ def horizontal_diffusion(state, tr, diffusivity):
         / vs.dyu[npx.newaxis, :-1, npx.newaxis]
         * vs.maskV[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     if settings.enable_hor_friction_cos_scaling:
         flux_east = update_multiply(
-            flux_east, at[...], vs.cost[npx.newaxis, :, npx.newaxis] ** settings.hor_friction_cosPower
+            flux_east, at[...], vs.cost[npx.newaxis, :, npx.newaxis] ** settings.hor_friction_cosPower, inplace=True
         )
         flux_north = update_multiply(
-            flux_north, at[...], vs.cosu[npx.newaxis, :, npx.newaxis] ** settings.hor_friction_cosPower
+            flux_north, at[...], vs.cosu[npx.newaxis, :, npx.newaxis] ** settings.hor_friction_cosPower, inplace=True
         )
 
     dtr_hmix = update(
@@ -292,6 +303,7 @@ def horizontal_diffusion(state, tr, diffusivity):
             / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis])
         )
         * vs.maskT[1:, 1:, :],
+        inplace=True,
     )
 
     return dtr_hmix, flux_east, flux_north
@@ -141,14 +141,17 @@ def integrate_eke_kernel(state):
         * settings.alpha_eke,
     )
     a_tri = update(a_tri, at[:, :, 1:-1], -delta[:, :, :-2] / vs.dzw[1:-1])
-    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1]))
+    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1]), inplace=True)
     b_tri = update(
         b_tri,
         at[:, :, 1:-1],
         1 + (delta[:, :, 1:-1] + delta[:, :, :-2]) / vs.dzw[1:-1] + settings.dt_tracer * c_int[2:-2, 2:-2, 1:-1],
     )
     b_tri = update(
-        b_tri, at[:, :, -1], 1 + delta[:, :, -2] / (0.5 * vs.dzw[-1]) + settings.dt_tracer * c_int[2:-2, 2:-2, -1]
+        b_tri,
+        at[:, :, -1],
+        1 + delta[:, :, -2] / (0.5 * vs.dzw[-1]) + settings.dt_tracer * c_int[2:-2, 2:-2, -1],
+        inplace=True,
     )
     b_tri_edge = 1 + delta / vs.dzw[npx.newaxis, npx.newaxis, :] + settings.dt_tracer * c_int[2:-2, 2:-2, :]
     c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzw[npx.newaxis, npx.newaxis, :-1])
@@ -174,8 +177,9 @@ def integrate_eke_kernel(state):
         * (vs.eke[1:, :, :, vs.tau] - vs.eke[:-1, :, :, vs.tau])
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
     flux_north = update(
         flux_north,
         at[:, :-1, :],
@@ -185,8 +189,9 @@ def integrate_eke_kernel(state):
         / vs.dyu[npx.newaxis, :-1, npx.newaxis]
         * vs.maskV[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
     vs.eke = update_add(
         vs.eke,
         at[2:-2, 2:-2, :, vs.taup1],
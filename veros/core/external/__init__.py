@@ -1,3 +1,13 @@
 from veros.core.external.streamfunction_init import streamfunction_init  # noqa: F401
-from veros.core.external.solve_stream import solve_streamfunction  # noqa: F401
-from veros.core.external.solve_pressure import solve_pressure  # noqa: F401
+from veros.core.external.solve_stream import (  # noqa: F401
+    solve_streamfunction,
+    prepare_streamfunction,
+    solve_streamfunction_system,
+    update_streamfunction,
+)
+from veros.core.external.solve_pressure import (  # noqa: F401
+    solve_pressure,
+    prepare_pressure,
+    solve_pressure_system,
+    update_pressure,
+)
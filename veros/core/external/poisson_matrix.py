@@ -55,6 +55,7 @@ def assemble_pressure_matrix(state):
         / vs.cost[npx.newaxis, 2:-2]
         # free surface
         - 1.0 / (settings.grav * settings.dt_mom * settings.dt_tracer) * maskM[2:-2, 2:-2],
+        inplace=True,
     )
 
     east_diag = update(
@@ -128,6 +129,7 @@ def assemble_streamfunction_matrix(state):
         / vs.dyt[npx.newaxis, 3:-1]
         * vs.cost[npx.newaxis, 3:-1]
         / vs.cosu[npx.newaxis, 2:-2],
+        inplace=True,
     )
     east_diag = update(
         east_diag,
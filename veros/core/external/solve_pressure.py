@@ -19,12 +19,24 @@ from veros.core.external.solvers import get_linear_solver
 
 @veros_routine
 def solve_pressure(state):
+    prepare_pressure(state)
+    solve_pressure_system(state)
+    update_pressure(state)
+
+
+@veros_routine
+def prepare_pressure(state):
     vs = state.variables
-    state_update, forc = prepare_forcing(state)
+    state_update, vs.psi_forc = prepare_forcing(state)
     vs.update(state_update)
 
+
+@veros_routine(traceable=False)
+def solve_pressure_system(state):
+    vs = state.variables
+
     linear_solver = get_linear_solver(state)
-    linear_sol = linear_solver.solve(state, forc, vs.psi[..., vs.taup1])
+    linear_sol = linear_solver.solve(state, vs.psi_forc, vs.psi[..., vs.taup1])
     linear_sol = mainutils.enforce_boundaries(linear_sol, state.settings.enable_cyclic_x)
 
     if vs.itt == 0:
@@ -32,6 +44,10 @@ def solve_pressure(state):
     else:
         vs.psi = update(vs.psi, at[..., vs.taup1], linear_sol)
 
+
+@veros_routine
+def update_pressure(state):
+    vs = state.variables
     vs.update(barotropic_velocity_update(state))
 
 
@@ -117,11 +133,13 @@ def prepare_forcing(state):
         uloc,
         at[2:-2, 2:-2],
         npx.sum((vs.u[2:-2, 2:-2, :, vs.taup1]) * vs.maskU[2:-2, 2:-2, :] * vs.dzt, axis=(2,)) / settings.dt_mom,
+        inplace=True,
     )
     vloc = update(
         vloc,
         at[2:-2, 2:-2],
         npx.sum((vs.v[2:-2, 2:-2, :, vs.taup1]) * vs.maskV[2:-2, 2:-2, :] * vs.dzt, axis=(2,)) / settings.dt_mom,
+        inplace=True,
     )
 
     uloc = mainutils.enforce_boundaries(uloc, settings.enable_cyclic_x)
@@ -138,6 +156,7 @@ def prepare_forcing(state):
         - vs.psi[2:-2, 2:-2, vs.tau]
         / (settings.grav * settings.dt_mom * settings.dt_tracer)
         * vs.maskT[2:-2, 2:-2, -1],
+        inplace=True,
     )
 
     # first guess
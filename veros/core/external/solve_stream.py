@@ -6,27 +6,64 @@ used for streamfunction
 """
 
 
-from veros import veros_kernel, veros_routine, KernelOutput
+from veros import veros_kernel, veros_routine, KernelOutput, runtime_settings as rs
 from veros.variables import allocate
 from veros.core import utilities as mainutils
 from veros.core.operators import update, update_add, at, for_loop
 from veros.core.operators import numpy as npx
 from veros.core.external import line_integrals
-from veros.core.external.solvers import get_linear_solver
+from veros.core.external.solvers import get_linear_solver, get_solution_history
 
 
 @veros_routine
 def solve_streamfunction(state):
-    vs = state.variables
+    prepare_streamfunction(state)
+    solve_streamfunction_system(state)
+    update_streamfunction(state)
+
 
-    state_update, (forc, uloc, vloc) = prepare_forcing(state)
+@veros_routine
+def prepare_streamfunction(state):
+    vs = state.variables
+    state_update, vs.psi_forc = prepare_forcing(state)
     vs.update(state_update)
 
+
+@veros_routine
+def solve_streamfunction_system(state):
+    vs = state.variables
+
     linear_solver = get_linear_solver(state)
-    linear_sol = linear_solver.solve(state, forc, vs.dpsi[..., vs.taup1])
+
+    if rs.solver_history_size > 0:
+        # use previous solutions for a better initial guess, boundary values stay untouched
+        solution_history = get_solution_history(state)
+        x0 = solution_history.initial_guess(state, vs.psi_forc, vs.dpsi[..., vs.taup1])
+        linear_sol = linear_solver.solve(state, vs.psi_forc, x0, boundary_val=vs.dpsi[..., vs.taup1])
+        solution_history.append(vs.psi_forc, linear_sol)
+    else:
+        linear_sol = linear_solver.solve(state, vs.psi_forc, vs.dpsi[..., vs.taup1])
+
     vs.dpsi = update(vs.dpsi, at[..., vs.taup1], linear_sol)
 
-    vs.update(barotropic_velocity_update(state, uloc=uloc, vloc=vloc))
+
+@veros_routine
+def update_streamfunction(state):
+    vs = state.variables
+    vs.update(barotropic_velocity_update(state))
+
+
+@veros_kernel
+def barotropic_forcing(state):
+    vs = state.variables
+    settings = state.settings
+
+    uloc = npx.sum((vs.du[:, :, :, vs.tau] + vs.du_mix) * vs.maskU * vs.dzt, axis=(2,)) * vs.hur
+    vloc = npx.sum((vs.dv[:, :, :, vs.tau] + vs.dv_mix) * vs.maskV * vs.dzt, axis=(2,)) * vs.hvr
+
+    uloc = mainutils.enforce_boundaries(uloc, settings.enable_cyclic_x)
+    vloc = mainutils.enforce_boundaries(vloc, settings.enable_cyclic_x)
+    return uloc, vloc
 
 
 @veros_kernel
@@ -77,11 +114,7 @@ def prepare_forcing(state):
     )
 
     # forcing for barotropic streamfunction
-    uloc = npx.sum((vs.du[:, :, :, vs.tau] + vs.du_mix) * vs.maskU * vs.dzt, axis=(2,)) * vs.hur
-    vloc = npx.sum((vs.dv[:, :, :, vs.tau] + vs.dv_mix) * vs.maskV * vs.dzt, axis=(2,)) * vs.hvr
-
-    uloc = mainutils.enforce_boundaries(uloc, settings.enable_cyclic_x)
-    vloc = mainutils.enforce_boundaries(vloc, settings.enable_cyclic_x)
+    uloc, vloc = barotropic_forcing(state)
 
     forc = allocate(state.dimensions, ("xt", "yt"))
     forc = update(
@@ -89,22 +122,26 @@ def prepare_forcing(state):
         at[2:-2, 2:-2],
         (vloc[3:-1, 2:-2] - vloc[2:-2, 2:-2]) / (vs.cosu[2:-2] * vs.dxu[2:-2, npx.newaxis])
         - (vs.cost[3:-1] * uloc[2:-2, 3:-1] - vs.cost[2:-2] * uloc[2:-2, 2:-2]) / (vs.cosu[2:-2] * vs.dyu[2:-2]),
+        inplace=True,
     )
 
     # solve for interior streamfunction
     vs.dpsi = update(vs.dpsi, at[:, :, vs.taup1], 2 * vs.dpsi[:, :, vs.tau] - vs.dpsi[:, :, vs.taum1])
 
-    return KernelOutput(du=vs.du, dv=vs.dv, dpsi=vs.dpsi, p_hydro=vs.p_hydro), (forc, uloc, vloc)
+    return KernelOutput(du=vs.du, dv=vs.dv, dpsi=vs.dpsi, p_hydro=vs.p_hydro), forc
 
 
 @veros_kernel
-def barotropic_velocity_update(state, uloc, vloc):
+def barotropic_velocity_update(state):
     """
     solve for barotropic streamfunction
     """
     vs = state.variables
     settings = state.settings
 
+    # tendencies are unchanged by the linear solve, so the forcing is recomputed here
+    uloc, vloc = barotropic_forcing(state)
+
     vs.dpsi = update(
         vs.dpsi, at[:, :, vs.taup1], mainutils.enforce_boundaries(vs.dpsi[:, :, vs.taup1], settings.enable_cyclic_x)
     )
@@ -119,6 +156,7 @@ def barotropic_velocity_update(state, uloc, vloc):
             line_integrals.line_integrals(state, uloc=uloc[..., npx.newaxis], vloc=vloc[..., npx.newaxis], kind="same")[
                 1:
             ],
+            inplace=True,
         )
 
         # calculate island integrals of interior streamfunction
@@ -132,6 +170,7 @@ def barotropic_velocity_update(state, uloc, vloc):
             * (vs.dpsi[1:, 1:, vs.taup1] - vs.dpsi[1:, :-1, vs.taup1])
             / vs.dyt[npx.newaxis, 1:]
             * vs.hur[1:, 1:],
+            inplace=True,
         )
         vloc = update(
             vloc,
@@ -140,6 +179,7 @@ def barotropic_velocity_update(state, uloc, vloc):
             * (vs.dpsi[1:, 1:, vs.taup1] - vs.dpsi[:-1, 1:, vs.taup1])
             / (vs.cosu[npx.newaxis, 1:] * vs.dxt[1:, npx.newaxis])
             * vs.hvr[1:, 1:],
+            inplace=True,
         )
         line_forc = update_add(
             line_forc,
@@ -147,6 +187,7 @@ def barotropic_velocity_update(state, uloc, vloc):
             -line_integrals.line_integrals(
                 state, uloc=uloc[..., npx.newaxis], vloc=vloc[..., npx.newaxis], kind="same"
             )[1:],
+            inplace=True,
         )
 
         # solve for time dependent boundary values
@@ -24,7 +24,10 @@ def _get_solver_class():
             try:
                 from veros.core.external.solvers.petsc_ import PETScSolver
             except ImportError:
-                logger.warning("PETSc linear solver not available, falling back to SciPy")
+                logger.warning(
+                    "PETSc linear solver not available, falling back to SciPy "
+                    "(use linear_solver=krylov for a solver that does not gather to rank 0)"
+                )
             else:
                 return PETScSolver
 
@@ -51,6 +54,14 @@ def _get_solver_class():
         from veros.core.external.solvers.scipy_jax import JAXSciPySolver
 
         return JAXSciPySolver
+    elif ls == "krylov":
+        from veros.core.external.solvers.krylov import KrylovSolver
+
+        return KrylovSolver
+    elif ls == "multigrid":
+        from veros.core.external.solvers.multigrid import MultigridSolver
+
+        return MultigridSolver
 
     raise ValueError(f"unrecognized linear solver {ls}")
 
@@ -60,3 +71,10 @@ def get_linear_solver(state):
     logger.debug("Initializing linear solver")
     SolverClass = _get_solver_class()
     return SolverClass(state)
+
+
+@memoize
+def get_solution_history(state):
+    from veros.core.external.solvers.history import SolutionHistory
+
+    return SolutionHistory(rs.solver_history_size)
@@ -0,0 +1,50 @@
+from veros import veros_kernel, distributed
+from veros.core.operators import numpy as npx
+
+# singular values of the (squared) projection problem below this threshold are ignored
+PROJECTION_RCOND = 1e-12
+
+
+class SolutionHistory:
+    """Recent solutions of a linear system, used to compute initial guesses.
+
+    The initial guess is the linear combination of previous solutions whose right hand
+    sides best match the current right hand side (in the least squares sense). Since
+    linear extrapolation lies in the span of the previous solutions, this guess is never
+    worse than extrapolation once two solutions are known.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._solutions = []
+        self._rhs = []
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def initial_guess(self, state, rhs, x0):
+        """Project ``rhs`` onto the right hand sides of the stored solutions. Returns ``x0``
+        if no solutions are stored yet."""
+        if not self._solutions:
+            return x0
+
+        return project_initial_guess(state, rhs, tuple(self._solutions), tuple(self._rhs))
+
+    def append(self, rhs, solution):
+        self._solutions.append(solution)
+        self._rhs.append(rhs)
+
+        if len(self._solutions) > self.size:
+            self._solutions.pop(0)
+            self._rhs.pop(0)
+
+
+@veros_kernel
+def project_initial_guess(state, rhs, solutions, rhs_history):
+    basis = npx.stack([b[2:-2, 2:-2] for b in rhs_history])
+
+    gram = distributed.global_sum(npx.einsum("ixy,jxy->ij", basis, basis))
+    proj = distributed.global_sum(npx.einsum("ixy,xy->i", basis, rhs[2:-2, 2:-2]))
+    coeffs = npx.linalg.lstsq(gram, proj, rcond=PROJECTION_RCOND)[0]
+
+    return sum(coeff * solution for coeff, solution in zip(coeffs, solutions))
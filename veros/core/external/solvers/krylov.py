@@ -0,0 +1,194 @@
+from veros import logger, veros_kernel, distributed, runtime_settings as rs
+from veros.variables import allocate
+from veros.core import utilities
+from veros.core.operators import update, at, while_loop, numpy as npx
+from veros.core.external.solvers.base import LinearSolver
+from veros.core.external.poisson_matrix import assemble_poisson_matrix
+
+SOLVER_OPTIONS = {
+    "atol": 1e-8,
+    "max_it": 1000,
+}
+
+
+class KrylovSolver(LinearSolver):
+    """Distributed BiCGSTAB solver that does not require PETSc.
+
+    Every process iterates on its own subdomain. Matrix-vector products only need an
+    overlap exchange and dot products a global sum, so no data is gathered on a single
+    process. The system is scaled by its diagonal, and an incomplete LU factorization
+    of each subdomain is used as block Jacobi preconditioner. On JAX, the
+    preconditioner is applied on the host through a callback.
+    """
+
+    def __init__(self, state):
+        diags, offsets, boundary_mask = assemble_poisson_matrix(state)
+
+        # Jacobi scaling, main diagonal is never zero
+        main_diag = diags[0]
+        self._diags = tuple(diag / main_diag for diag in diags)
+        self._main_diag = main_diag
+        self._offsets = tuple(tuple(offset) for offset in offsets)
+        self._boundary_mask = boundary_mask
+
+        # cells that are not filled by an overlap exchange lie on the global boundary
+        fixed_mask = allocate(state.dimensions, ("xu", "yu"), fill=1)
+        fixed_mask = update(fixed_mask, at[2:-2, 2:-2], 0, inplace=True)
+        self._fixed_mask = utilities.enforce_boundaries(fixed_mask, state.settings.enable_cyclic_x)
+
+        self._preconditioner, self._preconditioner_args = self._get_preconditioner(self._diags, self._offsets)
+
+    def _get_preconditioner(self, diags, offsets):
+        """Get a function ``precondition(x, *args)`` approximating the inverse of the scaled
+        matrix on the local subdomain, and its array arguments."""
+        logger.info("Computing ILU preconditioner...")
+        return self._subdomain_ilu(diags, offsets), ()
+
+    @staticmethod
+    def _subdomain_ilu(diags, offsets):
+        """Incomplete LU factorization of the matrix restricted to the local subdomain"""
+        import numpy as onp
+        import scipy.sparse
+        import scipy.sparse.linalg as spalg
+
+        nx_local, ny_local = diags[0].shape[0] - 4, diags[0].shape[1] - 4
+        idx = onp.arange(nx_local * ny_local).reshape(nx_local, ny_local)
+        ii, jj = onp.meshgrid(onp.arange(nx_local), onp.arange(ny_local), indexing="ij")
+
+        rows, cols, vals = [], [], []
+        for diag, (dx, dy) in zip(diags, offsets):
+            # drop couplings to cells outside of the subdomain
+            inside = (ii + dx >= 0) & (ii + dx < nx_local) & (jj + dy >= 0) & (jj + dy < ny_local)
+            rows.append(idx[inside])
+            cols.append(idx[inside] + dx * ny_local + dy)
+            vals.append(onp.asarray(diag[2:-2, 2:-2], dtype="float64")[inside])
+
+        matrix = scipy.sparse.csc_matrix(
+            (onp.concatenate(vals), (onp.concatenate(rows), onp.concatenate(cols))),
+            shape=(idx.size, idx.size),
+        )
+        ilu = spalg.spilu(matrix, drop_tol=1e-6, fill_factor=100)
+
+        def apply_ilu(x):
+            res = onp.zeros_like(x)
+            res[2:-2, 2:-2] = ilu.solve(onp.asarray(x[2:-2, 2:-2], dtype="float64").reshape(-1)).reshape(
+                nx_local, ny_local
+            )
+            return res
+
+        if rs.backend == "jax":
+            import jax
+
+            def precondition(x):
+                return jax.pure_callback(apply_ilu, jax.ShapeDtypeStruct(x.shape, x.dtype), x)
+
+            return precondition
+
+        return apply_ilu
+
+    def solve(self, state, rhs, x0, boundary_val=None):
+        """
+        Arguments:
+            rhs: Right-hand side vector
+            x0: Initial guess
+            boundary_val: Array containing values to set on boundary elements. Defaults to `x0`.
+        """
+        if boundary_val is None:
+            boundary_val = x0
+
+        linear_solution, iterations, residual, tolerance = bicgstab(
+            state,
+            rhs,
+            x0,
+            boundary_val,
+            self._diags,
+            self._main_diag,
+            self._boundary_mask,
+            self._fixed_mask,
+            self._offsets,
+            self._preconditioner,
+            self._preconditioner_args,
+        )
+
+        if residual > tolerance:
+            logger.warning(
+                "Streamfunction solver did not converge after {} iterations (residual: {:.2e})",
+                int(iterations),
+                float(residual),
+            )
+        else:
+            logger.debug(f" Streamfunction solver converged after {int(iterations)} iterations")
+
+        return linear_solution
+
+
+@veros_kernel(static_args=("offsets", "precondition"))
+def bicgstab(
+    state, rhs, x0, boundary_val, diags, main_diag, boundary_mask, fixed_mask, offsets, precondition, precondition_args
+):
+    settings = state.settings
+
+    def stencil(x):
+        res = sum(
+            diag[2:-2, 2:-2] * x[2 + dx : x.shape[0] - 2 + dx, 2 + dy : x.shape[1] - 2 + dy]
+            for diag, (dx, dy) in zip(diags, offsets)
+        )
+        return update(npx.zeros_like(x), at[2:-2, 2:-2], res)
+
+    def apply_operator(x):
+        # get overlap from neighbors, global boundary values are treated as known
+        x = utilities.enforce_boundaries(x, settings.enable_cyclic_x)
+        return stencil(x * (1 - fixed_mask))
+
+    def dot(*pairs):
+        local_dots = npx.stack([npx.sum(a[2:-2, 2:-2] * b[2:-2, 2:-2]) for a, b in pairs])
+        return distributed.global_sum(local_dots)
+
+    rhs = npx.where(boundary_mask, rhs, boundary_val)  # set right hand side on boundaries
+
+    # move known boundary values to the right hand side
+    boundary_values = rhs * fixed_mask
+    b = update(npx.zeros_like(rhs), at[2:-2, 2:-2], rhs[2:-2, 2:-2] / main_diag[2:-2, 2:-2])
+    b = b - stencil(boundary_values)
+
+    x = update(npx.zeros_like(rhs), at[2:-2, 2:-2], x0[2:-2, 2:-2])
+    r = b - apply_operator(x)
+    r_hat = r
+
+    rho, rr, bb = dot((r_hat, r), (r, r), (b, b))
+    one = npx.ones((), dtype=rhs.dtype)
+
+    # stop at absolute tolerance, or relative to the magnitude of the forcing
+    tol2 = npx.maximum(SOLVER_OPTIONS["atol"] ** 2, rs.solver_rtol**2 * bb)
+
+    def cond(carry):
+        it, *_, rr = carry
+        return (it < SOLVER_OPTIONS["max_it"]) & (rr > tol2)
+
+    def body(carry):
+        it, x, r, p, v, rho_old, alpha, omega, rho, _ = carry
+
+        beta = (rho / rho_old) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        p_hat = precondition(p, *precondition_args)
+        v = apply_operator(p_hat)
+
+        alpha = rho / dot((r_hat, v))[0]
+        s = r - alpha * v
+        s_hat = precondition(s, *precondition_args)
+        t = apply_operator(s_hat)
+
+        ts, tt = dot((t, s), (t, t))
+        omega = ts / tt
+
+        x = x + alpha * p_hat + omega * s_hat
+        r = s - omega * t
+
+        rho_new, rr = dot((r_hat, r), (r, r))
+        return it + 1, x, r, p, v, rho, alpha, omega, rho_new, rr
+
+    init = (0, x, r, npx.zeros_like(r), npx.zeros_like(r), one, one, one, rho, rr)
+    iterations, x, *_, rr = while_loop(cond, body, init)
+
+    linear_solution = update(rhs, at[2:-2, 2:-2], x[2:-2, 2:-2])
+    return linear_solution, iterations, npx.sqrt(rr), npx.sqrt(tol2)
@@ -88,7 +88,9 @@ class PETScSolver(LinearSolver):
         self._ksp.setOperators(self._matrix)
 
         self._ksp.setType(options["solver_type"])
-        self._ksp.setTolerances(atol=options["atol"], rtol=options["rtol"], max_it=options["max_it"])
+        self._ksp.setTolerances(
+            atol=options["atol"], rtol=max(options["rtol"], rs.solver_rtol), max_it=options["max_it"]
+        )
 
         # preconditioner
         self._ksp.getPC().setType(options["PC_type"])
@@ -119,6 +121,8 @@ class PETScSolver(LinearSolver):
 
         if info < 0:
             logger.warning(f"Streamfunction solver did not converge after {iterations} iterations (error code: {info})")
+        else:
+            logger.debug(f" Streamfunction solver converged after {iterations} iterations")
 
         if rs.monitor_streamfunction_residual:
             # re-use rhs vector to store residual
@@ -127,7 +131,7 @@ class PETScSolver(LinearSolver):
             residual_norm = self._rhs_petsc.norm(PETSc.NormType.NORM_2)
             rel_residual = residual_norm / max(rhs_norm, 1e-22)
 
-            if rel_residual > 1e-8:
+            if rel_residual > max(1e-8, rs.solver_rtol):
                 logger.warning(
                     f"Streamfunction solver did not achieve required precision (rel. residual: {rel_residual:.2e})"
                 )
@@ -192,15 +196,15 @@ def prepare_solver_inputs(state, rhs, x0, boundary_val, boundary_mask, boundary_
         # add dirichlet BC to rhs
         if not settings.enable_cyclic_x:
             if rst.proc_idx[0] == rs.num_proc[0] - 1:
-                rhs = update_add(rhs, at[-3, 2:-2], -rhs[-2, 2:-2] * boundary_fac["east"])
+                rhs = update_add(rhs, at[-3, 2:-2], -rhs[-2, 2:-2] * boundary_fac["east"], inplace=True)
 
             if rst.proc_idx[0] == 0:
-                rhs = update_add(rhs, at[2, 2:-2], -rhs[1, 2:-2] * boundary_fac["west"])
+                rhs = update_add(rhs, at[2, 2:-2], -rhs[1, 2:-2] * boundary_fac["west"], inplace=True)
 
         if rst.proc_idx[1] == rs.num_proc[1] - 1:
-            rhs = update_add(rhs, at[2:-2, -3], -rhs[2:-2, -2] * boundary_fac["north"])
+            rhs = update_add(rhs, at[2:-2, -3], -rhs[2:-2, -2] * boundary_fac["north"], inplace=True)
 
         if rst.proc_idx[1] == 0:
-            rhs = update_add(rhs, at[2:-2, 2], -rhs[2:-2, 1] * boundary_fac["south"])
+            rhs = update_add(rhs, at[2:-2, 2], -rhs[2:-2, 1] * boundary_fac["south"], inplace=True)
 
     return rhs, x0
@@ -1,44 +1,145 @@
+import os
+import hashlib
+
 import numpy as onp
+import scipy
 import scipy.sparse
 import scipy.sparse.linalg as spalg
 
-from veros import logger, veros_kernel, veros_routine, distributed, runtime_state as rst
+from veros import logger, veros_kernel, veros_routine, distributed, runtime_settings as rs, runtime_state as rst
 from veros.variables import allocate
 from veros.core.operators import update, at, numpy as npx
 from veros.core.external.solvers.base import LinearSolver
 from veros.core.external.poisson_matrix import assemble_poisson_matrix
 
+# all variables that enter the Poisson matrix
+MATRIX_VARIABLES = (
+    "hu",
+    "hv",
+    "hvr",
+    "hur",
+    "dxu",
+    "dxt",
+    "dyu",
+    "dyt",
+    "cosu",
+    "cost",
+    "isle_boundary_mask",
+    "maskT",
+)
+
+MATRIX_SETTINGS = ("nx", "ny", "enable_cyclic_x", "enable_streamfunction", "grav", "dt_mom", "dt_tracer")
+
+ILU_OPTIONS = {
+    "drop_tol": 1e-6,
+    "fill_factor": 100,
+}
+
+# increment when the contents of cache files change
+CACHE_VERSION = 1
+
 
 class SciPySolver(LinearSolver):
-    @veros_routine(
-        local_variables=(
-            "hu",
-            "hv",
-            "hvr",
-            "hur",
-            "dxu",
-            "dxt",
-            "dyu",
-            "dyt",
-            "cosu",
-            "cost",
-            "isle_boundary_mask",
-            "maskT",
-        ),
-        dist_safe=False,
-    )
+    @veros_routine(local_variables=MATRIX_VARIABLES, dist_safe=False)
     def __init__(self, state):
+        self._extra_args = {}
+
+        cache_file = self._get_cache_file(state)
+
+        if cache_file is not None and os.path.isfile(cache_file):
+            try:
+                ilu_preconditioner = self._read_cache(cache_file)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not read linear solver cache {cache_file}: {e!s}")
+            else:
+                logger.info(f"Read ILU preconditioner from cache {cache_file}")
+                self._extra_args["M"] = spalg.LinearOperator(self._matrix.shape, ilu_preconditioner.solve)
+                return
+
         self._matrix, self._boundary_mask = self._assemble_poisson_matrix(state)
 
         jacobi_precon = self._jacobi_preconditioner(state, self._matrix)
         self._matrix = jacobi_precon * self._matrix
         self._rhs_scale = jacobi_precon.diagonal()
-        self._extra_args = {}
 
         logger.info("Computing ILU preconditioner...")
-        ilu_preconditioner = spalg.spilu(self._matrix.tocsc(), drop_tol=1e-6, fill_factor=100)
+        ilu_preconditioner = spalg.spilu(self._matrix.tocsc(), **ILU_OPTIONS)
         self._extra_args["M"] = spalg.LinearOperator(self._matrix.shape, ilu_preconditioner.solve)
 
+        if cache_file is not None:
+            self._write_cache(cache_file, ilu_preconditioner)
+
+    @staticmethod
+    def _get_cache_file(state):
+        """Get path of the cache file for the current grid, or None if caching is disabled."""
+        if not rs.solver_cache_dir:
+            return None
+
+        vs = state.variables
+        settings = state.settings
+
+        cache_key = hashlib.sha256()
+        cache_key.update(f"{CACHE_VERSION}-{scipy.__version__}-{sorted(ILU_OPTIONS.items())}".encode())
+
+        for setting in MATRIX_SETTINGS:
+            cache_key.update(f"{setting}={getattr(settings, setting)!r}".encode())
+
+        for var in MATRIX_VARIABLES:
+            if not state.var_meta[var].active:
+                continue
+
+            arr = onp.ascontiguousarray(getattr(vs, var))
+            cache_key.update(f"{var}{arr.shape}{arr.dtype.str}".encode())
+            cache_key.update(arr.tobytes())
+
+        return os.path.join(rs.solver_cache_dir, f"scipy-solver-{cache_key.hexdigest()}.npz")
+
+    def _write_cache(self, cache_file, ilu_preconditioner):
+        matrix = self._matrix.tocsr()
+        lower, upper = ilu_preconditioner.L.tocsc(), ilu_preconditioner.U.tocsc()
+
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+
+        # write to temporary file first so concurrent runs never see partial files
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+
+        with open(tmp_file, "wb") as f:
+            onp.savez(
+                f,
+                matrix_data=matrix.data,
+                matrix_indices=matrix.indices,
+                matrix_indptr=matrix.indptr,
+                matrix_shape=matrix.shape,
+                rhs_scale=self._rhs_scale,
+                boundary_mask=onp.asarray(self._boundary_mask),
+                lower_data=lower.data,
+                lower_indices=lower.indices,
+                lower_indptr=lower.indptr,
+                upper_data=upper.data,
+                upper_indices=upper.indices,
+                upper_indptr=upper.indptr,
+                perm_r=ilu_preconditioner.perm_r,
+                perm_c=ilu_preconditioner.perm_c,
+            )
+
+        os.replace(tmp_file, cache_file)
+        logger.info(f"Wrote ILU preconditioner to cache {cache_file}")
+
+    def _read_cache(self, cache_file):
+        with onp.load(cache_file) as f:
+            shape = tuple(f["matrix_shape"])
+            matrix = scipy.sparse.csr_matrix((f["matrix_data"], f["matrix_indices"], f["matrix_indptr"]), shape=shape)
+            lower = scipy.sparse.csc_matrix((f["lower_data"], f["lower_indices"], f["lower_indptr"]), shape=shape)
+            upper = scipy.sparse.csc_matrix((f["upper_data"], f["upper_indices"], f["upper_indptr"]), shape=shape)
+            ilu_preconditioner = _ILUFactors(lower, upper, f["perm_r"], f["perm_c"])
+            rhs_scale = f["rhs_scale"]
+            boundary_mask = npx.asarray(f["boundary_mask"])
+
+        self._matrix = matrix
+        self._rhs_scale = rhs_scale
+        self._boundary_mask = boundary_mask
+        return ilu_preconditioner
+
     def _scipy_solver(self, state, rhs, x0, boundary_val):
         orig_shape = x0.shape
         orig_dtype = x0.dtype
@@ -48,18 +149,27 @@ class SciPySolver(LinearSolver):
         rhs = onp.asarray(rhs.reshape(-1) * self._rhs_scale, dtype="float64")
         x0 = onp.asarray(x0.reshape(-1), dtype="float64")
 
+        iterations = 0
+
+        def count_iterations(xk):
+            nonlocal iterations
+            iterations += 1
+
         linear_solution, info = spalg.bicgstab(
             self._matrix,
             rhs,
             x0=x0,
             atol=1e-8,
-            rtol=0,
+            rtol=rs.solver_rtol,
             maxiter=1000,
+            callback=count_iterations,
             **self._extra_args,
         )
 
         if info > 0:
             logger.warning("Streamfunction solver did not converge after {} iterations", info)
+        else:
+            logger.debug(f" Streamfunction solver converged after {iterations} iterations")
 
         return npx.asarray(linear_solution, dtype=orig_dtype).reshape(orig_shape)
 
@@ -93,7 +203,7 @@ class SciPySolver(LinearSolver):
         eps = 1e-20
         precon = allocate(state.dimensions, ("xu", "yu"), fill=1, local=False)
         diag = npx.reshape(matrix.diagonal().copy(), (settings.nx + 4, settings.ny + 4))[2:-2, 2:-2]
-        precon = update(precon, at[2:-2, 2:-2], npx.where(npx.abs(diag) > eps, 1.0 / (diag + eps), 1.0))
+        precon = update(precon, at[2:-2, 2:-2], npx.where(npx.abs(diag) > eps, 1.0 / (diag + eps), 1.0), inplace=True)
         precon = onp.asarray(precon)
         return scipy.sparse.dia_matrix((precon.reshape(-1), 0), shape=(precon.size, precon.size)).tocsr()
 
@@ -129,6 +239,22 @@ class SciPySolver(LinearSolver):
         return matrix, boundary_mask
 
 
+class _ILUFactors:
+    """Incomplete LU factorization ``Pr * A * Pc = L * U`` restored from its factors."""
+
+    def __init__(self, lower, upper, perm_r, perm_c):
+        # triangular matrices factorize without fill-in when their ordering is kept
+        self._lower = spalg.splu(lower, permc_spec="NATURAL", diag_pivot_thresh=0)
+        self._upper = spalg.splu(upper, permc_spec="NATURAL", diag_pivot_thresh=0)
+        self._perm_r = perm_r
+        self._perm_c = perm_c
+
+    def solve(self, rhs):
+        permuted_rhs = onp.empty_like(rhs)
+        permuted_rhs[self._perm_r] = rhs
+        return self._upper.solve(self._lower.solve(permuted_rhs))[self._perm_c]
+
+
 @veros_kernel
 def gather_variables(state, rhs, x0, boundary_val):
     rhs_global = distributed.gather(rhs, state.dimensions, ("xt", "yt"))
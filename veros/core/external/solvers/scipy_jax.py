@@ -1,4 +1,4 @@
-from veros import distributed, veros_routine, veros_kernel, runtime_state as rst
+from veros import distributed, veros_routine, veros_kernel, runtime_settings as rs, runtime_state as rst
 from veros.variables import allocate
 
 from veros.core.operators import update, update_add, at, numpy as npx
@@ -73,6 +73,7 @@ class JAXSciPySolver(LinearSolver):
                         res,
                         at[i_s_inv:i_e_inv, j_s_inv:j_e_inv],
                         diag[i_s_inv:i_e_inv, j_s_inv:j_e_inv] * rhs[i_s:i_e, j_s:j_e],
+                        inplace=True,
                     )
 
                 return res
@@ -81,7 +82,7 @@ class JAXSciPySolver(LinearSolver):
                 matmul,
                 rhs * self._rhs_scale,
                 x0=x0,
-                tol=0,
+                tol=rs.solver_rtol,
                 atol=1e-8,
                 maxiter=10_000,
             )
@@ -117,7 +118,9 @@ class JAXSciPySolver(LinearSolver):
         eps = 1e-20
         precon = allocate(state.dimensions, ("xu", "yu"), fill=1, local=False)
         main_diag = matrix_diags[0][2:-2, 2:-2]
-        precon = update(precon, at[2:-2, 2:-2], npx.where(npx.abs(main_diag) > eps, 1.0 / (main_diag + eps), 1.0))
+        precon = update(
+            precon, at[2:-2, 2:-2], npx.where(npx.abs(main_diag) > eps, 1.0 / (main_diag + eps), 1.0), inplace=True
+        )
         return precon
 
     @staticmethod
@@ -106,6 +106,7 @@ def island_integrals(state):
         * vs.maskU[1:, 1:, -1, npx.newaxis]
         / vs.dyt[npx.newaxis, 1:, npx.newaxis]
         * vs.hur[1:, 1:, npx.newaxis],
+        inplace=True,
     )
 
     vloc = update(
@@ -115,6 +116,7 @@ def island_integrals(state):
         * vs.maskV[1:, 1:, -1, npx.newaxis]
         / (vs.cosu[npx.newaxis, 1:, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         * vs.hvr[1:, 1:, npx.newaxis],
+        inplace=True,
     )
 
     vs.line_psin = line_integrals.line_integrals(state, uloc=uloc, vloc=vloc, kind="full")
@@ -29,8 +29,9 @@ def explicit_vert_friction(state):
         / vs.dzw[npx.newaxis, npx.newaxis, :-1]
         * vs.maskU[1:-2, 1:-2, 1:]
         * vs.maskU[1:-2, 1:-2, :-1],
+        inplace=True,
     )
-    flux_top = update(flux_top, at[:, :, -1], 0.0)
+    flux_top = update(flux_top, at[:, :, -1], 0.0, inplace=True)
     vs.du_mix = update(vs.du_mix, at[:, :, 0], flux_top[:, :, 0] / vs.dzt[0] * vs.maskU[:, :, 0])
     vs.du_mix = update(
         vs.du_mix, at[:, :, 1:], (flux_top[:, :, 1:] - flux_top[:, :, :-1]) / vs.dzt[1:] * vs.maskU[:, :, 1:]
@@ -45,8 +46,9 @@ def explicit_vert_friction(state):
         (vs.u[1:-2, 1:-2, 1:, vs.tau] - vs.u[1:-2, 1:-2, :-1, vs.tau])
         * flux_top[1:-2, 1:-2, :-1]
         / vs.dzw[npx.newaxis, npx.newaxis, :-1],
+        inplace=True,
     )
-    diss = update(diss, at[:, :, -1], 0.0)
+    diss = update(diss, at[:, :, -1], 0.0, inplace=True)
     diss = numerics.ugrid_to_tgrid(state, diss)
     vs.K_diss_v = vs.K_diss_v + diss
 
@@ -62,8 +64,9 @@ def explicit_vert_friction(state):
         / vs.dzw[npx.newaxis, npx.newaxis, :-1]
         * vs.maskV[1:-2, 1:-2, 1:]
         * vs.maskV[1:-2, 1:-2, :-1],
+        inplace=True,
     )
-    flux_top = update(flux_top, at[:, :, -1], 0.0)
+    flux_top = update(flux_top, at[:, :, -1], 0.0, inplace=True)
     vs.dv_mix = update(
         vs.dv_mix,
         at[:, :, 1:],
@@ -81,7 +84,7 @@ def explicit_vert_friction(state):
         * flux_top[1:-2, 1:-2, :-1]
         / vs.dzw[npx.newaxis, npx.newaxis, :-1],
     )
-    diss = update(diss, at[:, :, -1], 0.0)
+    diss = update(diss, at[:, :, -1], 0.0, inplace=True)
     diss = numerics.vgrid_to_tgrid(state, diss)
     vs.K_diss_v = vs.K_diss_v + diss
 
@@ -113,14 +116,17 @@ def implicit_vert_friction(state):
 
     fxa = 0.5 * (vs.kappaM[1:-2, 1:-2, :-1] + vs.kappaM[2:-1, 1:-2, :-1])
     delta = update(
-        delta, at[:, :, :-1], settings.dt_mom / vs.dzw[:-1] * fxa * vs.maskU[1:-2, 1:-2, 1:] * vs.maskU[1:-2, 1:-2, :-1]
+        delta,
+        at[:, :, :-1],
+        settings.dt_mom / vs.dzw[:-1] * fxa * vs.maskU[1:-2, 1:-2, 1:] * vs.maskU[1:-2, 1:-2, :-1],
+        inplace=True,
     )
-    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
-    b_tri = update(b_tri, at[:, :, 1:], 1 + delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
-    b_tri = update_add(b_tri, at[:, :, 1:-1], delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1])
+    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:], inplace=True)
+    b_tri = update(b_tri, at[:, :, 1:], 1 + delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:], inplace=True)
+    b_tri = update_add(b_tri, at[:, :, 1:-1], delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1], inplace=True)
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
-    c_tri = update(c_tri, at[...], -delta / vs.dzt[npx.newaxis, npx.newaxis, :])
-    d_tri = update(d_tri, at[...], vs.u[1:-2, 1:-2, :, vs.tau])
+    c_tri = update(c_tri, at[...], -delta / vs.dzt[npx.newaxis, npx.newaxis, :], inplace=True)
+    d_tri = update(d_tri, at[...], vs.u[1:-2, 1:-2, :, vs.tau], inplace=True)
 
     res = utilities.solve_implicit(a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
     vs.u = update(vs.u, at[1:-2, 1:-2, :, vs.taup1], npx.where(water_mask, res, vs.u[1:-2, 1:-2, :, vs.taup1]))
@@ -140,13 +146,15 @@ def implicit_vert_friction(state):
         / vs.dzw[:-1]
         * vs.maskU[1:-2, 1:-2, 1:]
         * vs.maskU[1:-2, 1:-2, :-1],
+        inplace=True,
     )
     diss = update(
         diss,
         at[1:-2, 1:-2, :-1],
         (vs.u[1:-2, 1:-2, 1:, vs.tau] - vs.u[1:-2, 1:-2, :-1, vs.tau]) * flux_top[1:-2, 1:-2, :-1] / vs.dzw[:-1],
+        inplace=True,
     )
-    diss = update(diss, at[:, :, -1], 0.0)
+    diss = update(diss, at[:, :, -1], 0.0, inplace=True)
     diss = numerics.ugrid_to_tgrid(state, diss)
     vs.K_diss_v = vs.K_diss_v + diss
 
@@ -165,13 +173,14 @@ def implicit_vert_friction(state):
         * fxa
         * vs.maskV[1:-2, 1:-2, 1:]
         * vs.maskV[1:-2, 1:-2, :-1],
+        inplace=True,
     )
     a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
     b_tri = update(b_tri, at[:, :, 1:], 1 + delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
-    b_tri = update_add(b_tri, at[:, :, 1:-1], delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1])
+    b_tri = update_add(b_tri, at[:, :, 1:-1], delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1], inplace=True)
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
     c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1])
-    c_tri = update(c_tri, at[:, :, -1], 0.0)
+    c_tri = update(c_tri, at[:, :, -1], 0.0, inplace=True)
     d_tri = update(d_tri, at[...], vs.v[1:-2, 1:-2, :, vs.tau])
 
     res = utilities.solve_implicit(a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
@@ -192,13 +201,14 @@ def implicit_vert_friction(state):
         / vs.dzw[:-1]
         * vs.maskV[1:-2, 1:-2, 1:]
         * vs.maskV[1:-2, 1:-2, :-1],
+        inplace=True,
     )
     diss = update(
         diss,
         at[1:-2, 1:-2, :-1],
         (vs.v[1:-2, 1:-2, 1:, vs.tau] - vs.v[1:-2, 1:-2, :-1, vs.tau]) * flux_top[1:-2, 1:-2, :-1] / vs.dzw[:-1],
     )
-    diss = update(diss, at[:, :, -1], 0.0)
+    diss = update(diss, at[:, :, -1], 0.0, inplace=True)
     diss = numerics.vgrid_to_tgrid(state, diss)
     vs.K_diss_v = vs.K_diss_v + diss
 
@@ -256,6 +266,7 @@ def linear_bottom_friction(state):
                 * vs.r_bot_var_u[1:-2, 2:-2, npx.newaxis]
                 * vs.u[1:-2, 2:-2, :, vs.tau] ** 2
                 * mask,
+                inplace=True,
             )
             vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_u(state, diss))
 
@@ -275,6 +286,7 @@ def linear_bottom_friction(state):
                 * vs.r_bot_var_v[2:-2, 1:-2, npx.newaxis]
                 * vs.v[2:-2, 1:-2, :, vs.tau] ** 2
                 * mask,
+                inplace=True,
             )
             vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_v(state, diss))
     else:
@@ -290,7 +302,10 @@ def linear_bottom_friction(state):
         if settings.enable_conserve_energy:
             diss = allocate(state.dimensions, ("xt", "yu", "zt"))
             diss = update(
-                diss, at[1:-2, 2:-2], vs.maskU[1:-2, 2:-2] * settings.r_bot * vs.u[1:-2, 2:-2, :, vs.tau] ** 2 * mask
+                diss,
+                at[1:-2, 2:-2],
+                vs.maskU[1:-2, 2:-2] * settings.r_bot * vs.u[1:-2, 2:-2, :, vs.tau] ** 2 * mask,
+                inplace=True,
             )
             vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_u(state, diss))
 
@@ -303,7 +318,10 @@ def linear_bottom_friction(state):
         if settings.enable_conserve_energy:
             diss = allocate(state.dimensions, ("xt", "yu", "zt"))
             diss = update(
-                diss, at[2:-2, 1:-2], vs.maskV[2:-2, 1:-2] * settings.r_bot * vs.v[2:-2, 1:-2, :, vs.tau] ** 2 * mask
+                diss,
+                at[2:-2, 1:-2],
+                vs.maskV[2:-2, 1:-2] * settings.r_bot * vs.v[2:-2, 1:-2, :, vs.tau] ** 2 * mask,
+                inplace=True,
             )
             vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_v(state, diss))
 
@@ -341,7 +359,7 @@ def quadratic_bottom_friction(state):
 
     if settings.enable_conserve_energy:
         diss = allocate(state.dimensions, ("xt", "yu", "zt"))
-        diss = update(diss, at[1:-2, 2:-2, :], aloc * vs.u[1:-2, 2:-2, :, vs.tau])
+        diss = update(diss, at[1:-2, 2:-2, :], aloc * vs.u[1:-2, 2:-2, :, vs.tau], inplace=True)
         vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_u(state, diss))
 
     k = npx.maximum(vs.kbot[2:-2, 1:-2], vs.kbot[2:-2, 2:-1]) - 1
@@ -365,7 +383,7 @@ def quadratic_bottom_friction(state):
 
     if settings.enable_conserve_energy:
         diss = allocate(state.dimensions, ("xt", "yu", "zt"))
-        diss = update(diss, at[2:-2, 1:-2, :], aloc * vs.v[2:-2, 1:-2, :, vs.tau])
+        diss = update(diss, at[2:-2, 1:-2, :], aloc * vs.v[2:-2, 1:-2, :, vs.tau], inplace=True)
         vs.K_diss_bot = update_add(vs.K_diss_bot, at[...], numerics.calc_diss_v(state, diss))
 
     return KernelOutput(du_mix=vs.du_mix, dv_mix=vs.dv_mix, K_diss_bot=vs.K_diss_bot)
@@ -398,6 +416,7 @@ def harmonic_friction(state):
             / (vs.cost * vs.dxt[1:, npx.newaxis])[:, :, npx.newaxis]
             * vs.maskU[1:]
             * vs.maskU[:-1],
+            inplace=True,
         )
         fxa = vs.cosu**settings.hor_friction_cosPower
         flux_north = update(
@@ -410,6 +429,7 @@ def harmonic_friction(state):
             * vs.maskU[:, 1:]
             * vs.maskU[:, :-1]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
         if settings.enable_noslip_lateral:
             flux_north = update_add(
@@ -431,6 +451,7 @@ def harmonic_friction(state):
                 * (1 - vs.maskU[:, 1:])
                 * vs.maskU[:, :-1]
                 * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+                inplace=True,
             )
     else:
         flux_east = update(
@@ -441,6 +462,7 @@ def harmonic_friction(state):
             / (vs.cost * vs.dxt[1:, npx.newaxis])[:, :, npx.newaxis]
             * vs.maskU[1:]
             * vs.maskU[:-1],
+            inplace=True,
         )
         flux_north = update(
             flux_north,
@@ -451,6 +473,7 @@ def harmonic_friction(state):
             * vs.maskU[:, 1:]
             * vs.maskU[:, :-1]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
         if settings.enable_noslip_lateral:
             flux_north = update_add(
@@ -470,10 +493,11 @@ def harmonic_friction(state):
                 * (1 - vs.maskU[:, 1:])
                 * vs.maskU[:, :-1]
                 * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+                inplace=True,
             )
 
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     """
     update tendency
@@ -509,6 +533,7 @@ def harmonic_friction(state):
                 + (vs.u[1:-2, 2:-2, :, vs.tau] - vs.u[1:-2, 1:-3, :, vs.tau]) * flux_north[1:-2, 1:-3]
             )
             / (vs.cost[2:-2] * vs.dyt[2:-2])[npx.newaxis, :, npx.newaxis],
+            inplace=True,
         )
         vs.K_diss_h = numerics.calc_diss_u(state, diss)
 
@@ -525,6 +550,7 @@ def harmonic_friction(state):
             / (vs.cosu * vs.dxu[:-1, npx.newaxis])[:, :, npx.newaxis]
             * vs.maskV[1:]
             * vs.maskV[:-1],
+            inplace=True,
         )
 
         if settings.enable_noslip_lateral:
@@ -545,6 +571,7 @@ def harmonic_friction(state):
                 / (vs.cosu * vs.dxu[:-1, npx.newaxis])[:, :, npx.newaxis]
                 * (1 - vs.maskV[1:])
                 * vs.maskV[:-1],
+                inplace=True,
             )
 
         flux_north = update(
@@ -557,6 +584,7 @@ def harmonic_friction(state):
             * vs.cost[npx.newaxis, 1:, npx.newaxis]
             * vs.maskV[:, :-1]
             * vs.maskV[:, 1:],
+            inplace=True,
         )
     else:
         flux_east = update(
@@ -567,6 +595,7 @@ def harmonic_friction(state):
             / (vs.cosu * vs.dxu[:-1, npx.newaxis])[:, :, npx.newaxis]
             * vs.maskV[1:]
             * vs.maskV[:-1],
+            inplace=True,
         )
 
         if settings.enable_noslip_lateral:
@@ -585,6 +614,7 @@ def harmonic_friction(state):
                 / (vs.cosu * vs.dxu[:-1, npx.newaxis])[:, :, npx.newaxis]
                 * (1 - vs.maskV[1:])
                 * vs.maskV[:-1],
+                inplace=True,
             )
 
         flux_north = update(
@@ -596,10 +626,11 @@ def harmonic_friction(state):
             * vs.cost[npx.newaxis, 1:, npx.newaxis]
             * vs.maskV[:, :-1]
             * vs.maskV[:, 1:],
+            inplace=True,
         )
 
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     """
     update tendency
@@ -670,6 +701,7 @@ def biharmonic_friction(state):
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         * vs.maskU[1:, :, :]
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
     flux_north = update(
         flux_north,
@@ -681,6 +713,7 @@ def biharmonic_friction(state):
         * vs.maskU[:, 1:, :]
         * vs.maskU[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
 
     if settings.enable_noslip_lateral:
@@ -703,10 +736,11 @@ def biharmonic_friction(state):
             * (1 - vs.maskU[:, 1:])
             * vs.maskU[:, :-1]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
 
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     del2 = allocate(state.dimensions, ("xt", "yu", "zt"))
     del2 = update(
@@ -716,6 +750,7 @@ def biharmonic_friction(state):
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dxu[1:, npx.newaxis, npx.newaxis])
         + (flux_north[1:, 1:, :] - flux_north[1:, :-1, :])
         / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis]),
+        inplace=True,
     )
 
     flux_east = update(
@@ -727,6 +762,7 @@ def biharmonic_friction(state):
         / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         * vs.maskU[1:, :, :]
         * vs.maskU[:-1, :, :],
+        inplace=True,
     )
     flux_north = update(
         flux_north,
@@ -738,6 +774,7 @@ def biharmonic_friction(state):
         * vs.maskU[:, 1:, :]
         * vs.maskU[:, :-1, :]
         * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
 
     if settings.enable_noslip_lateral:
@@ -760,10 +797,11 @@ def biharmonic_friction(state):
             * (1 - vs.maskU[:, 1:, :])
             * vs.maskU[:, :-1, :]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
 
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     """
     update tendency
@@ -803,6 +841,7 @@ def biharmonic_friction(state):
                 + (vs.u[1:-2, 2:-2, :, vs.tau] - vs.u[1:-2, 1:-3, :, vs.tau]) * flux_north[1:-2, 1:-3, :]
             )
             / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dyt[npx.newaxis, 2:-2, npx.newaxis]),
+            inplace=True,
         )
         vs.K_diss_h = numerics.calc_diss_u(state, diss)
 
@@ -838,6 +877,7 @@ def biharmonic_friction(state):
             / (vs.cosu[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
             * (1 - vs.maskV[1:, :, :])
             * vs.maskV[:-1, :, :],
+            inplace=True,
         )
 
     flux_north = update(
@@ -851,8 +891,8 @@ def biharmonic_friction(state):
         * vs.maskV[:, :-1, :]
         * vs.maskV[:, 1:, :],
     )
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     del2 = update(
         del2,
@@ -861,6 +901,7 @@ def biharmonic_friction(state):
         / (vs.cosu[npx.newaxis, 1:, npx.newaxis] * vs.dxt[1:, npx.newaxis, npx.newaxis])
         + (flux_north[1:, 1:, :] - flux_north[1:, :-1, :])
         / (vs.dyu[npx.newaxis, 1:, npx.newaxis] * vs.cosu[npx.newaxis, 1:, npx.newaxis]),
+        inplace=True,
     )
 
     flux_east = update(
@@ -872,6 +913,7 @@ def biharmonic_friction(state):
         / (vs.cosu[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
         * vs.maskV[1:, :, :]
         * vs.maskV[:-1, :, :],
+        inplace=True,
     )
 
     if settings.enable_noslip_lateral:
@@ -892,6 +934,7 @@ def biharmonic_friction(state):
             / (vs.cosu[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
             * (1 - vs.maskV[1:, :, :])
             * vs.maskV[:-1, :, :],
+            inplace=True,
         )
 
     flux_north = update(
@@ -904,9 +947,10 @@ def biharmonic_friction(state):
         * vs.cost[npx.newaxis, 1:, npx.newaxis]
         * vs.maskV[:, :-1, :]
         * vs.maskV[:, 1:, :],
+        inplace=True,
     )
-    flux_east = update(flux_east, at[-1, :, :], 0.0)
-    flux_north = update(flux_north, at[:, -1, :], 0.0)
+    flux_east = update(flux_east, at[-1, :, :], 0.0, inplace=True)
+    flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
     """
     update tendency
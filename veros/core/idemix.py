@@ -86,6 +86,7 @@ def integrate_idemix_kernel(state):
                 npx.where(
                     mask, a_loc[2:-2, 2:-2, npx.newaxis] / vs.dzw[npx.newaxis, npx.newaxis, :], forc[2:-2, 2:-2, :]
                 ),
+                inplace=True,
             )
         else:
             forc = update(
@@ -98,11 +99,13 @@ def integrate_idemix_kernel(state):
                     / vs.dzw[npx.newaxis, npx.newaxis, :],
                     forc[2:-2, 2:-2, :],
                 ),
+                inplace=True,
             )
             forc = update(
                 forc,
                 at[2:-2, 2:-2, -1],
                 (1.0 - settings.eke_diss_surfbot_frac) * a_loc[2:-2, 2:-2] / (0.5 * vs.dzw[-1]),
+                inplace=True,
             )
 
     """
@@ -130,11 +133,11 @@ def integrate_idemix_kernel(state):
         * 0.5
         * (vs.c0[2:-2, 2:-2, :-1] + vs.c0[2:-2, 2:-2, 1:]),
     )
-    delta = update(delta, at[:, :, -1], 0.0)
+    delta = update(delta, at[:, :, -1], 0.0, inplace=True)
     a_tri = update(
         a_tri, at[:, :, 1:-1], -delta[:, :, :-2] * vs.c0[2:-2, 2:-2, :-2] / vs.dzw[npx.newaxis, npx.newaxis, 1:-1]
     )
-    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1:]) * vs.c0[2:-2, 2:-2, -2])
+    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1:]) * vs.c0[2:-2, 2:-2, -2], inplace=True)
     b_tri = update(
         b_tri,
         at[:, :, 1:-1],
@@ -149,6 +152,7 @@ def integrate_idemix_kernel(state):
         1
         + delta[:, :, -2] / (0.5 * vs.dzw[-1:]) * vs.c0[2:-2, 2:-2, -1]
         + settings.dt_tracer * vs.alpha_c[2:-2, 2:-2, -1] * maxE_iw[2:-2, 2:-2, -1],
+        inplace=True,
     )
     b_tri_edge = (
         1
@@ -162,7 +166,9 @@ def integrate_idemix_kernel(state):
     d_tri_edge = (
         d_tri + settings.dt_tracer * vs.forc_iw_bottom[2:-2, 2:-2, npx.newaxis] / vs.dzw[npx.newaxis, npx.newaxis, :]
     )
-    d_tri = update_add(d_tri, at[:, :, -1], settings.dt_tracer * vs.forc_iw_surface[2:-2, 2:-2] / (0.5 * vs.dzw[-1:]))
+    d_tri = update_add(
+        d_tri, at[:, :, -1], settings.dt_tracer * vs.forc_iw_surface[2:-2, 2:-2] / (0.5 * vs.dzw[-1:]), inplace=True
+    )
 
     sol = utilities.solve_implicit(
         a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, d_edge=d_tri_edge, edge_mask=edge_mask
@@ -191,6 +197,7 @@ def integrate_idemix_kernel(state):
             * (vs.v0[1:, :, :] * vs.E_iw[1:, :, :, vs.tau] - vs.v0[:-1, :, :] * vs.E_iw[:-1, :, :, vs.tau])
             / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
             * vs.maskU[:-1, :, :],
+            inplace=True,
         )
 
         flux_north = update(
@@ -203,8 +210,9 @@ def integrate_idemix_kernel(state):
             / vs.dyu[npx.newaxis, :-1, npx.newaxis]
             * vs.maskV[:, :-1, :]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
-        flux_north = update(flux_north, at[:, -1, :], 0.0)
+        flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
         vs.E_iw = update_add(
             vs.E_iw,
             at[2:-2, 2:-2, :, vs.taup1],
@@ -27,8 +27,9 @@ def _calc_tracer_fluxes(state, tr, K_iso, K_skew):
         diffloc,
         at[:, :, 1:],
         0.25 * (K1[1:-2, 2:-2, 1:] + K1[1:-2, 2:-2, :-1] + K1[2:-1, 2:-2, 1:] + K1[2:-1, 2:-2, :-1]),
+        inplace=True,
     )
-    diffloc = update(diffloc, at[:, :, 0], 0.5 * (K1[1:-2, 2:-2, 0] + K1[2:-1, 2:-2, 0]))
+    diffloc = update(diffloc, at[:, :, 0], 0.5 * (K1[1:-2, 2:-2, 0] + K1[2:-1, 2:-2, 0]), inplace=True)
 
     sumz = 0.0
     for kr in range(2):
@@ -44,6 +45,7 @@ def _calc_tracer_fluxes(state, tr, K_iso, K_skew):
         + (tr[2:-1, 2:-2, :, vs.tau] - tr[1:-2, 2:-2, :, vs.tau])
         / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dxu[1:-2, npx.newaxis, npx.newaxis])
         * vs.K_11[1:-2, 2:-2, :],
+        inplace=True,
     )
 
     """
@@ -54,8 +56,9 @@ def _calc_tracer_fluxes(state, tr, K_iso, K_skew):
         diffloc,
         at[:, :, 1:],
         0.25 * (K1[2:-2, 1:-2, 1:] + K1[2:-2, 1:-2, :-1] + K1[2:-2, 2:-1, 1:] + K1[2:-2, 2:-1, :-1]),
+        inplace=True,
     )
-    diffloc = update(diffloc, at[:, :, 0], 0.5 * (K1[2:-2, 1:-2, 0] + K1[2:-2, 2:-1, 0]))
+    diffloc = update(diffloc, at[:, :, 0], 0.5 * (K1[2:-2, 1:-2, 0] + K1[2:-2, 2:-1, 0]), inplace=True)
 
     sumz = 0.0
     for kr in range(2):
@@ -74,6 +77,7 @@ def _calc_tracer_fluxes(state, tr, K_iso, K_skew):
             / vs.dyu[npx.newaxis, 1:-2, npx.newaxis]
             * vs.K_22[2:-2, 1:-2, :]
         ),
+        inplace=True,
     )
 
     """
@@ -107,8 +111,9 @@ def _calc_tracer_fluxes(state, tr, K_iso, K_skew):
         at[2:-2, 2:-2, :-1],
         sumx / (4 * vs.dxt[2:-2, npx.newaxis, npx.newaxis])
         + sumy / (4 * vs.dyt[npx.newaxis, 2:-2, npx.newaxis] * vs.cost[npx.newaxis, 2:-2, npx.newaxis]),
+        inplace=True,
     )
-    flux_top = update(flux_top, at[:, :, -1], 0.0)
+    flux_top = update(flux_top, at[:, :, -1], 0.0, inplace=True)
 
     return flux_east, flux_north, flux_top
 
@@ -128,12 +133,16 @@ def _calc_explicit_part(state, flux_east, flux_north, flux_top):
             + (flux_north[2:-2, 2:-2, :] - flux_north[2:-2, 1:-3, :])
             / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dyt[npx.newaxis, 2:-2, npx.newaxis])
         ),
+        inplace=True,
+    )
+    explicit_part = update_add(
+        explicit_part, at[:, :, 0], vs.maskT[:, :, 0] * flux_top[:, :, 0] / vs.dzt[0], inplace=True
     )
-    explicit_part = update_add(explicit_part, at[:, :, 0], vs.maskT[:, :, 0] * flux_top[:, :, 0] / vs.dzt[0])
     explicit_part = update_add(
         explicit_part,
         at[:, :, 1:],
         vs.maskT[:, :, 1:] * (flux_top[:, :, 1:] - flux_top[:, :, :-1]) / vs.dzt[npx.newaxis, npx.newaxis, 1:],
+        inplace=True,
     )
 
     return explicit_part
@@ -152,16 +161,22 @@ def _calc_implicit_part(state, tr):
     delta = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 2:-2]
 
     delta = update(
-        delta, at[:, :, :-1], settings.dt_tracer / vs.dzw[npx.newaxis, npx.newaxis, :-1] * vs.K_33[2:-2, 2:-2, :-1]
+        delta,
+        at[:, :, :-1],
+        settings.dt_tracer / vs.dzw[npx.newaxis, npx.newaxis, :-1] * vs.K_33[2:-2, 2:-2, :-1],
+        inplace=True,
     )
-    delta = update(delta, at[:, :, -1], 0.0)
-    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
+    delta = update(delta, at[:, :, -1], 0.0, inplace=True)
+    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:], inplace=True)
     b_tri = update(
-        b_tri, at[:, :, 1:-1], 1 + (delta[:, :, 1:-1] + delta[:, :, :-2]) / vs.dzt[npx.newaxis, npx.newaxis, 1:-1]
+        b_tri,
+        at[:, :, 1:-1],
+        1 + (delta[:, :, 1:-1] + delta[:, :, :-2]) / vs.dzt[npx.newaxis, npx.newaxis, 1:-1],
+        inplace=True,
     )
-    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[npx.newaxis, npx.newaxis, -1])
+    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[npx.newaxis, npx.newaxis, -1], inplace=True)
     b_tri_edge = 1 + (delta[:, :, :] / vs.dzt[npx.newaxis, npx.newaxis, :])
-    c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1])
+    c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1], inplace=True)
     sol = utilities.solve_implicit(
         a_tri, b_tri, c_tri, tr[2:-2, 2:-2, :, vs.taup1], water_mask, b_edge=b_tri_edge, edge_mask=edge_mask
     )
@@ -200,9 +215,14 @@ def isoneutral_diffusion_tracer(state, tr, dtracer_iso, iso=True, skew=False):
     add implicit part
     """
     if iso:
-        new_tr = update(tr, at[2:-2, 2:-2, :, vs.taup1], _calc_implicit_part(state, tr))
-        dtracer_iso = dtracer_iso + (new_tr[:, :, :, vs.taup1] - tr[:, :, :, vs.taup1]) / settings.dt_tracer
-        tr = new_tr
+        tr_implicit = _calc_implicit_part(state, tr)
+        dtracer_iso = update_add(
+            dtracer_iso,
+            at[2:-2, 2:-2, :],
+            (tr_implicit - tr[2:-2, 2:-2, :, vs.taup1]) / settings.dt_tracer,
+            inplace=True,
+        )
+        tr = update(tr, at[2:-2, 2:-2, :, vs.taup1], tr_implicit)
 
     return tr, dtracer_iso, flux_east, flux_north, flux_top
 
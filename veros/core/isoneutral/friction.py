@@ -36,7 +36,7 @@ def isoneutral_friction(state):
         * vs.maskU[1:-2, 1:-2, 1:]
         * vs.maskU[1:-2, 1:-2, :-1],
     )
-    delta = update(delta, at[..., -1], 0.0)
+    delta = update(delta, at[..., -1], 0.0, inplace=True)
     a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
     b_tri = update(
@@ -46,7 +46,7 @@ def isoneutral_friction(state):
         + delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1]
         + delta[:, :, :-2] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1],
     )
-    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[-1])
+    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[-1], inplace=True)
     c_tri = update(c_tri, at[...], -delta / vs.dzt[npx.newaxis, npx.newaxis, :])
 
     sol = utilities.solve_implicit(
@@ -71,6 +71,7 @@ def isoneutral_friction(state):
             / vs.dzw[npx.newaxis, npx.newaxis, :-1]
             * vs.maskU[1:-2, 1:-2, 1:]
             * vs.maskU[1:-2, 1:-2, :-1],
+            inplace=True,
         )
         diss = update(
             diss,
@@ -78,8 +79,9 @@ def isoneutral_friction(state):
             (vs.u[1:-2, 1:-2, 1:, vs.tau] - vs.u[1:-2, 1:-2, :-1, vs.tau])
             * flux_top[1:-2, 1:-2, :-1]
             / vs.dzw[npx.newaxis, npx.newaxis, :-1],
+            inplace=True,
         )
-        diss = update(diss, at[:, :, -1], 0.0)
+        diss = update(diss, at[:, :, -1], 0.0, inplace=True)
         diss = numerics.ugrid_to_tgrid(state, diss)
         vs.K_diss_gm = diss
 
@@ -101,8 +103,9 @@ def isoneutral_friction(state):
         * fxa[:, :, :-1]
         * vs.maskV[1:-2, 1:-2, 1:]
         * vs.maskV[1:-2, 1:-2, :-1],
+        inplace=True,
     )
-    delta = update(delta, at[..., -1], 0.0)
+    delta = update(delta, at[..., -1], 0.0, inplace=True)
     a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
     b_tri = update(
@@ -112,7 +115,7 @@ def isoneutral_friction(state):
         + delta[:, :, 1:-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1]
         + delta[:, :, :-2] / vs.dzt[npx.newaxis, npx.newaxis, 1:-1],
     )
-    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[-1])
+    b_tri = update(b_tri, at[:, :, -1], 1 + delta[:, :, -2] / vs.dzt[-1], inplace=True)
     c_tri = update(c_tri, at[...], -delta / vs.dzt[npx.newaxis, npx.newaxis, :])
 
     sol = utilities.solve_implicit(
@@ -137,6 +140,7 @@ def isoneutral_friction(state):
             / vs.dzw[npx.newaxis, npx.newaxis, :-1]
             * vs.maskV[1:-2, 1:-2, 1:]
             * vs.maskV[1:-2, 1:-2, :-1],
+            inplace=True,
         )
         diss = update(
             diss,
@@ -144,8 +148,9 @@ def isoneutral_friction(state):
             (vs.v[1:-2, 1:-2, 1:, vs.tau] - vs.v[1:-2, 1:-2, :-1, vs.tau])
             * flux_top[1:-2, 1:-2, :-1]
             / vs.dzw[npx.newaxis, npx.newaxis, :-1],
+            inplace=True,
         )
-        diss = update(diss, at[:, :, -1], 0.0)
+        diss = update(diss, at[:, :, -1], 0.0, inplace=True)
         diss = numerics.vgrid_to_tgrid(state, diss)
         vs.K_diss_gm = vs.K_diss_gm + diss
 
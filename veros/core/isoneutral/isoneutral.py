@@ -49,6 +49,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskW[:, :, :-1]
         * (vs.temp[:, :, 1:, vs.tau] - vs.temp[:, :, :-1, vs.tau])
         / vs.dzw[npx.newaxis, npx.newaxis, :-1],
+        inplace=True,
     )
     dSdz = update(
         dSdz,
@@ -56,6 +57,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskW[:, :, :-1]
         * (vs.salt[:, :, 1:, vs.tau] - vs.salt[:, :, :-1, vs.tau])
         / vs.dzw[npx.newaxis, npx.newaxis, :-1],
+        inplace=True,
     )
 
     """
@@ -67,6 +69,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskU[:-1, :, :]
         * (vs.temp[1:, :, :, vs.tau] - vs.temp[:-1, :, :, vs.tau])
         / (vs.dxu[:-1, npx.newaxis, npx.newaxis] * vs.cost[npx.newaxis, :, npx.newaxis]),
+        inplace=True,
     )
     dSdx = update(
         dSdx,
@@ -74,6 +77,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskU[:-1, :, :]
         * (vs.salt[1:, :, :, vs.tau] - vs.salt[:-1, :, :, vs.tau])
         / (vs.dxu[:-1, npx.newaxis, npx.newaxis] * vs.cost[npx.newaxis, :, npx.newaxis]),
+        inplace=True,
     )
 
     """
@@ -85,6 +89,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskV[:, :-1, :]
         * (vs.temp[:, 1:, :, vs.tau] - vs.temp[:, :-1, :, vs.tau])
         / vs.dyu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
     dSdy = update(
         dSdy,
@@ -92,6 +97,7 @@ def isoneutral_diffusion_pre(state):
         vs.maskV[:, :-1, :]
         * (vs.salt[:, 1:, :, vs.tau] - vs.salt[:, :-1, :, vs.tau])
         / vs.dyu[npx.newaxis, :-1, npx.newaxis],
+        inplace=True,
     )
 
     """
@@ -103,8 +109,11 @@ def isoneutral_diffusion_pre(state):
         at[1:-2, 2:-2, 1:],
         0.25
         * (vs.K_iso[1:-2, 2:-2, 1:] + vs.K_iso[1:-2, 2:-2, :-1] + vs.K_iso[2:-1, 2:-2, 1:] + vs.K_iso[2:-1, 2:-2, :-1]),
+        inplace=True,
+    )
+    diffloc = update(
+        diffloc, at[1:-2, 2:-2, 0], 0.5 * (vs.K_iso[1:-2, 2:-2, 0] + vs.K_iso[2:-1, 2:-2, 0]), inplace=True
     )
-    diffloc = update(diffloc, at[1:-2, 2:-2, 0], 0.5 * (vs.K_iso[1:-2, 2:-2, 0] + vs.K_iso[2:-1, 2:-2, 0]))
 
     sumz = allocate(state.dimensions, ("xt", "yt", "zt"))[1:-2, 2:-2]
     for kr in range(2):
@@ -126,6 +135,7 @@ def isoneutral_diffusion_pre(state):
                 vs.dzw[npx.newaxis, npx.newaxis, : -1 + kr or None]
                 * vs.maskU[1:-2, 2:-2, ki:]
                 * npx.maximum(settings.K_iso_steep, diffloc[1:-2, 2:-2, ki:] * taper),
+                inplace=True,
             )
             vs.Ai_ez = update(vs.Ai_ez, at[1:-2, 2:-2, ki:, ip, kr], taper * sxe * vs.maskU[1:-2, 2:-2, ki:])
 
@@ -134,14 +144,17 @@ def isoneutral_diffusion_pre(state):
     """
     Compute Ai_nz and K_22 on center of north face of T cell.
     """
-    diffloc = update(diffloc, at[...], 0)
+    diffloc = update(diffloc, at[...], 0, inplace=True)
     diffloc = update(
         diffloc,
         at[2:-2, 1:-2, 1:],
         0.25
         * (vs.K_iso[2:-2, 1:-2, 1:] + vs.K_iso[2:-2, 1:-2, :-1] + vs.K_iso[2:-2, 2:-1, 1:] + vs.K_iso[2:-2, 2:-1, :-1]),
+        inplace=True,
+    )
+    diffloc = update(
+        diffloc, at[2:-2, 1:-2, 0], 0.5 * (vs.K_iso[2:-2, 1:-2, 0] + vs.K_iso[2:-2, 2:-1, 0]), inplace=True
     )
-    diffloc = update(diffloc, at[2:-2, 1:-2, 0], 0.5 * (vs.K_iso[2:-2, 1:-2, 0] + vs.K_iso[2:-2, 2:-1, 0]))
 
     sumz = allocate(state.dimensions, ("xt", "yt", "zt"))[2:-2, 1:-2]
     for kr in range(2):
@@ -163,6 +176,7 @@ def isoneutral_diffusion_pre(state):
                 vs.dzw[npx.newaxis, npx.newaxis, : -1 + kr or None]
                 * vs.maskV[2:-2, 1:-2, ki:]
                 * npx.maximum(settings.K_iso_steep, diffloc[2:-2, 1:-2, ki:] * taper),
+                inplace=True,
             )
             vs.Ai_nz = update(vs.Ai_nz, at[2:-2, 1:-2, ki:, jp, kr], taper * syn * vs.maskV[2:-2, 1:-2, ki:])
     vs.K_22 = update(vs.K_22, at[2:-2, 1:-2, :], sumz / (4.0 * vs.dzt[npx.newaxis, npx.newaxis, :]))
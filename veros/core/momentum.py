@@ -162,11 +162,13 @@ def momentum_advection(state):
         flux_east,
         at[1:-2, 2:-2],
         0.25 * (vs.u[1:-2, 2:-2, :, vs.tau] + vs.u[2:-1, 2:-2, :, vs.tau]) * (utr[2:-1, 2:-2] + utr[1:-2, 2:-2]),
+        inplace=True,
     )
     flux_north = update(
         flux_north,
         at[2:-2, 1:-2],
         0.25 * (vs.u[2:-2, 1:-2, :, vs.tau] + vs.u[2:-2, 2:-1, :, vs.tau]) * (vtr[3:-1, 1:-2] + vtr[2:-2, 1:-2]),
+        inplace=True,
     )
     flux_top = update(
         flux_top,
@@ -174,6 +176,7 @@ def momentum_advection(state):
         0.25
         * (vs.u[2:-2, 2:-2, 1:, vs.tau] + vs.u[2:-2, 2:-2, :-1, vs.tau])
         * (wtr[2:-2, 2:-2, :-1] + wtr[3:-1, 2:-2, :-1]),
+        inplace=True,
     )
     vs.du_adv = update(
         vs.du_adv,
@@ -191,16 +194,18 @@ def momentum_advection(state):
     """
     for meridional momentum
     """
-    flux_top = update(flux_top, at[...], 0.0)
+    flux_top = update(flux_top, at[...], 0.0, inplace=True)
     flux_east = update(
         flux_east,
         at[1:-2, 2:-2],
         0.25 * (vs.v[1:-2, 2:-2, :, vs.tau] + vs.v[2:-1, 2:-2, :, vs.tau]) * (utr[1:-2, 3:-1] + utr[1:-2, 2:-2]),
+        inplace=True,
     )
     flux_north = update(
         flux_north,
         at[2:-2, 1:-2],
         0.25 * (vs.v[2:-2, 1:-2, :, vs.tau] + vs.v[2:-2, 2:-1, :, vs.tau]) * (vtr[2:-2, 2:-1] + vtr[2:-2, 1:-2]),
+        inplace=True,
     )
     flux_top = update(
         flux_top,
@@ -208,6 +213,7 @@ def momentum_advection(state):
         0.25
         * (vs.v[2:-2, 2:-2, 1:, vs.tau] + vs.v[2:-2, 2:-2, :-1, vs.tau])
         * (wtr[2:-2, 2:-2, :-1] + wtr[2:-2, 3:-1, :-1]),
+        inplace=True,
     )
 
     vs.dv_adv = update(
@@ -262,6 +268,7 @@ def vertical_velocity_kernel(state):
             )
             / (vs.cost[npx.newaxis, 1:] * vs.dyt[npx.newaxis, 1:])
         ),
+        inplace=True,
     )
 
     fxa = update(
@@ -279,6 +286,7 @@ def vertical_velocity_kernel(state):
             )
             / (vs.cost[npx.newaxis, 1:, npx.newaxis] * vs.dyt[npx.newaxis, 1:, npx.newaxis])
         ),
+        inplace=True,
     )
 
     vs.w = update(vs.w, at[1:, 1:, :, vs.taup1], npx.cumsum(fxa[1:, 1:, :], axis=2))
@@ -291,6 +299,16 @@ def momentum(state):
     """
     solve for momentum for taup1
     """
+    momentum_tendencies(state)
+    solve_external_mode(state)
+    update_external_mode(state)
+
+
+@veros_routine
+def momentum_tendencies(state):
+    """
+    momentum tendencies and forcing of the external mode
+    """
     vs = state.variables
 
     """
@@ -311,11 +329,32 @@ def momentum(state):
     with state.timers["friction"]:
         friction.friction(state)
 
+    with state.timers["pressure"]:
+        if state.settings.enable_streamfunction:
+            external.prepare_streamfunction(state)
+        else:
+            external.prepare_pressure(state)
+
+
+@veros_routine
+def solve_external_mode(state):
+    """
+    external mode, only the linear solve (which may not be traceable)
+    """
+    with state.timers["pressure"]:
+        if state.settings.enable_streamfunction:
+            external.solve_streamfunction_system(state)
+        else:
+            external.solve_pressure_system(state)
+
+
+@veros_routine
+def update_external_mode(state):
     """
-    external mode
+    barotropic velocity update from the external mode solution
     """
     with state.timers["pressure"]:
         if state.settings.enable_streamfunction:
-            external.solve_streamfunction(state)
+            external.update_streamfunction(state)
         else:
-            external.solve_pressure(state)
+            external.update_pressure(state)
@@ -8,17 +8,17 @@ from veros.core.operators import update, at, numpy as npx
 @veros_kernel
 def u_centered_grid(dyt, dyu, yt, yu):
     yu = update(yu, at[0], 0)
-    yu = update(yu, at[1:], npx.cumsum(dyt[1:]))
+    yu = update(yu, at[1:], npx.cumsum(dyt[1:]), inplace=True)
 
     yt = update(yt, at[0], yu[0] - dyt[0] * 0.5)
-    yt = update(yt, at[1:], 2 * yu[:-1])
+    yt = update(yt, at[1:], 2 * yu[:-1], inplace=True)
 
     alternating_pattern = npx.ones_like(yt)
-    alternating_pattern = update(alternating_pattern, at[::2], -1)
-    yt = update(yt, at[...], alternating_pattern * npx.cumsum(alternating_pattern * yt))
+    alternating_pattern = update(alternating_pattern, at[::2], -1, inplace=True)
+    yt = update(yt, at[...], alternating_pattern * npx.cumsum(alternating_pattern * yt), inplace=True)
 
     dyu = update(dyu, at[:-1], yt[1:] - yt[:-1])
-    dyu = update(dyu, at[-1], 2 * dyt[-1] - dyu[-2])
+    dyu = update(dyu, at[-1], 2 * dyt[-1] - dyu[-2], inplace=True)
     return dyu, yt, yu
 
 
@@ -340,7 +340,7 @@ def vgrid_to_tgrid(state, a):
 def calc_diss_u(state, diss):
     vs = state.variables
     ks = allocate(state.dimensions, ("xt", "yt"))
-    ks = update(ks, at[1:-2, 2:-2], npx.maximum(vs.kbot[1:-2, 2:-2], vs.kbot[2:-1, 2:-2]))
+    ks = update(ks, at[1:-2, 2:-2], npx.maximum(vs.kbot[1:-2, 2:-2], vs.kbot[2:-1, 2:-2]), inplace=True)
     diss_u = diffusion.dissipation_on_wgrid(state, diss, ks)
     return ugrid_to_tgrid(state, diss_u)
 
@@ -349,7 +349,7 @@ def calc_diss_u(state, diss):
 def calc_diss_v(state, diss):
     vs = state.variables
     ks = allocate(state.dimensions, ("xt", "yt"))
-    ks = update(ks, at[2:-2, 1:-2], npx.maximum(vs.kbot[2:-2, 1:-2], vs.kbot[2:-2, 2:-1]))
+    ks = update(ks, at[2:-2, 1:-2], npx.maximum(vs.kbot[2:-2, 1:-2], vs.kbot[2:-2, 2:-1]), inplace=True)
     diss_v = diffusion.dissipation_on_wgrid(state, diss, ks)
     return vgrid_to_tgrid(state, diss_v)
 
@@ -16,12 +16,26 @@ def noop(*args, **kwargs):
     pass
 
 
+class CopyCounter:
+    """Keeps track of the number of bytes copied by the NumPy operators."""
+
+    def __init__(self):
+        self.total_bytes = 0
+
+    def add(self, arr):
+        self.total_bytes += arr.nbytes
+
+
+copy_counter = CopyCounter()
+
+
 @contextmanager
 def make_writeable(*arrs):
     orig_writeable = [arr.flags.writeable for arr in arrs]
     writeable_arrs = []
     try:
         for arr in arrs:
+            copy_counter.add(arr)
             arr = arr.copy()
             arr.flags.writeable = True
             writeable_arrs.append(arr)
@@ -39,20 +53,42 @@ def make_writeable(*arrs):
                 pass
 
 
-def update_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+def _get_update_target(arr, inplace):
+    # only buffers that the caller owns exclusively (e.g. temporaries allocated
+    # in the same kernel that have not been handed out) may be modified in place
+    if inplace and runtime_settings.inplace_updates and arr.flags.owndata:
+        return arr
+
+    copy_counter.add(arr)
+    return arr.copy()
+
+
+@contextmanager
+def _writeable(arr, orig_writeable):
+    arr.flags.writeable = True
+    try:
+        yield
+    finally:
+        arr.flags.writeable = orig_writeable
+
+
+def update_numpy(arr, at, to, inplace=False):
+    warr = _get_update_target(arr, inplace)
+    with _writeable(warr, arr.flags.writeable):
         warr[at] = to
     return warr
 
 
-def update_add_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+def update_add_numpy(arr, at, to, inplace=False):
+    warr = _get_update_target(arr, inplace)
+    with _writeable(warr, arr.flags.writeable):
         warr[at] += to
     return warr
 
 
-def update_multiply_numpy(arr, at, to):
-    with make_writeable(arr) as warr:
+def update_multiply_numpy(arr, at, to, inplace=False):
+    warr = _get_update_target(arr, inplace)
+    with _writeable(warr, arr.flags.writeable):
         warr[at] *= to
     return warr
 
@@ -84,6 +120,13 @@ def fori_numpy(lower, upper, body_fun, init_val):
     return val
 
 
+def while_numpy(cond_fun, body_fun, init_val):
+    val = init_val
+    while cond_fun(val):
+        val = body_fun(val)
+    return val
+
+
 def scan_numpy(f, init, xs, length=None):
     import numpy as np
 
@@ -156,15 +199,15 @@ def solve_tridiagonal_jax(a, b, c, d, water_mask, edge_mask):
     return jnp.moveaxis(sol, 0, 2)
 
 
-def update_jax(arr, at, to):
+def update_jax(arr, at, to, inplace=False):
     return arr.at[at].set(to)
 
 
-def update_add_jax(arr, at, to):
+def update_add_jax(arr, at, to, inplace=False):
     return arr.at[at].add(to)
 
 
-def update_multiply_jax(arr, at, to):
+def update_multiply_jax(arr, at, to, inplace=False):
     return arr.at[at].multiply(to)
 
 
@@ -188,6 +231,7 @@ if runtime_settings.backend == "numpy":
     at = Index()
     solve_tridiagonal = solve_tridiagonal_numpy
     for_loop = fori_numpy
+    while_loop = while_numpy
     scan = scan_numpy
     flush = noop
 
@@ -200,6 +244,7 @@ elif runtime_settings.backend == "jax":
     at = Index()
     solve_tridiagonal = solve_tridiagonal_jax
     for_loop = jax.lax.fori_loop
+    while_loop = jax.lax.while_loop
     scan = jax.lax.scan
     flush = flush_jax
 
@@ -31,10 +31,14 @@ def advect_tracer(state, tr):
             - (flux_north[2:-2, 2:-2, :] - flux_north[2:-2, 1:-3, :])
             / (vs.cost[npx.newaxis, 2:-2, npx.newaxis] * vs.dyt[npx.newaxis, 2:-2, npx.newaxis])
         ),
+        inplace=True,
     )
-    dtr = update_add(dtr, at[:, :, 0], -1 * vs.maskT[:, :, 0] * flux_top[:, :, 0] / vs.dzt[0])
+    dtr = update_add(dtr, at[:, :, 0], -1 * vs.maskT[:, :, 0] * flux_top[:, :, 0] / vs.dzt[0], inplace=True)
     dtr = update_add(
-        dtr, at[:, :, 1:], -1 * vs.maskT[:, :, 1:] * (flux_top[:, :, 1:] - flux_top[:, :, :-1]) / vs.dzt[1:]
+        dtr,
+        at[:, :, 1:],
+        -1 * vs.maskT[:, :, 1:] * (flux_top[:, :, 1:] - flux_top[:, :, :-1]) / vs.dzt[1:],
+        inplace=True,
     )
 
     return dtr
@@ -161,6 +165,7 @@ def advect_temp_salt_enthalpy(state):
                 - vs.int_drhodS[2:-2, 2:-2, :, vs.tau] * vs.dsalt[2:-2, 2:-2, :, vs.tau]
             )
             - vs.dHd[2:-2, 2:-2, :, vs.tau],
+            inplace=True,
         )
 
         """
@@ -176,6 +181,7 @@ def advect_temp_salt_enthalpy(state):
             * (vs.rho[:, :, :-1, vs.tau] + vs.rho[:, :, 1:, vs.tau])
             * vs.dzw[npx.newaxis, npx.newaxis, :-1]
             / vs.dzt[npx.newaxis, npx.newaxis, :-1],
+            inplace=True,
         )
         diss = update_add(
             diss,
@@ -187,6 +193,7 @@ def advect_temp_salt_enthalpy(state):
             * (vs.rho[:, :, 1:, vs.tau] + vs.rho[:, :, :-1, vs.tau])
             * vs.dzw[npx.newaxis, npx.newaxis, :-1]
             / vs.dzt[npx.newaxis, npx.newaxis, 1:],
+            inplace=True,
         )
 
     if settings.enable_conserve_energy and settings.enable_tke:
@@ -265,13 +272,21 @@ def vertmix_tempsalt(state):
     _, water_mask, edge_mask = utilities.create_water_masks(vs.kbot[2:-2, 2:-2], settings.nz)
 
     delta = update(
-        delta, at[:, :, :-1], settings.dt_tracer / vs.dzw[npx.newaxis, npx.newaxis, :-1] * vs.kappaH[2:-2, 2:-2, :-1]
+        delta,
+        at[:, :, :-1],
+        settings.dt_tracer / vs.dzw[npx.newaxis, npx.newaxis, :-1] * vs.kappaH[2:-2, 2:-2, :-1],
+        inplace=True,
+    )
+    delta = update(delta, at[:, :, -1], 0.0, inplace=True)
+    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:], inplace=True)
+    b_tri = update(
+        b_tri,
+        at[:, :, 1:],
+        1 + (delta[:, :, 1:] + delta[:, :, :-1]) / vs.dzt[npx.newaxis, npx.newaxis, 1:],
+        inplace=True,
     )
-    delta = update(delta, at[:, :, -1], 0.0)
-    a_tri = update(a_tri, at[:, :, 1:], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, 1:])
-    b_tri = update(b_tri, at[:, :, 1:], 1 + (delta[:, :, 1:] + delta[:, :, :-1]) / vs.dzt[npx.newaxis, npx.newaxis, 1:])
     b_tri_edge = 1 + delta / vs.dzt[npx.newaxis, npx.newaxis, :]
-    c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1])
+    c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzt[npx.newaxis, npx.newaxis, :-1], inplace=True)
     d_tri = vs.temp[2:-2, 2:-2, :, vs.taup1]
     d_tri = update_add(d_tri, at[:, :, -1], settings.dt_tracer * vs.forc_temp_surface[2:-2, 2:-2] / vs.dzt[-1])
 
@@ -375,7 +390,7 @@ def diag_P_diss_v(state):
         """
         determine effect due to nonlinear equation of state
         """
-        aloc = update(aloc, at[:, :, :-1], vs.kappaH[:, :, :-1] * vs.Nsqr[:, :, :-1, vs.taup1])
+        aloc = update(aloc, at[:, :, :-1], vs.kappaH[:, :, :-1] * vs.Nsqr[:, :, :-1, vs.taup1], inplace=True)
         vs.P_diss_nonlin = update(vs.P_diss_nonlin, at[:, :, :-1], vs.P_diss_v[:, :, :-1] - aloc[:, :, :-1])
         vs.P_diss_v = update(vs.P_diss_v, at[:, :, :-1], aloc[:, :, :-1])
     else:
@@ -72,7 +72,10 @@ def set_tke_diffusivities_kernel(state):
     vs.K_diss_v = utilities.enforce_boundaries(vs.K_diss_v, settings.enable_cyclic_x)
     vs.kappaM = update(vs.kappaM, at[...], npx.minimum(settings.kappaM_max, settings.c_k * vs.mxl * vs.sqrttke))
     Rinumber = update(
-        Rinumber, at[...], vs.Nsqr[:, :, :, vs.tau] / npx.maximum(vs.K_diss_v / npx.maximum(1e-12, vs.kappaM), 1e-12)
+        Rinumber,
+        at[...],
+        vs.Nsqr[:, :, :, vs.tau] / npx.maximum(vs.K_diss_v / npx.maximum(1e-12, vs.kappaM), 1e-12),
+        inplace=True,
     )
     if settings.enable_idemix:
         Rinumber = update(
@@ -82,6 +85,7 @@ def set_tke_diffusivities_kernel(state):
                 Rinumber,
                 vs.kappaM * vs.Nsqr[:, :, :, vs.tau] / npx.maximum(1e-12, vs.alpha_c * vs.E_iw[:, :, :, vs.tau] ** 2),
             ),
+            inplace=True,
         )
 
     if settings.enable_Prandtl_tke:
@@ -197,7 +201,7 @@ def integrate_tke_kernel(state):
     )
 
     a_tri = update(a_tri, at[:, :, 1:-1], -delta[:, :, :-2] / vs.dzw[npx.newaxis, npx.newaxis, 1:-1])
-    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1]))
+    a_tri = update(a_tri, at[:, :, -1], -delta[:, :, -2] / (0.5 * vs.dzw[-1]), inplace=True)
 
     b_tri = update(
         b_tri,
@@ -212,6 +216,7 @@ def integrate_tke_kernel(state):
         1
         + delta[:, :, -2] / (0.5 * vs.dzw[-1])
         + dt_tke * settings.c_eps / vs.mxl[2:-2, 2:-2, -1] * vs.sqrttke[2:-2, 2:-2, -1],
+        inplace=True,
     )
     b_tri_edge = (
         1
@@ -222,7 +227,7 @@ def integrate_tke_kernel(state):
     c_tri = update(c_tri, at[:, :, :-1], -delta[:, :, :-1] / vs.dzw[npx.newaxis, npx.newaxis, :-1])
 
     d_tri = update(d_tri, at[...], vs.tke[2:-2, 2:-2, :, vs.tau] + dt_tke * forc[2:-2, 2:-2, :])
-    d_tri = update_add(d_tri, at[:, :, -1], dt_tke * vs.forc_tke_surface[2:-2, 2:-2] / (0.5 * vs.dzw[-1]))
+    d_tri = update_add(d_tri, at[:, :, -1], dt_tke * vs.forc_tke_surface[2:-2, 2:-2] / (0.5 * vs.dzw[-1]), inplace=True)
 
     sol = utilities.solve_implicit(a_tri, b_tri, c_tri, d_tri, water_mask, b_edge=b_tri_edge, edge_mask=edge_mask)
     vs.tke = update(vs.tke, at[2:-2, 2:-2, :, vs.taup1], npx.where(water_mask, sol, vs.tke[2:-2, 2:-2, :, vs.taup1]))
@@ -254,6 +259,7 @@ def integrate_tke_kernel(state):
             * (vs.tke[1:, :, :, vs.tau] - vs.tke[:-1, :, :, vs.tau])
             / (vs.cost[npx.newaxis, :, npx.newaxis] * vs.dxu[:-1, npx.newaxis, npx.newaxis])
             * vs.maskU[:-1, :, :],
+            inplace=True,
         )
 
         flux_north = update(
@@ -264,8 +270,9 @@ def integrate_tke_kernel(state):
             / vs.dyu[npx.newaxis, :-1, npx.newaxis]
             * vs.maskV[:, :-1, :]
             * vs.cosu[npx.newaxis, :-1, npx.newaxis],
+            inplace=True,
         )
-        flux_north = update(flux_north, at[:, -1, :], 0.0)
+        flux_north = update(flux_north, at[:, -1, :], 0.0, inplace=True)
 
         vs.tke = update_add(
             vs.tke,
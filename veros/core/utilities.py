@@ -12,7 +12,7 @@ def enforce_boundaries(arr, enable_cyclic_x, local=False):
     if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe or local:
         if enable_cyclic_x:
             arr = update(arr, at[-2:, ...], arr[2:4, ...])
-            arr = update(arr, at[:2, ...], arr[-4:-2, ...])
+            arr = update(arr, at[:2, ...], arr[-4:-2, ...], inplace=True)
         return arr
 
     from veros.distributed import exchange_overlap
@@ -21,6 +21,23 @@ def enforce_boundaries(arr, enable_cyclic_x, local=False):
     return arr
 
 
+@veros_kernel(static_args=("enable_cyclic_x", "local"))
+def enforce_boundaries_batched(arrs, enable_cyclic_x, local=False):
+    """
+    Enforces boundaries of several arrays with the same grid in one round of messages
+    """
+    from veros import runtime_state as rst
+    from veros.routines import CURRENT_CONTEXT
+
+    if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe or local:
+        return tuple(enforce_boundaries(arr, enable_cyclic_x, local=True) for arr in arrs)
+
+    from veros.distributed import exchange_overlaps
+
+    arrs = exchange_overlaps(arrs, [["xt", "yt"]] * len(arrs), cyclic=enable_cyclic_x)
+    return tuple(arrs)
+
+
 @veros_kernel
 def pad_z_edges(array):
     """
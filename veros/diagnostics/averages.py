@@ -1,8 +1,11 @@
-import os
 import copy
 
+from veros import veros_kernel
+from veros.core.operators import numpy as npx
 from veros.diagnostics.base import VerosDiagnostic
-from veros.variables import TIMESTEPS, Variable
+from veros.variables import TIMESTEPS, Variable, get_fill_value
+
+STATISTICS = ("variance", "std", "min", "max")
 
 
 class Averages(VerosDiagnostic):
@@ -10,11 +13,33 @@ class Averages(VerosDiagnostic):
 
     All registered variables are summed up when :meth:`diagnose` is called,
     and averaged and output upon calling :meth:`output`.
+
+    Additional statistics of each variable over the averaging period are accumulated
+    in a single pass, without storing any samples:
+
+    - ``output_statistics``: variance (Welford's algorithm), standard deviation, minimum
+      and maximum. Written as ``<var>_variance``, ``<var>_std``, ``<var>_min``, ``<var>_max``.
+    - ``output_histograms``: relative frequency of samples in fixed bins, per grid cell.
+      Written as ``<var>_histogram`` with extra dimension ``<var>_bin``.
+    - ``output_percentiles``: percentiles estimated from the histogram by linear
+      interpolation within bins. Written as ``<var>_percentiles`` with extra dimension
+      ``<var>_percentile``.
+
+    Example:
+        >>> averages = state.diagnostics["averages"]
+        >>> averages.output_variables = ["temp", "surface_taux"]
+        >>> averages.output_statistics = {"temp": ["std", "max"]}
+        >>> averages.output_histograms = {"surface_taux": np.linspace(-0.2, 0.2, 41)}
+        >>> averages.output_percentiles = {"surface_taux": [5, 50, 95]}
+
     """
 
     name = "averages"  #:
     output_path = "{identifier}.averages.nc"  #: File to write to. May contain format strings that are replaced with Veros attributes.
     output_variables = None  #: Iterable containing all variables to be averaged. Changes have no effect after ``initialize`` has been called.
+    output_statistics = None  #: Dict mapping averaged variables to additional statistics (any of ``"variance"``, ``"std"``, ``"min"``, ``"max"``).
+    output_histograms = None  #: Dict mapping averaged variables to histogram bin edges. Samples outside of the bins are counted in the outermost bins.
+    output_percentiles = None  #: Dict mapping averaged variables to percentiles (between 0 and 100). Requires a histogram of the variable.
     output_frequency = None  #: Frequency (in seconds) in which output is written.
     sampling_frequency = None  #: Frequency (in seconds) in which variables are accumulated.
 
@@ -23,9 +48,16 @@ class Averages(VerosDiagnostic):
             "average_nitts": Variable("average_nitts", None, write_to_restart=True),
         }
         self.output_variables = []
+        self.output_statistics = {}
+        self.output_histograms = {}
+        self.output_percentiles = {}
 
     def initialize(self, state):
         """Register all variables to be averaged"""
+        self.extra_dimensions = {}
+        self._output_keys = []
+        self._bin_edges = {}
+        self._percentiles = {}
 
         for var in self.output_variables:
             var_meta = copy.copy(state.var_meta[var])
@@ -36,10 +68,87 @@ class Averages(VerosDiagnostic):
                 var_meta.dims = var_meta.dims[:-1]
 
             self.var_meta[var] = var_meta
+            self._output_keys.append(var)
+            self._register_statistics(var, var_meta)
 
         self.initialize_variables(state)
+
+        for var, bin_edges in self._bin_edges.items():
+            self._bin_edges[var] = npx.asarray(bin_edges, dtype=getattr(self.variables, var).dtype)
+
+        self.reset_statistics()
         self.initialize_output(state)
 
+    def _register_statistics(self, var, var_meta):
+        statistics = tuple(self.output_statistics.get(var, ()))
+
+        unknown_statistics = set(statistics) - set(STATISTICS)
+        if unknown_statistics:
+            raise ValueError(f"Unknown statistics for variable {var}: {unknown_statistics} (allowed: {STATISTICS})")
+
+        if var in self.output_percentiles and var not in self.output_histograms:
+            raise ValueError(f"Percentiles of variable {var} require a histogram (see output_histograms)")
+
+        var_dims = var_meta.dims or ()
+
+        def add_variable(key, description, dims=var_dims, units=var_meta.units, accumulator=False, output=True):
+            meta = copy.copy(var_meta)
+            meta.name = f"{var_meta.name} ({description})"
+            meta.dims = dims
+            meta.units = units
+            meta.write_to_restart = accumulator
+            meta.extra_attributes = dict(var_meta.extra_attributes)
+            self.var_meta[key] = meta
+
+            if output:
+                self._output_keys.append(key)
+
+            return meta
+
+        if "variance" in statistics or "std" in statistics:
+            add_variable(
+                f"{var}_m2", "sum of squared deviations", units=f"({var_meta.units})^2", accumulator=True, output=False
+            )
+
+        if "variance" in statistics:
+            add_variable(f"{var}_variance", "variance", units=f"({var_meta.units})^2")
+
+        if "std" in statistics:
+            add_variable(f"{var}_std", "standard deviation")
+
+        if "min" in statistics:
+            add_variable(f"{var}_min", "minimum", accumulator=True)
+
+        if "max" in statistics:
+            add_variable(f"{var}_max", "maximum", accumulator=True)
+
+        if var in self.output_histograms:
+            bin_edges = [float(edge) for edge in self.output_histograms[var]]
+
+            if len(bin_edges) < 2 or any(lower >= upper for lower, upper in zip(bin_edges[:-1], bin_edges[1:])):
+                raise ValueError(f"Histogram bin edges of variable {var} must be increasing")
+
+            self._bin_edges[var] = bin_edges
+            self.extra_dimensions[f"{var}_bin"] = len(bin_edges) - 1
+            meta = add_variable(
+                f"{var}_histogram", "relative frequency", dims=var_dims + (f"{var}_bin",), units="1", accumulator=True
+            )
+            meta.extra_attributes.update(bin_edges=bin_edges)
+
+        if var in self.output_percentiles:
+            percentiles = [float(p) for p in self.output_percentiles[var]]
+
+            if any(not 0 <= p <= 100 for p in percentiles):
+                raise ValueError(f"Percentiles of variable {var} must be between 0 and 100")
+
+            self._percentiles[var] = tuple(percentiles)
+            self.extra_dimensions[f"{var}_percentile"] = len(percentiles)
+            meta = add_variable(f"{var}_percentiles", "percentiles", dims=var_dims + (f"{var}_percentile",))
+            meta.extra_attributes.update(percentiles=percentiles)
+
+    def get_output_keys(self):
+        return self._output_keys
+
     @staticmethod
     def _has_timestep_dim(state, var):
         if state.var_meta[var].dims is None:
@@ -47,6 +156,19 @@ class Averages(VerosDiagnostic):
 
         return state.var_meta[var].dims[-1] == TIMESTEPS[0]
 
+    def _get_accumulators(self, var):
+        """Names of all variables that accumulate samples of the given variable."""
+        accumulators = {"sum": var}
+
+        for statistic, key in (("m2", f"{var}_m2"), ("min", f"{var}_min"), ("max", f"{var}_max")):
+            if key in self.var_meta:
+                accumulators[statistic] = key
+
+        if var in self.output_histograms:
+            accumulators["histogram"] = f"{var}_histogram"
+
+        return accumulators
+
     def diagnose(self, state):
         vs = state.variables
         avg_vs = self.variables
@@ -54,28 +176,128 @@ class Averages(VerosDiagnostic):
         avg_vs.average_nitts = avg_vs.average_nitts + 1
 
         for key in self.output_variables:
-            var_data = getattr(avg_vs, key)
+            sample = getattr(vs, key)
             if self._has_timestep_dim(state, key):
-                setattr(avg_vs, key, var_data + getattr(vs, key)[..., vs.tau])
-            else:
-                setattr(avg_vs, key, var_data + getattr(vs, key))
+                sample = sample[..., vs.tau]
+
+            accumulator_keys = self._get_accumulators(key)
+            accumulators = {statistic: getattr(avg_vs, name) for statistic, name in accumulator_keys.items()}
+            accumulators = accumulate_statistics(sample, avg_vs.average_nitts, accumulators, self._bin_edges.get(key))
+
+            for statistic, name in accumulator_keys.items():
+                setattr(avg_vs, name, accumulators[statistic])
+
+    def reset_statistics(self):
+        """Prepare accumulators for a new averaging period."""
+        avg_vs = self.variables
+
+        for key in self.output_variables:
+            for statistic, name in self._get_accumulators(key).items():
+                val = getattr(avg_vs, name)
+
+                if statistic == "min":
+                    setattr(avg_vs, name, npx.full_like(val, npx.inf))
+                elif statistic == "max":
+                    setattr(avg_vs, name, npx.full_like(val, -npx.inf))
+                else:
+                    setattr(avg_vs, name, 0 * val)
+
+        avg_vs.average_nitts = 0
 
     def output(self, state):
         """Write averages to netcdf file and zero array"""
         avg_vs = self.variables
 
-        if not os.path.isfile(self.get_output_file_name(state)):
+        if not self.output_file_exists(state):
             self.initialize_output(state)
 
         if avg_vs.average_nitts > 0:
             for key in self.output_variables:
-                val = getattr(avg_vs, key)
-                setattr(avg_vs, key, val / avg_vs.average_nitts)
+                accumulators = {
+                    statistic: getattr(avg_vs, name) for statistic, name in self._get_accumulators(key).items()
+                }
+                results = finalize_statistics(
+                    avg_vs.average_nitts, accumulators, self._bin_edges.get(key), self._percentiles.get(key)
+                )
+
+                for statistic, val in results.items():
+                    name = key if statistic == "mean" else f"{key}_{statistic}"
+                    if name in self.var_meta:
+                        setattr(avg_vs, name, val)
+        else:
+            # no samples in this period, write missing values instead of the initial extrema
+            for key in self.output_variables:
+                for statistic, name in self._get_accumulators(key).items():
+                    if statistic in ("min", "max"):
+                        val = getattr(avg_vs, name)
+                        setattr(avg_vs, name, npx.full_like(val, get_fill_value(val.dtype)))
 
         self.write_output(state)
+        self.reset_statistics()
 
-        for key in self.output_variables:
-            val = getattr(avg_vs, key)
-            setattr(avg_vs, key, 0 * val)
 
-        avg_vs.average_nitts = 0
+@veros_kernel
+def accumulate_statistics(sample, nitts, accumulators, bin_edges):
+    """Add a sample to running statistics. ``nitts`` is the number of samples including
+    the new one."""
+    out = dict(accumulators)
+    out["sum"] = accumulators["sum"] + sample
+
+    if "m2" in accumulators:
+        # Welford's algorithm, with running means derived from the sums
+        mean_before = accumulators["sum"] / npx.maximum(nitts - 1, 1)
+        mean_after = out["sum"] / nitts
+        out["m2"] = accumulators["m2"] + (sample - mean_before) * (sample - mean_after)
+
+    if "min" in accumulators:
+        out["min"] = npx.minimum(accumulators["min"], sample)
+
+    if "max" in accumulators:
+        out["max"] = npx.maximum(accumulators["max"], sample)
+
+    if "histogram" in accumulators:
+        nbins = bin_edges.shape[0] - 1
+        bin_idx = npx.clip(npx.searchsorted(bin_edges, sample, side="right") - 1, 0, nbins - 1)
+        out["histogram"] = accumulators["histogram"] + (bin_idx[..., npx.newaxis] == npx.arange(nbins))
+
+    return out
+
+
+@veros_kernel(static_args=("percentiles",))
+def finalize_statistics(nitts, accumulators, bin_edges, percentiles):
+    """Compute statistics over the averaging period from accumulated samples."""
+    out = {}
+    out["mean"] = accumulators["sum"] / nitts
+
+    if "m2" in accumulators:
+        out["variance"] = accumulators["m2"] / nitts
+        out["std"] = npx.sqrt(out["variance"])
+
+    for statistic in ("min", "max"):
+        if statistic in accumulators:
+            out[statistic] = accumulators[statistic]
+
+    if "histogram" in accumulators:
+        frequency = accumulators["histogram"] / nitts
+        out["histogram"] = frequency
+
+        if percentiles is not None:
+            out["percentiles"] = _histogram_percentiles(frequency, bin_edges, npx.asarray(percentiles) / 100)
+
+    return out
+
+
+def _histogram_percentiles(frequency, bin_edges, quantiles):
+    """Estimate quantiles from relative frequencies, assuming uniform distribution within bins."""
+    cdf = npx.cumsum(frequency, axis=-1)
+
+    # first bin in which the cumulative frequency reaches the quantile
+    bin_idx = npx.sum(cdf[..., npx.newaxis, :] < quantiles[:, npx.newaxis], axis=-1)
+    bin_idx = npx.minimum(bin_idx, frequency.shape[-1] - 1)
+
+    cdf_below = npx.where(bin_idx > 0, npx.take_along_axis(cdf, npx.maximum(bin_idx - 1, 0), axis=-1), 0)
+    bin_frequency = npx.take_along_axis(frequency, bin_idx, axis=-1)
+    fraction = npx.where(bin_frequency > 0, (quantiles - cdf_below) / npx.where(bin_frequency > 0, bin_frequency, 1), 0)
+    fraction = npx.clip(fraction, 0, 1)
+
+    return bin_edges[bin_idx] + fraction * (bin_edges[bin_idx + 1] - bin_edges[bin_idx])
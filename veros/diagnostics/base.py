@@ -1,10 +1,15 @@
 import abc
 
 import os
+import copy
 
-from veros.io_tools import netcdf as nctools
+import numpy as onp
+
+from veros.diagnostics import transforms
+from veros.io_tools import netcdf as nctools, zarr_ as zarrtools, writer
 from veros.signals import do_not_disturb
 from veros.state import VerosVariables
+from veros.variables import TIMESTEPS
 from veros import distributed, runtime_settings, time
 
 
@@ -21,9 +26,22 @@ class VerosDiagnostic(metaclass=abc.ABCMeta):
     output_path = None
     output_variables = None
 
+    #: Dict mapping output variables to compression codecs (e.g. ``"shuffle+zstd:3"``),
+    #: defaults to the ``hdf5_compression`` runtime setting
+    output_compression = None
+    #: Dict mapping floating point output variables to the number of mantissa bits to keep
+    #: in the output (lossy compression)
+    output_significant_bits = None
+    #: Dict mapping output variables to :class:`~veros.diagnostics.transforms.OutputTransform`
+    #: objects that reduce them (to a region, subsampled or coarsened grid) before writing
+    output_transforms = None
+
     var_meta = None  #: Metadata of internal variables
     extra_dimensions = None  #: Dict of extra dimensions used in var_meta
 
+    _transformed_variables = None
+    _transformed_chunk_sizes = None
+
     def __init__(self, state):
         pass
 
@@ -57,6 +75,10 @@ class VerosDiagnostic(metaclass=abc.ABCMeta):
         # we leave diagnostic variables unlocked
         self.variables.__locked__ = False
 
+    def get_output_keys(self):
+        """Names of all variables that are written to the output file."""
+        return self.output_variables
+
     def get_output_file_name(self, state):
         statedict = dict(state.variables.items())
         statedict.update(state.settings.items())
@@ -71,7 +93,12 @@ class VerosDiagnostic(metaclass=abc.ABCMeta):
             return
 
         output_path = self.get_output_file_name(state)
-        if os.path.isfile(output_path) and not runtime_settings.force_overwrite:
+
+        # make sure there are no pending writes to this file
+        writer.flush()
+        nctools.close_output_file(output_path)
+
+        if os.path.exists(output_path) and not runtime_settings.force_overwrite:
             raise IOError(
                 f'output file {output_path} for diagnostic "{self.name}" exists '
                 "(change output path or enable force_overwrite runtime setting)"
@@ -80,17 +107,201 @@ class VerosDiagnostic(metaclass=abc.ABCMeta):
         # possible race condition ahead!
         distributed.barrier()
 
+        compression = self.output_compression or {}
+        significant_bits = self.output_significant_bits or {}
+
+        extra_dimensions, coordinates = self._initialize_transforms(state)
+
+        if zarrtools.is_zarr_path(output_path):
+            outfile = zarrtools.open_group(output_path, "w")
+            zarrtools.initialize_file(state, outfile, extra_dimensions=extra_dimensions, coordinates=coordinates)
+
+            for key in self.get_output_keys():
+                if key not in outfile:
+                    var = self._get_output_meta(key)
+                    zarrtools.initialize_variable(
+                        state, key, var, outfile, compression.get(key), chunk_sizes=self._transformed_chunk_sizes
+                    )
+
+            # arrays are created by the first process
+            distributed.barrier()
+
+            for key in self.get_output_keys():
+                if not self.var_meta[key].time_dependent:
+                    var, var_data, global_slice = self._prepare_output(state, key)
+                    zarrtools.write_variable(
+                        state,
+                        key,
+                        var,
+                        var_data,
+                        outfile,
+                        significant_bits=significant_bits.get(key),
+                        global_slice=global_slice,
+                    )
+
+            return
+
         with nctools.threaded_io(output_path, "w") as outfile:
-            nctools.initialize_file(state, outfile, extra_dimensions=self.extra_dimensions)
+            nctools.initialize_file(state, outfile, extra_dimensions=extra_dimensions, coordinates=coordinates)
 
-            for key in self.output_variables:
-                var = self.var_meta[key]
+            for key in self.get_output_keys():
                 if key not in outfile.variables:
-                    nctools.initialize_variable(state, key, var, outfile)
+                    var = self._get_output_meta(key)
+                    nctools.initialize_variable(
+                        state,
+                        key,
+                        var,
+                        outfile,
+                        compression=compression.get(key),
+                        chunk_sizes=self._transformed_chunk_sizes,
+                    )
+
+                if not self.var_meta[key].time_dependent:
+                    var, var_data, global_slice = self._prepare_output(state, key)
+                    nctools.write_variable(
+                        state,
+                        key,
+                        var,
+                        var_data,
+                        outfile,
+                        significant_bits=significant_bits.get(key),
+                        global_slice=global_slice,
+                    )
+
+    def _initialize_transforms(self, state):
+        """Set up output transforms. Returns all dimensions of the output file besides the
+        model grid, and data of the dimensions created by transforms."""
+        output_transforms = self.output_transforms or {}
+
+        extra_dimensions = dict(self.extra_dimensions or {})
+        coordinates = {}
+
+        self._transformed_variables = {}
+        self._transformed_chunk_sizes = {}
+
+        # transformed axes are shared between variables on the same grid
+        axis_cache = {}
+
+        for key in self.get_output_keys():
+            if key not in output_transforms:
+                continue
+
+            transformed = transforms.TransformedVariable(state, output_transforms[key], self.var_meta[key], axis_cache)
+            extra_dimensions.update(transformed.dimensions)
+            coordinates.update(transformed.coordinates)
+            self._transformed_chunk_sizes.update(transformed.chunk_sizes)
+            self._transformed_variables[key] = transformed
+
+        return extra_dimensions, coordinates
+
+    def _get_output_meta(self, key):
+        var = self.var_meta[key]
+
+        if self._transformed_variables and key in self._transformed_variables:
+            var = copy.copy(var)
+            var.dims = self._transformed_variables[key].dims
+
+        return var
+
+    def _prepare_output(self, state, key):
+        """Get metadata and data of an output variable as they are written to disk, and the
+        global slice of the data if it is transformed (None otherwise).
 
-                if not var.time_dependent:
-                    var_data = self.variables.get(key)
-                    nctools.write_variable(state, key, var, var_data, outfile)
+        Only the current time level is used, and output transforms are applied. Grid
+        masks are evaluated right away, so writing does not access the model state.
+        """
+        vs = state.variables
+        var = copy.copy(self.var_meta[key])
+        var_data = self.variables.get(key)
+
+        gridmask = var.get_mask(state.settings, vs)
+
+        if var.dims is not None and any(dim in TIMESTEPS for dim in var.dims):
+            var_data = var_data[tuple(vs.tau if dim in TIMESTEPS else slice(None) for dim in var.dims)]
+            var.dims = tuple(dim for dim in var.dims if dim not in TIMESTEPS)
+
+        global_slice = None
+
+        if self._transformed_variables and key in self._transformed_variables:
+            transformed = self._transformed_variables[key]
+            var_data, gridmask, global_slice = transformed.apply(var_data, gridmask)
+            var.dims = transformed.dims
+
+        var.get_mask = lambda settings, vs, gridmask=gridmask: gridmask
+        return var, var_data, global_slice
+
+    def _get_output_data(self, state):
+        """Take a snapshot of all output variables that is not affected by further model steps."""
+        output_data = {}
+
+        for key in self.get_output_keys():
+            var, var_data, global_slice = self._prepare_output(state, key)
+
+            if runtime_settings.backend == "numpy":
+                # JAX arrays are immutable, NumPy arrays need to be copied
+                var_data = onp.array(var_data)
+
+            output_data[key] = (var, var_data, global_slice)
+
+        return output_data
+
+    def output_file_exists(self, state):
+        output_path = self.get_output_file_name(state)
+        return nctools.is_output_file_open(output_path) or os.path.exists(output_path)
+
+    def _write_output_data(self, state, output_path, current_days, output_data):
+        significant_bits = self.output_significant_bits or {}
+
+        if zarrtools.is_zarr_path(output_path):
+            outfile = zarrtools.open_group(output_path, "r+")
+            time_step = zarrtools.advance_time(current_days, outfile)
+
+            for key, (var, var_data, global_slice) in output_data.items():
+                zarrtools.write_variable(
+                    state,
+                    key,
+                    var,
+                    var_data,
+                    outfile,
+                    time_step=time_step,
+                    significant_bits=significant_bits.get(key),
+                    global_slice=global_slice,
+                )
+
+            return
+
+        if runtime_settings.output_flush_interval > 0:
+            outfile = nctools.get_output_file(output_path)
+            time_step = outfile.advance_time(current_days)
+
+            for key, (var, var_data, global_slice) in output_data.items():
+                nctools.write_variable(
+                    state,
+                    key,
+                    var,
+                    var_data,
+                    outfile.ncfile,
+                    time_step=time_step,
+                    significant_bits=significant_bits.get(key),
+                    global_slice=global_slice,
+                )
+
+            outfile.finish_write()
+            return
+
+        with nctools.threaded_io(output_path, "r+") as outfile:
+            nctools.advance_time(current_days, outfile)
+
+            for key, (var, var_data, global_slice) in output_data.items():
+                nctools.write_variable(
+                    state,
+                    key,
+                    var,
+                    var_data,
+                    outfile,
+                    significant_bits=significant_bits.get(key),
+                    global_slice=global_slice,
+                )
 
     @do_not_disturb
     def write_output(self, state):
@@ -99,11 +310,8 @@ class VerosDiagnostic(metaclass=abc.ABCMeta):
         if runtime_settings.diskless_mode:
             return
 
-        with nctools.threaded_io(self.get_output_file_name(state), "r+") as outfile:
-            current_days = time.convert_time(vs.time, "seconds", "days")
-            nctools.advance_time(current_days, outfile)
+        current_days = time.convert_time(vs.time, "seconds", "days")
+        output_data = self._get_output_data(state)
 
-            for key in self.output_variables:
-                var = self.var_meta[key]
-                var_data = self.variables.get(key)
-                nctools.write_variable(state, key, var, var_data, outfile)
+        # with async_output enabled, this returns immediately and the model keeps stepping
+        writer.submit(self._write_output_data, state, self.get_output_file_name(state), current_days, output_data)
@@ -1,5 +1,3 @@
-import os
-
 from veros import veros_kernel, KernelOutput, runtime_settings
 from veros.core.operators import numpy as npx, update_multiply, at
 from veros.diagnostics.base import VerosDiagnostic
@@ -136,7 +134,7 @@ class Energy(VerosDiagnostic):
         self.variables.nitts = self.variables.nitts + 1
 
     def output(self, state):
-        if not os.path.isfile(self.get_output_file_name(state)):
+        if not self.output_file_exists(state):
             self.initialize_output(state)
 
         energy_vs = self.variables
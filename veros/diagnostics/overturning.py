@@ -1,12 +1,10 @@
-import os
-
 from veros import logger, veros_kernel, KernelOutput
 
 from veros.diagnostics.base import VerosDiagnostic
 from veros.core import density
 from veros.variables import Variable, allocate
 from veros.distributed import global_sum
-from veros.core.operators import numpy as npx, update, update_add, at, for_loop
+from veros.core.operators import numpy as npx, update, update_add, at
 
 
 VARIABLES = {
@@ -116,7 +114,7 @@ class Overturning(VerosDiagnostic):
         ovt_vs.nitts = ovt_vs.nitts + 1
 
     def output(self, state):
-        if not os.path.isfile(self.get_output_file_name(state)):
+        if not self.output_file_exists(state):
             self.initialize_output(state)
 
         ovt_vs = self.variables
@@ -153,12 +151,36 @@ def _interpolate_depth_coords(coords, arr, interp_coords):
     return interp_vectorized(interp_coords, coords, arr)
 
 
+@veros_kernel
+def _sum_above_isopycnals(sig, weights, sigma):
+    """Sum weights of all cells denser than each sigma level, separately for every row.
+
+    Cells are sorted by density once, so the sums for all sigma levels follow from a
+    cumulative sum. ``sig`` has shape (rows, cells), ``weights`` (n, rows, cells).
+    """
+    order = npx.argsort(sig, axis=-1)
+    sig_sorted = npx.take_along_axis(sig, order, axis=-1)
+    weights_sorted = npx.take_along_axis(weights, order[npx.newaxis], axis=-1)
+
+    cumulative_weights = npx.concatenate(
+        (npx.zeros(weights.shape[:-1] + (1,), dtype=weights.dtype), npx.cumsum(weights_sorted, axis=-1)), axis=-1
+    )
+
+    # index of the first cell that is denser than each sigma level
+    searchsorted_vectorized = npx.vectorize(lambda a, v: npx.searchsorted(a, v, side="right"), signature="(n),(m)->(m)")
+    first_denser = searchsorted_vectorized(sig_sorted, npx.broadcast_to(sigma, (sig.shape[0], sigma.shape[0])))
+    first_denser = npx.broadcast_to(first_denser[npx.newaxis], weights.shape[:1] + first_denser.shape)
+
+    return cumulative_weights[..., -1:] - npx.take_along_axis(cumulative_weights, first_denser, axis=-1)
+
+
 @veros_kernel
 def diagnose_kernel(state, ovt_vs, p_ref):
     vs = state.variables
     settings = state.settings
 
-    nlevel = settings.nz * 4
+    enable_bolus = settings.enable_neutral_diffusion and settings.enable_skew_diffusion
+    nz = settings.nz
 
     # sigma at p_ref
     sig_loc = allocate(state.dimensions, ("xt", "yt", "zt"))
@@ -168,107 +190,61 @@ def diagnose_kernel(state, ovt_vs, p_ref):
         density.get_rho(state, vs.salt[2:-2, 2:-1, :, vs.tau], vs.temp[2:-2, 2:-1, :, vs.tau], p_ref),
     )
 
-    # transports below isopycnals and area below isopycnals
     sig_loc_face = 0.5 * (sig_loc[2:-2, 2:-2, :] + sig_loc[2:-2, 3:-1, :])
 
-    trans = allocate(state.dimensions, ("yu", nlevel))
-    z_sig = allocate(state.dimensions, ("yu", nlevel))
+    zonal_fac = vs.dxt[2:-2, npx.newaxis, npx.newaxis] * vs.cosu[npx.newaxis, 2:-2, npx.newaxis]
+    fac = zonal_fac * vs.dzt[npx.newaxis, npx.newaxis, :] * vs.maskV[2:-2, 2:-2, :]
 
-    fac = (
-        vs.dxt[2:-2, npx.newaxis, npx.newaxis]
-        * vs.cosu[npx.newaxis, 2:-2, npx.newaxis]
-        * vs.dzt[npx.newaxis, npx.newaxis, :]
-        * vs.maskV[2:-2, 2:-2, :]
-    )
+    # transports and area below isopycnals
+    iso_weights = [vs.v[2:-2, 2:-2, :, vs.tau] * fac, fac]
 
-    def loop_body(m, values):
-        trans, z_sig = values
-        mask = sig_loc_face > ovt_vs.sigma[m]
-        trans = update(trans, at[2:-2, m], npx.sum(vs.v[2:-2, 2:-2, :, vs.tau] * fac * mask, axis=(0, 2)))
-        z_sig = update(z_sig, at[2:-2, m], npx.sum(fac * mask, axis=(0, 2)))
-        return (trans, z_sig)
+    if enable_bolus:
+        # eddy-driven transports below isopycnals
+        bolus_flux = npx.concatenate((vs.B1_gm[2:-2, 2:-2, :1], npx.diff(vs.B1_gm[2:-2, 2:-2, :], axis=2)), axis=2)
+        iso_weights.append(bolus_flux * zonal_fac * vs.maskV[2:-2, 2:-2, :])
 
-    trans, z_sig = for_loop(0, nlevel, loop_body, init_val=(trans, z_sig))
-    trans = zonal_sum(trans)
-    z_sig = zonal_sum(z_sig)
+    # one row of cells at constant y for every latitude
+    def to_rows(arr):
+        return npx.moveaxis(arr, -2, -3).reshape(arr.shape[:-3] + (arr.shape[-2], -1))
 
-    ovt_vs.trans = ovt_vs.trans + trans
+    iso_sums = _sum_above_isopycnals(to_rows(sig_loc_face), to_rows(npx.stack(iso_weights)), ovt_vs.sigma)
+
+    # streamfunctions on geopotentials
+    depth_sums = [npx.sum(zonal_fac * vs.v[2:-2, 2:-2, :, vs.tau] * vs.maskV[2:-2, 2:-2, :], axis=0)]
+
+    if enable_bolus:
+        # streamfunction for eddy driven velocity on geopotentials
+        depth_sums.append(npx.sum(zonal_fac * vs.B1_gm[2:-2, 2:-2, :], axis=0))
+
+    # a single global reduction for all zonal sums
+    nlevel = ovt_vs.sigma.shape[0]
+    zonal_sums = zonal_sum(
+        npx.concatenate([npx.moveaxis(iso_sums, 0, 1).reshape(iso_sums.shape[1], -1)] + depth_sums, axis=1)
+    )
+    iso_sums = npx.moveaxis(zonal_sums[:, : len(iso_weights) * nlevel].reshape(-1, len(iso_weights), nlevel), 1, 0)
+    depth_sums = zonal_sums[:, len(iso_weights) * nlevel :].reshape(-1, len(depth_sums), nz)
+
+    trans, z_sig = iso_sums[0], iso_sums[1]
+
+    ovt_vs.trans = update_add(ovt_vs.trans, at[2:-2, :], trans)
 
-    if settings.enable_neutral_diffusion and settings.enable_skew_diffusion:
-        # eddy-driven transports below isopycnals
-        bolus_trans = allocate(state.dimensions, ("yu", nlevel))
-
-        def loop_body(m, bolus_trans):
-            mask = sig_loc_face > ovt_vs.sigma[m]
-            bolus_trans = update(
-                bolus_trans,
-                at[2:-2, m],
-                npx.sum(
-                    npx.sum(
-                        (vs.B1_gm[2:-2, 2:-2, 1:] - vs.B1_gm[2:-2, 2:-2, :-1])
-                        * vs.dxt[2:-2, npx.newaxis, npx.newaxis]
-                        * vs.cosu[npx.newaxis, 2:-2, npx.newaxis]
-                        * vs.maskV[2:-2, 2:-2, 1:]
-                        * mask[:, :, 1:],
-                        axis=2,
-                    )
-                    + vs.B1_gm[2:-2, 2:-2, 0]
-                    * vs.dxt[2:-2, npx.newaxis]
-                    * vs.cosu[npx.newaxis, 2:-2]
-                    * vs.maskV[2:-2, 2:-2, 0]
-                    * mask[:, :, 0],
-                    axis=0,
-                ),
-            )
-            return bolus_trans
-
-        bolus_trans = for_loop(0, nlevel, loop_body, init_val=bolus_trans)
-        bolus_trans = zonal_sum(bolus_trans)
-
-    # streamfunction on geopotentials
     ovt_vs.vsf_depth = update_add(
-        ovt_vs.vsf_depth,
-        at[2:-2, :],
-        npx.cumsum(
-            zonal_sum(
-                npx.sum(
-                    vs.dxt[2:-2, npx.newaxis, npx.newaxis]
-                    * vs.cosu[npx.newaxis, 2:-2, npx.newaxis]
-                    * vs.v[2:-2, 2:-2, :, vs.tau]
-                    * vs.maskV[2:-2, 2:-2, :],
-                    axis=0,
-                )
-            )
-            * vs.dzt[npx.newaxis, :],
-            axis=1,
-        ),
+        ovt_vs.vsf_depth, at[2:-2, :], npx.cumsum(depth_sums[:, 0] * vs.dzt[npx.newaxis, :], axis=1)
     )
 
-    if settings.enable_neutral_diffusion and settings.enable_skew_diffusion:
-        # streamfunction for eddy driven velocity on geopotentials
-        ovt_vs.bolus_depth = update_add(
-            ovt_vs.bolus_depth,
-            at[2:-2, :],
-            zonal_sum(
-                npx.sum(
-                    vs.dxt[2:-2, npx.newaxis, npx.newaxis]
-                    * vs.cosu[npx.newaxis, 2:-2, npx.newaxis]
-                    * vs.B1_gm[2:-2, 2:-2, :],
-                    axis=0,
-                )
-            ),
-        )
+    if enable_bolus:
+        ovt_vs.bolus_depth = update_add(ovt_vs.bolus_depth, at[2:-2, :], depth_sums[:, 1])
 
     # interpolate from isopycnals to depth
     ovt_vs.vsf_iso = update_add(
-        ovt_vs.vsf_iso, at[2:-2, :], _interpolate_depth_coords(z_sig[2:-2, :], trans[2:-2, :], ovt_vs.zarea[2:-2, :])
+        ovt_vs.vsf_iso, at[2:-2, :], _interpolate_depth_coords(z_sig, trans, ovt_vs.zarea[2:-2, :])
     )
 
-    if settings.enable_neutral_diffusion and settings.enable_skew_diffusion:
+    if enable_bolus:
         ovt_vs.bolus_iso = update_add(
             ovt_vs.bolus_iso,
             at[2:-2, :],
-            _interpolate_depth_coords(z_sig[2:-2, :], bolus_trans[2:-2, :], ovt_vs.zarea[2:-2, :]),
+            _interpolate_depth_coords(z_sig, iso_sums[2], ovt_vs.zarea[2:-2, :]),
         )
 
     return KernelOutput(
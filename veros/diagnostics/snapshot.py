@@ -1,4 +1,3 @@
-import os
 import copy
 
 from veros import time, logger
@@ -100,7 +99,7 @@ class Snapshot(VerosDiagnostic):
         time_length, time_unit = time.format_time(vs.time)
         logger.info(f" Writing snapshot at {time_length:.2f} {time_unit}")
 
-        if not os.path.isfile(self.get_output_file_name(state)):
+        if not self.output_file_exists(state):
             self.initialize_output(state)
 
         self.write_output(state)
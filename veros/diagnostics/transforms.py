@@ -0,0 +1,286 @@
+import math
+
+import numpy as onp
+
+from veros import distributed, runtime_state
+from veros.variables import Variable, TIMESTEPS
+
+X_DIMENSIONS, Y_DIMENSIONS = distributed.SCATTERED_DIMENSIONS
+Z_DIMENSIONS = ("zt", "zw")
+
+#: Grid spacing and metric factors that make up the cell area along each horizontal dimension
+AREA_FACTORS = {
+    "xt": ("dxt",),
+    "xu": ("dxu",),
+    "yt": ("dyt", "cost"),
+    "yu": ("dyu", "cosu"),
+}
+
+
+class OutputTransform:
+    """Reduce the size of an output variable before it is written.
+
+    Transformed variables use their own dimensions, named after the original dimension
+    and the transform (e.g. ``xt_coarse``). Every process transforms and writes its own
+    subdomain, only the coordinates of transformed dimensions are exchanged between processes.
+
+    Arguments:
+        name (str): Identifier of the transform, used in dimension names.
+        region (tuple): Bounding box ``(x_min, x_max, y_min, y_max)`` in grid coordinates.
+            Only grid points within the box are written.
+        stride (int or tuple): Only write every n-th grid point along x and y.
+        coarsen (int or tuple): Write averages over blocks of n grid points along x and y,
+            weighted by cell area. Masked cells are ignored. Under MPI, blocks must not
+            cross subdomain boundaries.
+        levels (sequence): Indices of vertical levels to write.
+
+    Example:
+        >>> from veros.diagnostics.transforms import OutputTransform
+        >>> coarse = OutputTransform("coarse", coarsen=4)
+        >>> surface = OutputTransform("surface", region=(-80, 20, -40, 70), levels=[-1])
+        >>> state.diagnostics["snapshot"].output_transforms = {"temp": coarse, "u": coarse, "salt": surface}
+
+    """
+
+    def __init__(self, name, region=None, stride=1, coarsen=1, levels=None):
+        self.name = name
+        self.region = None if region is None else tuple(float(r) for r in region)
+        self.stride = _as_pair(stride, "stride")
+        self.coarsen = _as_pair(coarsen, "coarsen")
+        self.levels = None if levels is None else tuple(int(level) for level in levels)
+
+        if self.region is not None:
+            if len(self.region) != 4 or self.region[0] > self.region[1] or self.region[2] > self.region[3]:
+                raise ValueError(f"Region of output transform {name} must be given as (x_min, x_max, y_min, y_max)")
+
+        if self.levels is not None and not self.levels:
+            raise ValueError(f"Output transform {name} selects no vertical levels")
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}({self.name!r}, region={self.region}, stride={self.stride}, "
+            f"coarsen={self.coarsen}, levels={self.levels})"
+        )
+
+    @property
+    def is_horizontal(self):
+        return self.region is not None or self.stride != (1, 1) or self.coarsen != (1, 1)
+
+    def transforms_dimension(self, dim):
+        if dim in Z_DIMENSIONS:
+            return self.levels is not None
+
+        if dim in X_DIMENSIONS or dim in Y_DIMENSIONS:
+            return self.is_horizontal
+
+        return False
+
+    def get_dimension_name(self, dim):
+        if not self.transforms_dimension(dim):
+            return dim
+
+        return f"{dim}_{self.name}"
+
+
+def _as_pair(value, name):
+    if isinstance(value, int):
+        value = (value, value)
+
+    value = tuple(int(v) for v in value)
+
+    if len(value) != 2 or min(value) < 1:
+        raise ValueError(f"{name} must be a positive integer or a pair of positive integers")
+
+    return value
+
+
+class _HorizontalAxis:
+    """Blocks of grid points along a horizontal dimension, each reduced to one output point."""
+
+    def __init__(self, state, transform, dim):
+        vs = state.variables
+        axis = 0 if dim in X_DIMENSIONS else 1
+
+        nx, ny = state.dimensions["xt"], state.dimensions["yt"]
+        nglobal = (nx, ny)[axis]
+        nlocal = distributed.get_chunk_size(nx, ny)[axis]
+        local_start = distributed.proc_rank_to_index(runtime_state.proc_rank)[axis] * nlocal
+        local_end = local_start + nlocal
+
+        coords = onp.asarray(getattr(vs, dim))
+
+        if transform.region is None:
+            first, last = 0, nglobal - 1
+        else:
+            lower, upper = transform.region[2 * axis : 2 * axis + 2]
+            interior = coords[2:-2]
+            in_region = local_start + onp.flatnonzero((interior >= lower) & (interior <= upper))
+            first = int(distributed.global_min(in_region.min() if in_region.size else nglobal))
+            last = int(distributed.global_max(in_region.max() if in_region.size else -1))
+
+            if last < first:
+                raise ValueError(f"Region of output transform {transform.name} contains no grid points along {dim}")
+
+        step = transform.stride[axis] * transform.coarsen[axis]
+        self.size = math.ceil((last + 1 - first) / step)
+
+        # blocks are handled by the process that holds their first grid point
+        block_start = block_end = 0
+        if max(local_start, first) <= min(local_end - 1, last):
+            block_start = math.ceil((max(local_start, first) - first) / step)
+            block_end = math.ceil((min(local_end, last + 1) - first) / step)
+
+        self.out_slice = slice(block_start, block_end)
+
+        # output chunks span at most two blocks
+        self.chunk_size = max(int(distributed.global_max(block_end - block_start)), 1)
+
+        points = first + step * onp.arange(block_start, block_end)[:, onp.newaxis] + onp.arange(transform.coarsen[axis])
+        self.valid = points <= last
+
+        misaligned = bool(onp.any(self.valid & (points >= local_end)))
+        if distributed.global_or(misaligned):
+            raise ValueError(
+                f"Blocks of output transform {transform.name} cross subdomain boundaries along {dim} "
+                "(use a coarsening factor that divides the subdomain size)"
+            )
+
+        # indices into local arrays with ghost cells
+        self.index = 2 + onp.where(self.valid, points - local_start, 0)
+
+        self.weights = onp.ones(nlocal + 4)
+        for factor in AREA_FACTORS[dim]:
+            self.weights = self.weights * onp.asarray(getattr(vs, factor))
+
+        block_coords = onp.where(self.valid, coords[self.index], 0).sum(axis=1) / self.valid.sum(axis=1)
+        self.coordinates = distributed.allgather_pieces(block_coords, (self.out_slice,), (self.size,))
+
+    def select(self, arr, axis):
+        """Pick the first grid point of every block."""
+        return onp.take(arr, self.index[:, 0], axis=axis)
+
+    def reduce(self, weighted_sum, weights, axis):
+        """Sum weighted values and weights over every block."""
+        expand = (onp.newaxis,) * axis + (slice(None),) + (onp.newaxis,) * (weights.ndim - axis - 1)
+        weights = weights * self.weights[expand]
+        weighted_sum = weighted_sum * self.weights[expand]
+
+        valid = self.valid.reshape((1,) * axis + self.valid.shape + (1,) * (weights.ndim - axis - 1))
+        block_sum = onp.where(valid, onp.take(weighted_sum, self.index, axis=axis), 0).sum(axis=axis + 1)
+        block_weights = onp.where(valid, onp.take(weights, self.index, axis=axis), 0).sum(axis=axis + 1)
+        return block_sum, block_weights
+
+
+class TransformedVariable:
+    """Applies an output transform to one variable.
+
+    Construction involves collective communication, so it has to happen on all
+    processes in the same order.
+    """
+
+    def __init__(self, state, transform, var, axis_cache=None):
+        if axis_cache is None:
+            axis_cache = {}
+
+        self.transform = transform
+        self.is_horizontal = False
+        self.axes = []
+        self.dims = ()
+        self.dimensions = {}
+        self.chunk_sizes = {}
+        self.coordinates = {}
+
+        dims = tuple(dim for dim in (var.dims or ()) if dim not in TIMESTEPS)
+
+        # processes along axes the variable does not have hold the same data, only one of them writes it
+        self._is_writer = distributed.is_chunk_owner(dims)
+
+        for axis, dim in enumerate(dims):
+            out_dim = transform.get_dimension_name(dim)
+            self.dims += (out_dim,)
+
+            if out_dim == dim:
+                continue
+
+            if dim in Z_DIMENSIONS:
+                nz = state.dimensions[dim]
+                if any(not -nz <= level < nz for level in transform.levels):
+                    raise IndexError(f"Levels of output transform {transform.name} out of range for dimension {dim}")
+
+                levels = onp.array(transform.levels) % nz
+                self.axes.append((axis, levels))
+                self.dimensions[out_dim] = len(levels)
+                coordinates = onp.asarray(getattr(state.variables, dim))[levels]
+            else:
+                cache_key = (transform.name, dim)
+                if cache_key not in axis_cache:
+                    axis_cache[cache_key] = _HorizontalAxis(state, transform, dim)
+
+                horizontal_axis = axis_cache[cache_key]
+                self.is_horizontal = True
+                self.axes.append((axis, horizontal_axis))
+                self.dimensions[out_dim] = horizontal_axis.size
+                self.chunk_sizes[out_dim] = horizontal_axis.chunk_size
+                coordinates = horizontal_axis.coordinates
+
+            dim_var = state.var_meta[dim]
+            coord_var = Variable(
+                f"{dim_var.name} ({transform.name})",
+                (out_dim,),
+                dim_var.units,
+                dim_var.long_description,
+                time_dependent=False,
+            )
+            self.coordinates[out_dim] = (coord_var, coordinates)
+
+    def apply(self, var_data, gridmask):
+        """Transform local data and mask of a variable.
+
+        Returns the transformed data and mask, and the global slice they belong to (without
+        ghost cells). If the horizontal grid is not transformed, the slice is None and the
+        data has the usual local shape.
+        """
+        var_data = onp.asarray(var_data)
+
+        if gridmask is None:
+            mask = onp.ones(var_data.shape, dtype="bool")
+        else:
+            gridmask = onp.asarray(gridmask).astype("bool")
+            newaxes = (slice(None),) * gridmask.ndim + (onp.newaxis,) * (var_data.ndim - gridmask.ndim)
+            mask = onp.broadcast_to(gridmask[newaxes], var_data.shape)
+
+        if self.transform.coarsen == (1, 1):
+            for axis, transformed_axis in self.axes:
+                if isinstance(transformed_axis, _HorizontalAxis):
+                    var_data = transformed_axis.select(var_data, axis)
+                    mask = transformed_axis.select(mask, axis)
+                else:
+                    var_data = onp.take(var_data, transformed_axis, axis=axis)
+                    mask = onp.take(mask, transformed_axis, axis=axis)
+        else:
+            weights = mask.astype("float64")
+            weighted_sum = onp.where(mask, var_data, 0) * weights
+
+            for axis, transformed_axis in self.axes:
+                if isinstance(transformed_axis, _HorizontalAxis):
+                    weighted_sum, weights = transformed_axis.reduce(weighted_sum, weights, axis)
+                else:
+                    weighted_sum = onp.take(weighted_sum, transformed_axis, axis=axis)
+                    weights = onp.take(weights, transformed_axis, axis=axis)
+
+            mask = weights > 0
+            var_data = (weighted_sum / onp.where(mask, weights, 1)).astype(var_data.dtype)
+
+        if not self.is_horizontal:
+            return var_data, mask, None
+
+        out_slice = [slice(None)] * var_data.ndim
+        for axis, transformed_axis in self.axes:
+            if isinstance(transformed_axis, _HorizontalAxis):
+                out_slice[axis] = transformed_axis.out_slice
+
+        if not self._is_writer:
+            out_slice = [slice(0, 0)] * var_data.ndim
+            var_data, mask = var_data[tuple(out_slice)], mask[tuple(out_slice)]
+
+        return var_data, mask, tuple(out_slice)
@@ -1,4 +1,5 @@
 import functools
+import math
 
 from veros import runtime_settings as rs, runtime_state as rst
 from veros.routines import CURRENT_CONTEXT
@@ -101,6 +102,68 @@ def allreduce(buf, op, comm):
     return recvbuf
 
 
+def gather_blocks(buf, comm, root=0):
+    """Gather equally shaped arrays from all processes.
+
+    Returns an array of shape ``(nproc, *buf.shape)`` on the root process and the
+    unmodified input everywhere else.
+    """
+    if rs.backend == "jax":
+        from mpi4jax import gather
+
+        return gather(buf, root=root, comm=comm)
+
+    import numpy
+
+    if comm.Get_rank() != root:
+        comm.Gather(ascontiguousarray(buf), None, root=root)
+        return buf
+
+    recvbuf = numpy.empty((comm.Get_size(),) + buf.shape, dtype=buf.dtype)
+    comm.Gather(ascontiguousarray(buf), recvbuf, root=root)
+    return recvbuf
+
+
+def allgather_blocks(buf, comm):
+    """Gather equally shaped arrays from all processes on every process.
+
+    Returns an array of shape ``(nproc, *buf.shape)``.
+    """
+    if rs.backend == "jax":
+        from mpi4jax import allgather
+
+        return allgather(buf, comm=comm)
+
+    import numpy
+
+    recvbuf = numpy.empty((comm.Get_size(),) + buf.shape, dtype=buf.dtype)
+    comm.Allgather(ascontiguousarray(buf), recvbuf)
+    return recvbuf
+
+
+def scatter_blocks(buf, comm, root=0):
+    """Scatter equally shaped arrays to all processes.
+
+    On the root process, ``buf`` has shape ``(nproc, *shape)``, on all other processes
+    it is an array of shape ``shape`` whose contents are ignored.
+    """
+    if rs.backend == "jax":
+        from mpi4jax import scatter
+
+        return scatter(buf, root=root, comm=comm)
+
+    import numpy
+
+    if comm.Get_rank() != root:
+        recvbuf = numpy.empty_like(buf)
+        comm.Scatter(None, recvbuf, root=root)
+        return recvbuf
+
+    recvbuf = numpy.empty_like(buf[0])
+    comm.Scatter(ascontiguousarray(buf), recvbuf, root=root)
+    return recvbuf
+
+
 def ascontiguousarray(arr):
     assert rs.backend == "numpy"
     import numpy
@@ -176,8 +239,98 @@ def get_chunk_slices(nx, ny, dim_grid, proc_idx=None, include_overlap=False):
     return tuple(global_slice), tuple(local_slice)
 
 
+def get_chunk_aligned_slices(nx, ny, dim_grid, proc_idx=None):
+    """Get the part of the local array (including overlap) that starts at a chunk boundary
+    of the global array, if chunks have the size of a local domain without overlap.
+
+    The slices of all processes do not overlap and cover the whole global array, so every
+    chunk is written by exactly one process. Assumes that the overlap is up to date.
+    """
+    if not dim_grid:
+        return Ellipsis, Ellipsis
+
+    if proc_idx is None:
+        proc_idx = proc_rank_to_index(rst.proc_rank)
+
+    px, py = proc_idx
+    nxl, nyl = get_chunk_size(nx, ny)
+
+    # the last process also owns the trailing chunk with the outer overlap
+    sxu = nxl + 4 if (px + 1) == rs.num_proc[0] else nxl
+    syu = nyl + 4 if (py + 1) == rs.num_proc[1] else nyl
+
+    global_slice, local_slice = [], []
+
+    for dim in dim_grid:
+        if dim in SCATTERED_DIMENSIONS[0]:
+            global_slice.append(slice(px * nxl, px * nxl + sxu))
+            local_slice.append(slice(0, sxu))
+        elif dim in SCATTERED_DIMENSIONS[1]:
+            global_slice.append(slice(py * nyl, py * nyl + syu))
+            local_slice.append(slice(0, syu))
+        else:
+            global_slice.append(slice(None))
+            local_slice.append(slice(None))
+
+    return tuple(global_slice), tuple(local_slice)
+
+
+def is_chunk_owner(dim_grid, proc_idx=None):
+    """Whether this process writes its part of an array with the given dimensions.
+
+    Arrays that are not scattered along an axis are identical on all processes along
+    that axis, so only the first of them writes.
+    """
+    if proc_idx is None:
+        proc_idx = proc_rank_to_index(rst.proc_rank)
+
+    px, py = proc_idx
+    dim_grid = dim_grid or ()
+
+    if px > 0 and not any(dim in SCATTERED_DIMENSIONS[0] for dim in dim_grid):
+        return False
+
+    if py > 0 and not any(dim in SCATTERED_DIMENSIONS[1] for dim in dim_grid):
+        return False
+
+    return True
+
+
+def _get_local_window(nx, ny, dim_grid, proc_idx):
+    """Get the global slice covering the whole local array of a process, including overlap."""
+    px, py = proc_idx
+    nxl, nyl = get_chunk_size(nx, ny)
+
+    window = []
+
+    for dim in dim_grid:
+        if dim in SCATTERED_DIMENSIONS[0]:
+            window.append(slice(px * nxl, (px + 1) * nxl + 4))
+        elif dim in SCATTERED_DIMENSIONS[1]:
+            window.append(slice(py * nyl, (py + 1) * nyl + 4))
+        else:
+            window.append(slice(None))
+
+    return tuple(window)
+
+
 def get_process_neighbors(cyclic=False):
-    this_x, this_y = proc_rank_to_index(rst.proc_rank)
+    return _get_process_neighbors(_get_comm_handle(rs.mpi_comm), rst.proc_rank, tuple(rs.num_proc), cyclic)
+
+
+def _get_comm_handle(comm):
+    # MPI Comms are not hashable, so we use the underlying handle instead
+    if comm is None:
+        return None
+
+    from mpi4py import MPI
+
+    return MPI._handleof(comm)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_process_neighbors(comm_handle, proc_rank, num_proc, cyclic):
+    this_x, this_y = proc_rank_to_index(proc_rank)
 
     if this_x == 0:
         if cyclic:
@@ -215,10 +368,13 @@ def get_process_neighbors(cyclic=False):
     return global_neighbors
 
 
-@dist_context_only(noop_return_arg=0)
-def exchange_overlap(arr, var_grid, cyclic):
-    from veros.core.operators import numpy as npx, update, at
+@functools.lru_cache(maxsize=None)
+def _get_overlap_slices(var_grid):
+    """Get pairs of send / receive directions and the corresponding array slices
+    used to exchange the overlap of an array with the given grid.
 
+    ``var_grid`` must be a tuple. Returns None if the array does not need to be exchanged.
+    """
     # start west, go clockwise
     send_order = (
         "west",
@@ -250,9 +406,7 @@ def exchange_overlap(arr, var_grid, cyclic):
 
     if d1 not in SCATTERED_DIMENSIONS[0] and d1 not in SCATTERED_DIMENSIONS[1] and d2 not in SCATTERED_DIMENSIONS[1]:
         # neither x nor y dependent, nothing to do
-        return arr
-
-    proc_neighbors = get_process_neighbors(cyclic)
+        return None
 
     if d1 in SCATTERED_DIMENSIONS[0] and d2 in SCATTERED_DIMENSIONS[1]:
         overlap_slices_from = dict(
@@ -301,29 +455,373 @@ def exchange_overlap(arr, var_grid, cyclic):
             north=(slice(-2, None), Ellipsis),
         )
 
-    for send_dir, recv_dir in zip(send_order, recv_order):
+    return tuple(zip(send_order, recv_order)), overlap_slices_from, overlap_slices_to
+
+
+EDGE_DIRECTIONS = ("west", "south", "east", "north")
+
+
+@dist_context_only(noop_return_arg=0)
+def exchange_overlap(arr, var_grid, cyclic):
+    return exchange_overlaps([arr], [var_grid], cyclic)[0]
+
+
+class ExchangePlan:
+    """Precomputed overlap exchange of several arrays with fixed shapes and grids.
+
+    Holds the neighbor ranks, overlap slices, and preallocated send / receive buffers
+    of the exchange. The overlap strips of all arrays that are sent in the same direction
+    are packed back to back into a single buffer, so each neighbor receives one message
+    per exchange.
+
+    Persistent plans create one persistent MPI request per message that is restarted by
+    every exchange. Other plans post plain non-blocking messages and are meant to be
+    used only once.
+
+    Do not instantiate directly, use :func:`get_exchange_plan` instead.
+    """
+
+    # keep strips aligned for efficient typed access
+    alignment = 64
+
+    def __init__(self, shapes, dtypes, var_grids, cyclic, persistent=True, comm=None):
+        import numpy as np
+
+        if comm is None:
+            comm = rs.mpi_comm
+
+        strips = {}
+
+        for arr_idx, (shape, dtype, var_grid) in enumerate(zip(shapes, dtypes, var_grids)):
+            overlap_slices = _get_overlap_slices(var_grid)
+
+            if overlap_slices is None:
+                continue
+
+            directions, overlap_slices_from, overlap_slices_to = overlap_slices
+
+            # zero-strided dummy to get strip shapes without allocating memory
+            dummy = np.broadcast_to(np.empty((), dtype=dtype), shape)
+
+            for send_dir, recv_dir in directions:
+                send_idx, recv_idx = overlap_slices_from[send_dir], overlap_slices_to[recv_dir]
+                strips.setdefault((send_dir, recv_dir), []).append(
+                    (arr_idx, send_idx, recv_idx, dummy[send_idx].shape, np.dtype(dtype))
+                )
+
+        proc_neighbors = get_process_neighbors(cyclic)
+
+        self._comm = comm
+        self._persistent = persistent
+        self._messages = []
+        self._send_segments = []
+        recv_messages = []
+
+        # every process builds the same messages in the same order, so the index is a unique tag
+        for tag, ((send_dir, recv_dir), direction_strips) in enumerate(strips.items()):
+            send_proc = proc_neighbors[send_dir]
+            recv_proc = proc_neighbors[recv_dir]
+
+            offsets = []
+            nbytes = 0
+
+            for *_, strip_shape, dtype in direction_strips:
+                offsets.append(nbytes)
+                strip_bytes = int(np.prod(strip_shape)) * dtype.itemsize
+                nbytes += -(-strip_bytes // self.alignment) * self.alignment
+
+            def make_views(buf):
+                views = []
+                for offset, (*_, strip_shape, dtype) in zip(offsets, direction_strips):
+                    strip_bytes = int(np.prod(strip_shape)) * dtype.itemsize
+                    views.append(buf[offset : offset + strip_bytes].view(dtype).reshape(strip_shape))
+                return views
+
+            if recv_proc is not None:
+                recv_buf = np.empty(nbytes, dtype=np.uint8)
+                self._messages.append(("recv", recv_buf, recv_proc, tag))
+                recv_messages.append(
+                    (
+                        recv_dir,
+                        [
+                            (arr_idx, recv_idx, recv_view)
+                            for (arr_idx, _, recv_idx, *_), recv_view in zip(direction_strips, make_views(recv_buf))
+                        ],
+                    )
+                )
+
+            if send_proc is not None:
+                send_buf = np.empty(nbytes, dtype=np.uint8)
+                self._messages.append(("send", send_buf, send_proc, tag))
+                self._send_segments.extend(
+                    (arr_idx, send_idx, send_view)
+                    for (arr_idx, send_idx, *_), send_view in zip(direction_strips, make_views(send_buf))
+                )
+
+        # corners overlap with edges, so they have to be written last
+        recv_messages.sort(key=lambda message: message[0] not in EDGE_DIRECTIONS)
+        self._recv_segments = [segment for _, segments in recv_messages for segment in segments]
+
+        if persistent:
+            self._requests = [self._make_request(*message, persistent=True) for message in self._messages]
+        else:
+            self._requests = []
+
+        self.in_use = False
+
+    def _make_request(self, kind, buf, proc, tag, persistent):
+        if kind == "recv":
+            init = self._comm.Recv_init if persistent else self._comm.Irecv
+            return init(buf, source=proc, tag=tag)
+
+        init = self._comm.Send_init if persistent else self._comm.Isend
+        return init(buf, dest=proc, tag=tag)
+
+    def start(self, arrs):
+        """Pack the overlap strips of the given arrays and start all messages."""
+        from mpi4py import MPI
+
+        if self.in_use:
+            raise RuntimeError("Exchange plan is already in use")
+
+        # post receives first so messages can be delivered directly into the buffers
+        if not self._persistent:
+            self._requests = [
+                self._make_request(*message, persistent=False) for message in self._messages if message[0] == "recv"
+            ]
+
+        for arr_idx, send_idx, send_view in self._send_segments:
+            send_view[...] = arrs[arr_idx][send_idx]
+
+        self.in_use = True
+
+        if self._persistent:
+            MPI.Prequest.Startall(self._requests)
+        else:
+            self._requests.extend(
+                self._make_request(*message, persistent=False) for message in self._messages if message[0] == "send"
+            )
+
+    def finish(self, arrs):
+        """Wait for all messages to arrive and write the received strips to the given arrays."""
+        from mpi4py import MPI
+        from veros.core.operators import update, at
+
+        MPI.Request.Waitall(self._requests)
+        self.in_use = False
+
+        if not self._persistent:
+            self._requests = []
+
+        arrs = list(arrs)
+        for arr_idx, recv_idx, recv_view in self._recv_segments:
+            arrs[arr_idx] = update(arrs[arr_idx], at[recv_idx], recv_view)
+
+        return arrs
+
+    def free(self):
+        """Release the persistent requests of this plan."""
+        if self._persistent:
+            for request in self._requests:
+                request.Free()
+
+        self._requests = []
+
+
+_exchange_plan_cache = {}
+
+
+def _get_exchange_plan_key(shapes, dtypes, var_grids, cyclic):
+    import numpy as np
+
+    return (
+        tuple(tuple(shape) for shape in shapes),
+        tuple(np.dtype(dtype).str for dtype in dtypes),
+        tuple(tuple(var_grid) for var_grid in var_grids),
+        cyclic,
+        _get_comm_handle(rs.mpi_comm),
+        rst.proc_rank,
+        tuple(rs.num_proc),
+    )
+
+
+def get_exchange_plan(arrs, var_grids, cyclic):
+    """Get the cached exchange plan for arrays with the given shapes, dtypes, and grids.
+
+    Plans are usually built during setup (see :func:`build_exchange_plans`), otherwise
+    on first use, and are reused by all subsequent exchanges on the same communicator.
+    Returns a new, non-persistent plan if the cached one belongs to a pending exchange.
+    """
+    shapes = [arr.shape for arr in arrs]
+    dtypes = [arr.dtype for arr in arrs]
+    cache_key = _get_exchange_plan_key(shapes, dtypes, var_grids, cyclic)
+    plan = _exchange_plan_cache.get(cache_key)
+
+    if plan is None:
+        return _build_cached_exchange_plan(cache_key)
+
+    if plan.in_use:
+        return ExchangePlan(*cache_key[:4], persistent=False)
+
+    return plan
+
+
+def _build_cached_exchange_plan(cache_key):
+    plan = ExchangePlan(*cache_key[:4])
+    _exchange_plan_cache[cache_key] = plan
+    return plan
+
+
+def build_exchange_plans(layouts, cyclic):
+    """Build the exchange plans for arrays with the given layouts ahead of time.
+
+    This allocates all buffers and persistent requests of the exchanges up front
+    instead of during the first time step.
+
+    Arguments:
+        layouts (Sequence): Tuples ``(shapes, dtypes, var_grids)`` of all arrays that
+            are exchanged together.
+        cyclic (bool): Whether the domain is cyclic in x-direction.
+
+    """
+    if rst.proc_num == 1 or rs.backend != "numpy":
+        return
+
+    for shapes, dtypes, var_grids in layouts:
+        cache_key = _get_exchange_plan_key(shapes, dtypes, var_grids, cyclic)
+        if cache_key not in _exchange_plan_cache:
+            _build_cached_exchange_plan(cache_key)
+
+
+class OverlapExchange:
+    """Handle to a pending overlap exchange. Do not instantiate directly!
+
+    Use :func:`start_exchange_overlap` to create it and :meth:`wait` to retrieve
+    the exchanged arrays.
+    """
+
+    def __init__(self, arrs, plan=None):
+        self._arrs = list(arrs)
+        self._plan = plan
+        self._done = False
+
+    def wait(self):
+        """Wait for all messages to arrive and return the exchanged arrays."""
+        if self._done:
+            return self._arrs
+
+        if self._plan is not None:
+            self._arrs = self._plan.finish(self._arrs)
+
+            self._plan = None
+
+        self._done = True
+        return self._arrs
+
+
+def _exchange_overlaps_jax(arrs, var_grids, cyclic):
+    from veros.core.operators import numpy as npx, update, at
+
+    proc_neighbors = get_process_neighbors(cyclic)
+
+    # pack strips of the same direction and dtype into one message
+    strips = {}
+
+    for arr_idx, (arr, var_grid) in enumerate(zip(arrs, var_grids)):
+        overlap_slices = _get_overlap_slices(tuple(var_grid))
+
+        if overlap_slices is None:
+            continue
+
+        directions, overlap_slices_from, overlap_slices_to = overlap_slices
+
+        for send_dir, recv_dir in directions:
+            strips.setdefault((send_dir, recv_dir, arr.dtype), []).append(
+                (arr_idx, overlap_slices_from[send_dir], overlap_slices_to[recv_dir])
+            )
+
+    received = []
+
+    for (send_dir, recv_dir, _), direction_strips in strips.items():
         send_proc = proc_neighbors[send_dir]
         recv_proc = proc_neighbors[recv_dir]
 
         if send_proc is None and recv_proc is None:
             continue
 
-        recv_idx = overlap_slices_to[recv_dir]
-        recv_arr = npx.empty_like(arr[recv_idx])
-
-        send_idx = overlap_slices_from[send_dir]
-        send_arr = arr[send_idx]
+        send_arr = npx.concatenate([arrs[arr_idx][send_idx].ravel() for arr_idx, send_idx, _ in direction_strips])
+        recv_arr = npx.empty_like(send_arr)
 
         if send_proc is None:
             recv_arr = recv(recv_arr, recv_proc, rs.mpi_comm)
-            arr = update(arr, at[recv_idx], recv_arr)
         elif recv_proc is None:
             send(send_arr, send_proc, rs.mpi_comm)
+            continue
         else:
             recv_arr = sendrecv(send_arr, recv_arr, source=recv_proc, dest=send_proc, comm=rs.mpi_comm)
-            arr = update(arr, at[recv_idx], recv_arr)
 
-    return arr
+        received.append((recv_dir, direction_strips, recv_arr))
+
+    # corners overlap with edges, so they have to be written last
+    received.sort(key=lambda message: message[0] not in EDGE_DIRECTIONS)
+
+    for _, direction_strips, recv_arr in received:
+        offset = 0
+        for arr_idx, _, recv_idx in direction_strips:
+            strip_shape = arrs[arr_idx][recv_idx].shape
+            strip_size = math.prod(strip_shape)
+            arrs[arr_idx] = update(
+                arrs[arr_idx], at[recv_idx], recv_arr[offset : offset + strip_size].reshape(strip_shape)
+            )
+            offset += strip_size
+
+    return arrs
+
+
+def start_exchange_overlap(arrs, var_grids, cyclic):
+    """Post non-blocking overlap exchanges for several arrays at once.
+
+    All messages are in flight simultaneously, so computations that do not depend on
+    the overlap can be carried out before calling :meth:`OverlapExchange.wait`.
+
+    The overlap strips of all arrays are packed into one contiguous buffer per
+    neighbor. Buffers, neighbor ranks, and persistent requests are held by an
+    :class:`ExchangePlan` that is built once and reused by subsequent exchanges of
+    arrays with the same shapes and grids.
+
+    Only the NumPy backend supports non-blocking communication, on JAX the exchange is
+    carried out immediately.
+
+    Arguments:
+        arrs (Sequence[array]): Arrays to exchange.
+        var_grids (Sequence[Tuple[str]]): Grid of each array.
+        cyclic (bool): Whether the domain is cyclic in x-direction.
+
+    Returns:
+        OverlapExchange: Handle to the pending exchange.
+
+    """
+    arrs = list(arrs)
+
+    if len(arrs) != len(var_grids):
+        raise ValueError("Got different number of arrays and grids")
+
+    if rst.proc_num == 1 or not CURRENT_CONTEXT.is_dist_safe:
+        return OverlapExchange(arrs)
+
+    if rs.backend == "jax":
+        # mpi4jax does not support non-blocking communication
+        return OverlapExchange(_exchange_overlaps_jax(arrs, var_grids, cyclic))
+
+    plan = get_exchange_plan(arrs, var_grids, cyclic)
+    plan.start(arrs)
+
+    return OverlapExchange(arrs, plan)
+
+
+def exchange_overlaps(arrs, var_grids, cyclic):
+    """Exchange the overlap of several arrays in a single round of messages."""
+    return start_exchange_overlap(arrs, var_grids, cyclic).wait()
 
 
 def _memoize(function):
@@ -333,8 +831,7 @@ def _memoize(function):
     def memoized(*args):
         from mpi4py import MPI
 
-        # MPI Comms are not hashable, so we use the underlying handle instead
-        cache_args = tuple(MPI._handleof(arg) if isinstance(arg, MPI.Comm) else arg for arg in args)
+        cache_args = tuple(_get_comm_handle(arg) if isinstance(arg, MPI.Comm) else arg for arg in args)
 
         if cache_args not in cached:
             cached[cache_args] = function(*args)
@@ -345,8 +842,10 @@ def _memoize(function):
 
 
 @_memoize
-def _mpi_comm_along_axis(comm, procs, rank):
-    return comm.Split(procs, rank)
+def _mpi_comm_along_axis(comm, axis, rank):
+    # processes that share their index along the other axis
+    pi = proc_rank_to_index(rank)
+    return comm.Split(pi[1 - axis], rank)
 
 
 @dist_context_only(noop_return_arg=0)
@@ -357,9 +856,7 @@ def _reduce(arr, op, axis=None):
         comm = rs.mpi_comm
     else:
         assert axis in (0, 1)
-        pi = proc_rank_to_index(rst.proc_rank)
-        other_axis = 1 - axis
-        comm = _mpi_comm_along_axis(rs.mpi_comm, pi[other_axis], rst.proc_rank)
+        comm = _mpi_comm_along_axis(rs.mpi_comm, axis, rst.proc_rank)
 
     if npx.isscalar(arr):
         squeeze = True
@@ -418,36 +915,28 @@ def _gather_1d(nx, ny, arr, dim):
 
     otherdim = 1 - dim
     pi = proc_rank_to_index(rst.proc_rank)
+
+    # only processes that share the row / column of the root take part
+    comm = _mpi_comm_along_axis(rs.mpi_comm, dim, rst.proc_rank)
     if pi[otherdim] != 0:
         return arr
 
     dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
-    gidx, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
-    sendbuf = arr[idx]
+    blocks = gather_blocks(arr, comm=comm)
 
-    if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            pi = proc_rank_to_index(proc)
-            if pi[otherdim] != 0:
-                continue
-            idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=pi)
-            recvbuf = npx.empty_like(arr[idx_l])
-            recvbuf = recv(recvbuf, source=proc, tag=20, comm=rs.mpi_comm)
-            buffer_list.append((idx_g, recvbuf))
-
-        out_shape = ((nx + 4, ny + 4)[dim],) + arr.shape[1:]
-        out = npx.empty(out_shape, dtype=arr.dtype)
-        out = update(out, at[gidx], sendbuf)
+    if rst.proc_rank != 0:
+        return arr
 
-        for idx, val in buffer_list:
-            out = update(out, at[idx], val)
+    out_shape = ((nx + 4, ny + 4)[dim],) + arr.shape[1:]
+    out = npx.empty(out_shape, dtype=arr.dtype)
 
-        return out
+    for proc_idx_along, block in enumerate(blocks):
+        proc_idx = [0, 0]
+        proc_idx[dim] = proc_idx_along
+        idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=proc_idx)
+        out = update(out, at[idx_g], block[idx_l])
 
-    else:
-        send(sendbuf, dest=0, tag=20, comm=rs.mpi_comm)
-        return arr
+    return out
 
 
 @dist_context_only(noop_return_arg=2)
@@ -458,28 +947,19 @@ def _gather_xy(nx, ny, arr):
     assert arr.shape[:2] == (nxi + 4, nyi + 4), arr.shape
 
     dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
-    gidx, idx = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
-    sendbuf = arr[idx]
-
-    if rst.proc_rank == 0:
-        buffer_list = []
-        for proc in range(1, rst.proc_num):
-            idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc))
-            recvbuf = npx.empty_like(arr[idx_l])
-            recvbuf = recv(recvbuf, source=proc, tag=30, comm=rs.mpi_comm)
-            buffer_list.append((idx_g, recvbuf))
+    blocks = gather_blocks(arr, comm=rs.mpi_comm)
 
-        out_shape = (nx + 4, ny + 4) + arr.shape[2:]
-        out = npx.empty(out_shape, dtype=arr.dtype)
-        out = update(out, at[gidx], sendbuf)
+    if rst.proc_rank != 0:
+        return arr
 
-        for idx, val in buffer_list:
-            out = update(out, at[idx], val)
+    out_shape = (nx + 4, ny + 4) + arr.shape[2:]
+    out = npx.empty(out_shape, dtype=arr.dtype)
 
-        return out
+    for proc, block in enumerate(blocks):
+        idx_g, idx_l = get_chunk_slices(nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc))
+        out = update(out, at[idx_g], block[idx_l])
 
-    send(sendbuf, dest=0, tag=30, comm=rs.mpi_comm)
-    return arr
+    return out
 
 
 @dist_context_only(noop_return_arg=0)
@@ -515,70 +995,116 @@ def gather(arr, dimensions, var_grid):
 
 
 @dist_context_only(noop_return_arg=0)
-def _scatter_constant(arr):
-    return bcast(arr, rs.mpi_comm, root=0)
+def allgather_pieces(arr, global_slice, global_shape):
+    """Assemble a global array on all processes from the pieces held by each process.
 
+    Pieces are placed at ``global_slice`` and may overlap if they hold identical data.
+    Intended for small arrays, since every piece is sent to every process.
+    """
+    import numpy as onp
 
-@dist_context_only(noop_return_arg=2)
-def _scatter_1d(nx, ny, arr, dim):
-    from veros.core.operators import numpy as npx, update, at
+    arr = onp.asarray(arr)
+    pieces = rs.mpi_comm.allgather((global_slice, arr))
 
-    assert dim in (0, 1)
+    out = onp.empty(global_shape, dtype=arr.dtype)
+    for piece_slice, piece in pieces:
+        out[piece_slice] = piece
 
-    out_nx = get_chunk_size(nx, ny)[dim]
-    dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
-    _, local_slice = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
+    return out
 
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
 
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(
-                nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc)
-            )
-            sendbuf = arr[global_slice]
-            send(sendbuf, dest=proc, tag=40, comm=rs.mpi_comm)
+def redistribute_to_chunks(arr, global_slice, global_shape, chunks):
+    """Send the pieces of a global array to the processes that write its chunks.
+
+    Every process holds the part ``global_slice`` of the array, and the (non-empty) pieces
+    of all processes must not overlap. Every chunk is assigned to the process holding its
+    first element, so chunks are written without coordination. Returns the data of all
+    chunks assigned to this process, and their global slice.
+    """
+    import numpy as onp
 
-        # arr changes shape in main process
-        arr = npx.zeros((out_nx + 4,) + arr.shape[1:], dtype=arr.dtype)
+    arr = onp.asarray(arr)
+    bounds = tuple(s.indices(n)[:2] for s, n in zip(global_slice, global_shape))
+
+    def get_owned_bounds(piece_bounds):
+        if any(lower >= upper for lower, upper in piece_bounds):
+            return tuple((0, 0) for _ in piece_bounds)
+
+        return tuple(
+            (min(-(-lower // c) * c, n), min(-(-upper // c) * c, n))
+            for (lower, upper), c, n in zip(piece_bounds, chunks, global_shape)
+        )
+
+    if rst.proc_num == 1:
+        all_bounds = [bounds]
     else:
-        recvbuf = recv(arr[local_slice], source=0, tag=40, comm=rs.mpi_comm)
+        all_bounds = rs.mpi_comm.allgather(bounds)
 
-    arr = update(arr, at[local_slice], recvbuf)
-    arr = exchange_overlap(arr, ["xt" if dim == 0 else "yt"], cyclic=False)
+    owned_bounds = [get_owned_bounds(piece_bounds) for piece_bounds in all_bounds]
 
-    return arr
+    pieces = []
+    for target in owned_bounds:
+        overlap = tuple((max(lower, tl), min(upper, tu)) for (lower, upper), (tl, tu) in zip(bounds, target))
 
+        if any(lower >= upper for lower, upper in overlap):
+            pieces.append(None)
+            continue
 
-@dist_context_only(noop_return_arg=2)
-def _scatter_xy(nx, ny, arr):
-    from veros.core.operators import numpy as npx, update, at
+        local_slice = tuple(slice(lower - sl, upper - sl) for (lower, upper), (sl, _) in zip(overlap, bounds))
+        pieces.append((overlap, arr[local_slice]))
 
-    nxi, nyi = get_chunk_size(nx, ny)
+    if rst.proc_num == 1:
+        received = pieces
+    else:
+        received = rs.mpi_comm.alltoall(pieces)
 
-    dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
-    _, local_slice = get_chunk_slices(nx, ny, dim_grid, include_overlap=True)
+    target = owned_bounds[rst.proc_rank]
+    out = onp.empty(tuple(upper - lower for lower, upper in target), dtype=arr.dtype)
 
-    if rst.proc_rank == 0:
-        recvbuf = arr[local_slice]
+    for piece in received:
+        if piece is None:
+            continue
+
+        overlap, data = piece
+        out[tuple(slice(lower - tl, upper - tl) for (lower, upper), (tl, _) in zip(overlap, target))] = data
+
+    return out, tuple(slice(lower, upper) for lower, upper in target)
 
-        for proc in range(1, rst.proc_num):
-            global_slice, _ = get_chunk_slices(
-                nx, ny, dim_grid, include_overlap=True, proc_idx=proc_rank_to_index(proc)
-            )
-            sendbuf = arr[global_slice]
-            send(sendbuf, dest=proc, tag=50, comm=rs.mpi_comm)
 
-        # arr changes shape in main process
-        arr = npx.empty((nxi + 4, nyi + 4) + arr.shape[2:], dtype=arr.dtype)
+@dist_context_only(noop_return_arg=0)
+def _scatter_constant(arr):
+    return bcast(arr, rs.mpi_comm, root=0)
+
+
+def _scatter_windows(nx, ny, arr, dim_grid, local_shape):
+    from veros.core.operators import numpy as npx
+
+    if rst.proc_rank == 0:
+        # every process receives its whole local array, so no overlap exchange is needed
+        blocks = npx.stack(
+            [arr[_get_local_window(nx, ny, dim_grid, proc_rank_to_index(proc))] for proc in range(rst.proc_num)]
+        )
     else:
-        recvbuf = npx.empty_like(arr[local_slice])
-        recvbuf = recv(recvbuf, source=0, tag=50, comm=rs.mpi_comm)
+        blocks = npx.empty(local_shape, dtype=arr.dtype)
+
+    return scatter_blocks(blocks, comm=rs.mpi_comm)
 
-    arr = update(arr, at[local_slice], recvbuf)
-    arr = exchange_overlap(arr, ["xt", "yt"], cyclic=False)
 
-    return arr
+@dist_context_only(noop_return_arg=2)
+def _scatter_1d(nx, ny, arr, dim):
+    assert dim in (0, 1)
+
+    out_nx = get_chunk_size(nx, ny)[dim]
+    dim_grid = ["xt" if dim == 0 else "yt"] + [None] * (arr.ndim - 1)
+    return _scatter_windows(nx, ny, arr, dim_grid, (out_nx + 4,) + arr.shape[1:])
+
+
+@dist_context_only(noop_return_arg=2)
+def _scatter_xy(nx, ny, arr):
+    nxi, nyi = get_chunk_size(nx, ny)
+
+    dim_grid = ["xt", "yt"] + [None] * (arr.ndim - 2)
+    return _scatter_windows(nx, ny, arr, dim_grid, (nxi + 4, nyi + 4) + arr.shape[2:])
 
 
 @dist_context_only(noop_return_arg=0)
@@ -60,3 +60,100 @@ def _write_to_disk(h5file, file_id):
     finally:
         if runtime_settings.use_io_threads and file_id is not None:
             _io_locks[file_id].set()
+
+
+COMPRESSION_CODECS = ("shuffle", "gzip", "lzf", "zstd", "lz4")
+
+
+def parse_codec(codec):
+    """
+    Split a codec specification like ``"shuffle+zstd:5"`` into a list of ``(name, level)``
+    tuples. The level is ``None`` if not given.
+    """
+    filters = []
+
+    for filter_spec in codec.split("+"):
+        name, _, level = filter_spec.strip().partition(":")
+        level = int(level) if level else None
+
+        if name in ("", "none"):
+            continue
+
+        if name not in COMPRESSION_CODECS:
+            raise ValueError(f"Unknown compression codec {name}")
+
+        filters.append((name, level))
+
+    return filters
+
+
+def resolve_codec(codec=None):
+    """
+    Return the codec specification to use for a variable, or ``None`` if compression is disabled.
+
+    Explicitly given codecs are used as-is. Otherwise, the ``hdf5_compression`` runtime setting
+    applies, unless the legacy ``hdf5_gzip_compression`` switch disables the default codec.
+    """
+    from veros.runtime import AVAILABLE_SETTINGS
+
+    if codec is not None:
+        return codec
+
+    codec = runtime_settings.hdf5_compression
+
+    if not runtime_settings.hdf5_gzip_compression:
+        if codec != AVAILABLE_SETTINGS["hdf5_compression"].default and parse_codec(codec):
+            raise ValueError(
+                f"hdf5_gzip_compression=False conflicts with hdf5_compression={codec!r}, "
+                'use hdf5_compression="none" to disable compression'
+            )
+
+        return None
+
+    return codec
+
+
+def get_compression_options(codec=None):
+    """
+    Translate a codec specification into keyword arguments for dataset creation.
+
+    Codecs are given as ``"name[:level]"`` and can be chained with ``+``, e.g.
+    ``"shuffle+zstd:5"``. Supported are ``gzip``, ``lzf``, ``shuffle``, ``none``, and
+    ``zstd`` and ``lz4`` (through the ``hdf5plugin`` package). Defaults to the
+    ``hdf5_compression`` runtime setting (see :func:`resolve_codec`).
+    """
+    import h5py
+
+    codec = resolve_codec(codec)
+
+    if codec is None:
+        return {}
+
+    if runtime_state.proc_num > 1 and h5py.version.hdf5_version_tuple < (1, 10, 2):
+        # HDF5 only supports parallel writes to compressed datasets since 1.10.2
+        return {}
+
+    kwargs = {}
+
+    for name, level in parse_codec(codec):
+        if level is not None and name not in ("gzip", "zstd"):
+            raise ValueError(f"Compression codec {name} does not support a compression level")
+
+        if name == "shuffle":
+            kwargs.update(shuffle=True)
+        elif name == "gzip":
+            kwargs.update(compression="gzip", compression_opts=1 if level is None else level)
+        elif name == "lzf":
+            kwargs.update(compression="lzf")
+        elif name in ("zstd", "lz4"):
+            try:
+                import hdf5plugin
+            except ImportError:
+                raise RuntimeError(f"Compression codec {name} requires the hdf5plugin package") from None
+
+            if name == "zstd":
+                kwargs.update(hdf5plugin.Zstd(clevel=3 if level is None else level))
+            else:
+                kwargs.update(hdf5plugin.LZ4())
+
+    return kwargs
@@ -1,4 +1,5 @@
 import json
+import atexit
 import datetime
 import threading
 import contextlib
@@ -13,6 +14,7 @@ from veros import (
     runtime_settings as rs,
     __version__ as veros_version,
 )
+from veros.io_tools import hdf5 as h5tools
 
 """
 netCDF output is designed to follow the COARDS guidelines from
@@ -28,15 +30,10 @@ def _get_setup_code(pyfile):
         return "UNKNOWN"
 
 
-def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=True):
+def get_file_attributes(state):
     """
-    Define standard grid in netcdf file
+    Global attributes describing the model run
     """
-    import h5netcdf
-
-    if not isinstance(ncfile, h5netcdf.File):
-        raise TypeError("Argument needs to be a netCDF4 Dataset")
-
     if rs.setup_file is None:
         setup_file = "UNKNOWN"
         setup_code = "UNKNOWN"
@@ -44,7 +41,7 @@ def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=
         setup_file = rs.setup_file
         setup_code = _get_setup_code(rs.setup_file)
 
-    ncfile.attrs.update(
+    return dict(
         date_created=datetime.datetime.today().isoformat(),
         veros_version=veros_version,
         setup_identifier=state.settings.identifier,
@@ -54,6 +51,20 @@ def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=
         setup_code=setup_code,
     )
 
+
+def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=True, coordinates=None):
+    """
+    Define standard grid in netcdf file
+
+    ``coordinates`` maps extra dimensions to a tuple of their variable and its (global) data.
+    """
+    import h5netcdf
+
+    if not isinstance(ncfile, h5netcdf.File):
+        raise TypeError("Argument needs to be a netCDF4 Dataset")
+
+    ncfile.attrs.update(get_file_attributes(state))
+
     dimensions = dict(state.dimensions)
     if extra_dimensions is not None:
         dimensions.update(extra_dimensions)
@@ -63,7 +74,9 @@ def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=
         if dim in variables.TIMESTEPS:
             continue
 
-        if dim in state.var_meta:
+        if coordinates is not None and dim in coordinates:
+            var, var_data = coordinates[dim]
+        elif dim in state.var_meta:
             var = state.var_meta[dim]
 
             # skip inactive dimensions
@@ -91,7 +104,14 @@ def initialize_file(state, ncfile, extra_dimensions=None, create_time_dimension=
         )
 
 
-def initialize_variable(state, key, var, ncfile):
+def initialize_variable(state, key, var, ncfile, compression=None, chunk_sizes=None):
+    """
+    Create netCDF variable. ``chunk_sizes`` maps dimensions that are not part of the model
+    grid to their chunk size (default: the whole dimension).
+    """
+    if chunk_sizes is None:
+        chunk_sizes = {}
+
     if var.dims is None:
         dims = ()
     else:
@@ -104,12 +124,14 @@ def initialize_variable(state, key, var, ncfile):
         logger.warning(f"Variable {key} already initialized")
         return
 
-    kwargs = {}
-    if rs.hdf5_gzip_compression and runtime_state.proc_num == 1:
-        kwargs.update(compression="gzip", compression_opts=1)
+    # each process writes exactly one chunk, so chunks are compressed in parallel
+    kwargs = h5tools.get_compression_options(compression)
 
+    # other dimensions are not chunked, unless specified
     chunksize = [
-        variables.get_shape(state.dimensions, (d,), local=True, include_ghosts=False)[0] if d in state.dimensions else 1
+        variables.get_shape(state.dimensions, (d,), local=True, include_ghosts=False)[0]
+        if d in state.dimensions
+        else (1 if d == "Time" else min(chunk_sizes.get(d, ncfile.dimensions[d].size), ncfile.dimensions[d].size))
         for d in dims
     ]
 
@@ -137,9 +159,38 @@ def add_dimension(dim, dim_size, ncfile):
     ncfile.dimensions[dim] = int(dim_size)
 
 
-def write_variable(state, key, var, var_data, ncfile, time_step=-1):
+def round_significant_bits(arr, significant_bits):
+    """
+    Round floating point data to the given number of mantissa bits (round to nearest,
+    ties to even). Zeroed trailing bits compress much better.
+    """
+    arr = np.asarray(arr)
+
+    if arr.dtype.kind != "f" or significant_bits >= np.finfo(arr.dtype).nmant:
+        return arr
+
+    uint_type = np.dtype(f"uint{8 * arr.dtype.itemsize}").type
+    dropped_bits = uint_type(np.finfo(arr.dtype).nmant - significant_bits)
+
+    bits = arr.view(uint_type)
+    half = (uint_type(1) << (dropped_bits - uint_type(1))) - uint_type(1)
+    keep_mask = ~((uint_type(1) << dropped_bits) - uint_type(1))
+    rounded = (bits + half + ((bits >> dropped_bits) & uint_type(1))) & keep_mask
+
+    # rounding could turn NaN into infinity
+    return np.where(np.isfinite(arr), rounded.view(arr.dtype), arr)
+
+
+def prepare_variable_data(state, var, var_data, significant_bits=None):
+    """
+    Scale, mask, and transpose variable data for output, and remove ghost cells.
+    """
     var_data = var_data * var.scale
 
+    if significant_bits is not None:
+        # before masking, so fill values remain intact
+        var_data = round_significant_bits(var_data, significant_bits)
+
     gridmask = var.get_mask(state.settings, state.variables)
     if gridmask is not None:
         newaxes = (slice(None),) * gridmask.ndim + (np.newaxis,) * (var_data.ndim - gridmask.ndim)
@@ -149,39 +200,115 @@ def write_variable(state, key, var, var_data, ncfile, time_step=-1):
         tmask = tuple(state.variables.tau if dim in variables.TIMESTEPS else slice(None) for dim in var.dims)
         var_data = variables.remove_ghosts(var_data, var.dims)[tmask].T
 
+    return var_data
+
+
+def write_variable(state, key, var, var_data, ncfile, time_step=-1, significant_bits=None, global_slice=None):
+    """
+    Write the local part of a variable. By default, that is the local subdomain, otherwise
+    the given ``global_slice`` of the variable (for data on a transformed grid).
+    """
+    var_data = prepare_variable_data(state, var, var_data, significant_bits)
+
     var_obj = ncfile.variables[key]
 
-    nx, ny = state.dimensions["xt"], state.dimensions["yt"]
-    chunk, _ = distributed.get_chunk_slices(nx, ny, var_obj.dimensions)
+    if global_slice is None:
+        nx, ny = state.dimensions["xt"], state.dimensions["yt"]
+        chunk, _ = distributed.get_chunk_slices(nx, ny, var_obj.dimensions)
+    else:
+        # data is transposed
+        chunk = tuple(global_slice[::-1])
+        if "Time" in var_obj.dimensions:
+            chunk = (slice(None),) + chunk
 
     if "Time" in var_obj.dimensions:
         assert var_obj.dimensions[0] == "Time"
         chunk = (time_step,) + chunk[1:]
 
-    var_obj[chunk] = var_data
+    if runtime_state.proc_num > 1:
+        # compressed datasets only support collective writes, which h5netcdf does not expose
+        _write_collective(_h5py_files[id(ncfile)][var_obj.name], chunk, var_data)
+    else:
+        var_obj[chunk] = var_data
 
 
-@contextlib.contextmanager
-def threaded_io(filepath, mode):
+def _write_collective(dataset, selection, data):
     """
-    If using IO threads, start a new thread to write the netCDF data to disk.
+    Collective write to a h5py dataset, in which all processes take part, even those
+    without any data to write.
     """
+    if np.size(data):
+        with dataset.collective:
+            dataset[selection] = data
+        return
+
+    from h5py import h5p, h5s, h5fd
+
+    # h5py skips empty writes, which would leave the other processes waiting
+    dxpl = h5p.create(h5p.DATASET_XFER)
+    dxpl.set_dxpl_mpio(h5fd.MPIO_COLLECTIVE)
+
+    file_space = dataset.id.get_space()
+    file_space.select_none()
+    mem_space = h5s.create_simple((1,))
+    mem_space.select_none()
+
+    dataset.id.write(mem_space, file_space, np.zeros(1, dtype=dataset.dtype), dxpl=dxpl)
+
+
+# underlying h5py file of every open netCDF file
+_h5py_files = {}
+
+
+def _open_file(filepath, mode):
     import h5py
     import h5netcdf
 
-    if rs.use_io_threads:
-        _wait_for_disk(filepath)
-        _io_locks[filepath].clear()
+    h5py_version = tuple(int(v) for v in h5py.__version__.split(".")[:2])
 
     kwargs = dict()
+    h5py_kwargs = dict()
 
-    if int(h5py.__version__.split(".")[0]) >= 3:
+    if h5py_version >= (3, 0):
         kwargs.update(decode_vlen_strings=True)
 
+    if h5py_version >= (3, 7):
+        # required by netCDF4-c to append to files (h5netcdf default)
+        h5py_kwargs.update(track_order=True)
+
     if runtime_state.proc_num > 1:
-        kwargs.update(driver="mpio", comm=rs.mpi_comm)
+        h5py_kwargs.update(driver="mpio", comm=rs.mpi_comm)
 
-    nc_dataset = h5netcdf.File(filepath, mode, **kwargs)
+    h5file = h5py.File(filepath, mode, **h5py_kwargs)
+
+    try:
+        ncfile = h5netcdf.File(h5file, mode, **kwargs)
+    except Exception:
+        h5file.close()
+        raise
+
+    _h5py_files[id(ncfile)] = h5file
+    return ncfile
+
+
+def _close_file(ncfile):
+    """Close a file opened by :func:`_open_file`, together with its h5py file."""
+    try:
+        ncfile.close()
+    finally:
+        _h5py_files.pop(id(ncfile)).close()
+
+
+@contextlib.contextmanager
+def threaded_io(filepath, mode):
+    """
+    If using IO threads, start a new thread to write the netCDF data to disk.
+    """
+    if rs.use_io_threads:
+        _wait_for_disk(filepath)
+        _io_locks[filepath].clear()
+
+    nc_dataset = _open_file(filepath, mode)
 
     try:
         yield nc_dataset
@@ -223,7 +350,96 @@ def _write_to_disk(ncfile, file_id):
     May run in a separate thread.
     """
     try:
-        ncfile.close()
+        _close_file(ncfile)
     finally:
         if rs.use_io_threads and file_id is not None:
             _io_locks[file_id].set()
+
+
+class OutputFile:
+    """
+    netCDF file that stays open across writes, and is flushed every
+    ``output_flush_interval`` writes.
+
+    Time steps until the next flush are allocated at once, so the time dimension is
+    only resized once per flush. Unused time steps are removed again on flush.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.ncfile = _open_file(filepath, "r+")
+        self.num_time_steps = len(self.ncfile.variables["Time"])
+        self._pending_writes = 0
+
+    def advance_time(self, time_value):
+        """Append a new time step and return its index."""
+        time_step = self.num_time_steps
+
+        if time_step >= len(self.ncfile.variables["Time"]):
+            self.ncfile.resize_dimension("Time", time_step + rs.output_flush_interval)
+
+        self.ncfile.variables["Time"][time_step] = time_value
+        self.num_time_steps += 1
+        return time_step
+
+    def finish_write(self):
+        self._pending_writes += 1
+
+        if self._pending_writes >= rs.output_flush_interval:
+            self.flush()
+
+    def flush(self):
+        if len(self.ncfile.variables["Time"]) > self.num_time_steps:
+            self.ncfile.resize_dimension("Time", self.num_time_steps)
+
+        self.ncfile.flush()
+        self._pending_writes = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            _close_file(self.ncfile)
+
+
+_output_files = {}
+
+
+def get_output_file(filepath):
+    """
+    Get open handle to an existing output file.
+    """
+    if not _output_files:
+        atexit.register(_close_output_files_at_exit)
+
+    if filepath not in _output_files:
+        _output_files[filepath] = OutputFile(filepath)
+
+    return _output_files[filepath]
+
+
+def is_output_file_open(filepath):
+    return filepath in _output_files
+
+
+def close_output_file(filepath):
+    outfile = _output_files.pop(filepath, None)
+
+    if outfile is not None:
+        outfile.close()
+
+
+def close_output_files():
+    for filepath in list(_output_files):
+        close_output_file(filepath)
+
+
+def _close_output_files_at_exit():
+    from veros.io_tools import writer
+
+    atexit.unregister(_close_output_files_at_exit)
+
+    try:
+        writer.flush()
+    finally:
+        close_output_files()
@@ -0,0 +1,91 @@
+import queue
+import atexit
+import functools
+import threading
+
+from veros import logger, runtime_settings, runtime_state
+
+
+class BackgroundWriter:
+    """Executes write jobs in a background thread, in the order they were submitted.
+
+    At most ``max_pending`` jobs wait in the queue while another one is written, so that
+    only a bounded number of output buffers is alive at any time. Submitting a job blocks
+    until there is room in the queue.
+
+    Exceptions raised by a job are re-raised in the calling thread on the next call to
+    :meth:`submit` or :meth:`flush`.
+    """
+
+    def __init__(self, max_pending=1):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="veros-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                # drop remaining jobs after an error, they are likely to fail as well
+                if self._error is None:
+                    job()
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Error in background writer") from error
+
+    def submit(self, function, *args, **kwargs):
+        self._raise_error()
+        self._queue.put(functools.partial(function, *args, **kwargs))
+
+    def flush(self):
+        """Wait until all submitted jobs are written."""
+        self._queue.join()
+        self._raise_error()
+
+
+_writer = None
+
+
+@functools.lru_cache(maxsize=None)
+def _async_supported():
+    if runtime_state.proc_num == 1:
+        return True
+
+    from mpi4py import MPI
+
+    # collective writes happen concurrently to communication in the main thread
+    if MPI.Query_thread() != MPI.THREAD_MULTIPLE:
+        logger.warning("MPI library does not support multiple threads, falling back to synchronous output")
+        return False
+
+    return True
+
+
+def submit(function, *args, **kwargs):
+    """Run ``function`` in the background writer thread if ``async_output`` is enabled,
+    otherwise call it right away."""
+    global _writer
+
+    if not runtime_settings.async_output or not _async_supported():
+        # preserve order of writes
+        flush()
+        return function(*args, **kwargs)
+
+    if _writer is None:
+        _writer = BackgroundWriter()
+        atexit.register(flush)
+
+    _writer.submit(function, *args, **kwargs)
+
+
+def flush():
+    """Wait for all pending background writes."""
+    if _writer is not None:
+        _writer.flush()
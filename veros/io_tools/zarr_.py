@@ -0,0 +1,269 @@
+import numpy as np
+
+from veros import logger, variables, distributed, runtime_state, runtime_settings as rs
+from veros.io_tools import hdf5 as h5tools, netcdf as nctools
+
+"""
+Zarr output in directory stores, following the layout of netCDF output.
+
+Every chunk is written by exactly one process, so writing data needs no collective
+calls. Only the first process creates arrays and resizes the time dimension, all other
+processes wait for it at a barrier.
+"""
+
+ZARR_SUFFIX = ".zarr"
+
+
+def is_zarr_path(path):
+    return str(path).rstrip("/").endswith(ZARR_SUFFIX)
+
+
+def _import_zarr():
+    try:
+        import zarr
+    except ImportError:
+        raise RuntimeError("Output to Zarr stores requires the zarr package") from None
+
+    return zarr
+
+
+def get_compressors(codec=None):
+    """
+    Translate a codec specification (see :func:`veros.io_tools.hdf5.get_compression_options`)
+    into Zarr codecs. Shuffling is done through Blosc.
+    """
+    from zarr.codecs import BloscCodec, GzipCodec, ZstdCodec
+
+    codec = h5tools.resolve_codec(codec)
+
+    if codec is None:
+        return None
+
+    shuffle = False
+    compressor = None
+
+    for name, level in h5tools.parse_codec(codec):
+        if name == "shuffle":
+            shuffle = True
+        elif name == "lzf":
+            raise ValueError("Compression codec lzf is not supported for Zarr output")
+        else:
+            compressor = (name, level)
+
+    if compressor is None:
+        if not shuffle:
+            return None
+
+        return [BloscCodec(cname="lz4", clevel=0, shuffle="shuffle")]
+
+    name, level = compressor
+
+    if shuffle or name == "lz4":
+        blosc_names = {"gzip": "zlib", "zstd": "zstd", "lz4": "lz4"}
+        return [
+            BloscCodec(
+                cname=blosc_names[name],
+                clevel=5 if level is None else level,
+                shuffle="shuffle" if shuffle else "noshuffle",
+            )
+        ]
+
+    if name == "gzip":
+        return [GzipCodec(level=1 if level is None else level)]
+
+    return [ZstdCodec(level=3 if level is None else level)]
+
+
+def open_group(path, mode, local=False):
+    """
+    Open the root group of a Zarr store. In mode ``"w"``, the first process creates
+    (or clears) the store and all processes open it afterwards, unless the store is
+    ``local`` to this process.
+    """
+    zarr = _import_zarr()
+
+    if mode == "w" and not local:
+        if runtime_state.proc_rank == 0:
+            zarr.open_group(path, mode="w")
+
+        distributed.barrier()
+        mode = "r+"
+
+    return zarr.open_group(path, mode=mode)
+
+
+def _get_dimensions(arr):
+    return tuple(arr.metadata.dimension_names or ())
+
+
+def initialize_file(state, group, extra_dimensions=None, create_time_dimension=True, coordinates=None):
+    """
+    Define standard grid in Zarr group (see :func:`veros.io_tools.netcdf.initialize_file`)
+    """
+    if runtime_state.proc_rank == 0:
+        group.attrs.update(nctools.get_file_attributes(state))
+
+    dimensions = dict(state.dimensions)
+    if extra_dimensions is not None:
+        dimensions.update(extra_dimensions)
+
+    dim_variables = {}
+
+    for dim in dimensions:
+        # time steps are peeled off explicitly
+        if dim in variables.TIMESTEPS:
+            continue
+
+        if coordinates is not None and dim in coordinates:
+            var, var_data = coordinates[dim]
+        elif dim in state.var_meta:
+            var = state.var_meta[dim]
+
+            # skip inactive dimensions
+            if not var.active:
+                continue
+
+            var_data = getattr(state.variables, dim)
+        else:
+            # create dummy variable for dimensions without data
+            var = variables.Variable(dim, (dim,), time_dependent=False)
+            var_data = np.arange(dimensions[dim])
+
+        dimsize = variables.get_shape(dimensions, var.dims[::-1], include_ghosts=False, local=False)[0]
+        initialize_variable(state, dim, var, group, shape=(dimsize,))
+        dim_variables[dim] = (var, var_data)
+
+    if create_time_dimension and runtime_state.proc_rank == 0:
+        time_var = group.create_array(
+            "Time", shape=(0,), chunks=(1024,), dtype="float64", fill_value=0.0, dimension_names=("Time",)
+        )
+        time_var.attrs.update(
+            long_name="Time",
+            units="days",
+            time_origin="01-JAN-1900 00:00:00",
+        )
+
+    # wait until arrays exist
+    distributed.barrier()
+
+    for dim, (var, var_data) in dim_variables.items():
+        write_variable(state, dim, var, var_data, group)
+
+
+def initialize_variable(state, key, var, group, compression=None, shape=None, chunk_sizes=None):
+    """
+    Create array for given variable. Only done by the first process, make sure to
+    synchronize before writing to it.
+
+    ``chunk_sizes`` maps dimensions that are not part of the model grid to their chunk
+    size (default: the whole dimension).
+    """
+    if runtime_state.proc_rank != 0:
+        return
+
+    if chunk_sizes is None:
+        chunk_sizes = {}
+
+    if key in group:
+        logger.warning(f"Variable {key} already initialized")
+        return
+
+    if var.dims is None:
+        dims = ()
+    else:
+        dims = tuple(d for d in var.dims if d in group or d == key)
+
+    if var.time_dependent and "Time" in group:
+        dims += ("Time",)
+
+    if shape is None:
+        shape = tuple(group[d].shape[0] for d in dims)
+
+    # chunks are aligned with the local domains
+    chunksize = [
+        variables.get_shape(state.dimensions, (d,), local=True, include_ghosts=False)[0]
+        if d in state.dimensions
+        else (1 if d == "Time" else max(min(chunk_sizes.get(d, size), size), 1))
+        for d, size in zip(dims, shape)
+    ]
+
+    dtype = var.dtype
+    if dtype is None:
+        dtype = rs.float_type
+    elif dtype == "bool":
+        dtype = "uint8"
+
+    fillvalue = variables.get_fill_value(dtype)
+
+    # transpose all dimensions (like netCDF output)
+    v = group.create_array(
+        key,
+        shape=tuple(shape[::-1]),
+        chunks=tuple(chunksize[::-1]),
+        dtype=dtype,
+        fill_value=fillvalue,
+        dimension_names=dims[::-1],
+        compressors=get_compressors(compression),
+    )
+    v.attrs.update(long_name=var.name, units=var.units, missing_value=fillvalue, **var.extra_attributes)
+
+
+def advance_time(time_value, group):
+    """
+    Append a time step to all time dependent arrays and return its index.
+    """
+    if runtime_state.proc_rank == 0:
+        time_step = group["Time"].shape[0]
+
+        for _, arr in group.arrays():
+            dims = _get_dimensions(arr)
+            if dims and dims[0] == "Time":
+                arr.resize((time_step + 1,) + arr.shape[1:])
+
+        group["Time"][time_step] = time_value
+
+    # wait until arrays are resized
+    distributed.barrier()
+
+    return group["Time"].shape[0] - 1
+
+
+def write_variable(state, key, var, var_data, group, time_step=-1, significant_bits=None, global_slice=None):
+    """
+    Write the local part of a variable (see :func:`veros.io_tools.netcdf.write_variable`).
+
+    Every chunk is written by a single process. Data on a transformed grid is sent to the
+    process that holds the first element of each chunk, so ``global_slice`` requires all
+    processes to take part.
+    """
+    var_data = nctools.prepare_variable_data(state, var, var_data, significant_bits)
+
+    arr = group[key]
+    dims = _get_dimensions(arr)
+
+    if global_slice is not None:
+        # data is transposed, time is the leading dimension
+        time_dims = 1 if "Time" in dims else 0
+        var_data, chunk = distributed.redistribute_to_chunks(
+            var_data, tuple(global_slice[::-1]), arr.shape[time_dims:], arr.chunks[time_dims:]
+        )
+
+        if not var_data.size:
+            return
+
+        chunk = (slice(None),) * time_dims + chunk
+
+    elif not distributed.is_chunk_owner(dims):
+        return
+
+    else:
+        nx, ny = state.dimensions["xt"], state.dimensions["yt"]
+        chunk, _ = distributed.get_chunk_slices(nx, ny, dims)
+
+    if "Time" in dims:
+        assert dims[0] == "Time"
+        if time_step < 0:
+            time_step += arr.shape[0]
+        chunk = (time_step,) + chunk[1:]
+
+    arr[chunk] = var_data
@@ -21,6 +21,7 @@ VEROS_TO_PYOM_VAR = dict(
     line_dir_north_mask=None,
     line_dir_west_mask=None,
     ssh=None,
+    psi_forc=None,
 )
 
 # all setting that are re-named or unique to Veros
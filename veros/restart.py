@@ -1,18 +1,73 @@
 import os
+import time
+import atexit
+import shutil
+import hashlib
+import weakref
+import functools
+import contextlib
+
+import numpy as onp
 
 from veros import logger, runtime_settings, runtime_state
-from veros.io_tools import hdf5 as h5tools
+from veros.io_tools import hdf5 as h5tools, zarr_ as zarrtools, writer
 from veros.signals import do_not_disturb
-from veros.distributed import get_chunk_slices, exchange_overlap
+from veros.distributed import (
+    barrier,
+    get_chunk_slices,
+    get_chunk_aligned_slices,
+    is_chunk_owner,
+    exchange_overlaps,
+)
 from veros.variables import get_shape
 
 
+def _memory_map(dset):
+    """Memory map of an uncompressed, contiguous HDF5 dataset, or None if that is not possible."""
+    if dset.chunks is not None or dset.external is not None or dset.is_virtual:
+        return None
+
+    offset = dset.id.get_offset()
+    if offset is None:
+        # not allocated in file
+        return None
+
+    return onp.memmap(dset.file.filename, mode="r", dtype=dset.dtype, shape=dset.shape, offset=offset)
+
+
+def _read_chunk(var, gidx, out, lidx):
+    """Read the global slice ``gidx`` of an HDF5 or Zarr dataset into ``out[lidx]``."""
+    import h5py
+
+    if not isinstance(var, h5py.Dataset):
+        out[lidx] = var[gidx]
+        return
+
+    if runtime_settings.restart_memory_map:
+        mmap = _memory_map(var)
+        if mmap is not None:
+            # only touches the pages of the local chunk
+            out[lidx] = mmap[gidx]
+            return
+
+    if runtime_state.proc_num > 1:
+        with var.collective:
+            var.read_direct(out, source_sel=gidx, dest_sel=lidx)
+    else:
+        var.read_direct(out, source_sel=gidx, dest_sel=lidx)
+
+
 def read_from_h5(dimensions, var_meta, infile, groupname, enable_cyclic_x):
-    from veros.core.operators import numpy as npx, update, at
+    from veros.core.operators import numpy as npx
 
     variables = {}
 
-    for key, var in infile[groupname].items():
+    group = infile[groupname]
+
+    # works for HDF5 and Zarr groups
+    for key in group.keys():
+        var = group[key]
+
         if not var_meta[key].dims:
             variables[key] = npx.array(var)
             continue
@@ -20,17 +75,25 @@ def read_from_h5(dimensions, var_meta, infile, groupname, enable_cyclic_x):
         local_shape = get_shape(dimensions, var_meta[key].dims, local=True, include_ghosts=True)
         gidx, lidx = get_chunk_slices(dimensions["xt"], dimensions["yt"], var_meta[key].dims, include_overlap=True)
 
+        # every process only reads the part it owns, the rest of the overlap is exchanged below
         # pass dtype as str to prevent endianness from leaking into array
-        variables[key] = npx.empty(local_shape, dtype=str(var.dtype))
-        variables[key] = update(variables[key], at[lidx], var[gidx])
-        variables[key] = exchange_overlap(variables[key], var_meta[key].dims, enable_cyclic_x)
+        local_data = onp.empty(local_shape, dtype=str(var.dtype))
+        _read_chunk(var, gidx, local_data, lidx)
+        variables[key] = npx.asarray(local_data)
+
+    # exchange overlap of all variables at once
+    scattered = [key for key in variables if var_meta[key].dims]
+    exchanged = exchange_overlaps(
+        [variables[key] for key in scattered], [tuple(var_meta[key].dims) for key in scattered], enable_cyclic_x
+    )
+    variables.update(zip(scattered, exchanged))
 
-    attributes = {key: var.item() for key, var in infile[groupname].attrs.items()}
+    attributes = {key: onp.asarray(var).item() for key, var in group.attrs.items()}
 
     return attributes, variables
 
 
-def write_to_h5(dimensions, var_meta, var_data, outfile, groupname, attributes=None):
+def write_to_h5(dimensions, var_meta, var_data, outfile, groupname, attributes=None, compression=None):
     if attributes is None:
         attributes = {}
 
@@ -56,19 +119,432 @@ def write_to_h5(dimensions, var_meta, var_data, outfile, groupname, attributes=N
                 else:
                     chunksize.append(1)
 
-            kwargs.update(chunks=tuple(chunksize))
+            compression_options = h5tools.get_compression_options(compression)
 
-            if runtime_settings.hdf5_gzip_compression and runtime_state.proc_num == 1:
-                kwargs.update(compression="gzip", compression_opts=1)
+            # compression requires chunks, uncompressed datasets are contiguous so they can be memory-mapped
+            if compression_options:
+                kwargs.update(chunks=tuple(chunksize), **compression_options)
 
-        group.require_dataset(key, global_shape, var.dtype, **kwargs)
-        group[key][gidx] = var[lidx]
+        dset = group.require_dataset(key, global_shape, var.dtype, **kwargs)
+
+        if runtime_state.proc_num > 1:
+            # compressed datasets only support collective writes
+            with dset.collective:
+                dset[gidx] = var[lidx]
+        else:
+            dset[gidx] = var[lidx]
 
     for key, val in attributes.items():
         group.attrs[key] = val
 
 
+def write_to_zarr(dimensions, var_meta, var_data, outfile, groupname, attributes=None, compression=None, shared=True):
+    """Like :func:`write_to_h5`, but every process writes the chunks it owns independently.
+
+    If ``shared`` is False, ``outfile`` is only written by this process (like a staged
+    copy of a restart), which then creates all arrays itself.
+    """
+    if attributes is None:
+        attributes = {}
+
+    var_dims = {key: tuple(var_meta[key].dims or ()) for key in var_data}
+
+    if runtime_state.proc_rank == 0 or not shared:
+        group = outfile.require_group(groupname)
+
+        for key, var in var_data.items():
+            global_shape = get_shape(dimensions, var_dims[key], local=False)
+            chunksize = [
+                get_shape(dimensions, (d,), local=True, include_ghosts=False)[0] if d in dimensions else 1
+                for d in var_dims[key]
+            ]
+            group.create_array(
+                key,
+                shape=global_shape,
+                chunks=tuple(chunksize),
+                dtype=str(var.dtype),
+                fill_value=0,
+                compressors=zarrtools.get_compressors(compression),
+            )
+
+        group.attrs.update(attributes)
+
+    if shared:
+        # wait until arrays exist
+        barrier()
+
+    group = outfile[groupname]
+
+    if runtime_state.proc_num > 1:
+        # processes also write overlap that belongs to their neighbors, so it needs to be up to date
+        scattered = [key for key in var_data if var_dims[key]]
+        exchanged = exchange_overlaps([var_data[key] for key in scattered], [var_dims[key] for key in scattered], False)
+        var_data = dict(var_data, **dict(zip(scattered, exchanged)))
+
+    for key, var in var_data.items():
+        if not is_chunk_owner(var_dims[key]):
+            continue
+
+        gidx, lidx = get_chunk_aligned_slices(dimensions["xt"], dimensions["yt"], var_dims[key])
+        group[key][gidx] = var[lidx]
+
+
+@contextlib.contextmanager
+def _open_restart_file(restart_filename, mode, threaded=True, local=False):
+    if zarrtools.is_zarr_path(restart_filename):
+        yield zarrtools.open_group(restart_filename, mode, local=local)
+    elif threaded:
+        with h5tools.threaded_io(restart_filename, mode) as restart_file:
+            yield restart_file
+    else:
+        import h5py
+
+        with h5py.File(restart_filename, mode) as restart_file:
+            yield restart_file
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_staging_unsupported():
+    # a parallel HDF5 file is written collectively, so it cannot be split into per-process copies
+    logger.warning("Staging HDF5 restarts is not supported with multiple processes (use Zarr restarts instead)")
+
+
+def _staging_supported(restart_filename):
+    if runtime_state.proc_num == 1 or zarrtools.is_zarr_path(restart_filename):
+        return True
+
+    _warn_staging_unsupported()
+    return False
+
+
+def _get_staging_path(restart_filename):
+    """Get the path of a restart in the staging area, or None if staging is disabled.
+
+    With multiple processes, every process stages the chunks it owns in a store of its own.
+    """
+    if not runtime_settings.restart_staging_dir or not _staging_supported(restart_filename):
+        return None
+
+    # restarts with the same name in different directories must not collide
+    path_hash = hashlib.sha1(os.path.abspath(restart_filename).encode()).hexdigest()[:12]
+    staging_name = f"{path_hash}.{os.path.basename(os.path.normpath(restart_filename))}"
+
+    if runtime_state.proc_num > 1:
+        staging_name = f"rank{runtime_state.proc_rank}.{staging_name}"
+
+    return os.path.join(runtime_settings.restart_staging_dir, staging_name)
+
+
+def _get_partial_path(path):
+    # keep the file extension, which determines the file format
+    head, tail = os.path.split(os.path.normpath(path))
+    return os.path.join(head, f".partial.{tail}")
+
+
+def _get_complete_marker(staging_path):
+    return f"{os.path.normpath(staging_path)}.complete"
+
+
+def _get_drained_marker_dir(restart_filename):
+    head, tail = os.path.split(os.path.normpath(restart_filename))
+    return os.path.join(head, f".drained.{tail}")
+
+
+def _remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _is_staged_copy_of(staging_path, restart_filename):
+    """Whether a complete copy of the given restart is in the staging area."""
+    marker = _get_complete_marker(staging_path)
+
+    if not os.path.exists(staging_path) or not os.path.exists(marker):
+        return False
+
+    with open(marker) as f:
+        return f.read() == os.path.abspath(restart_filename)
+
+
+def _find_restart_file(restart_filename):
+    """Prefer the staged copy of a restart, unless the one in the final location is newer.
+
+    Staged copies are only used if they are complete. With multiple processes, every staged
+    copy only contains part of the restart, so the final location is always used.
+    """
+    staging_path = _get_staging_path(restart_filename)
+
+    if staging_path is None or runtime_state.proc_num > 1:
+        return restart_filename
+
+    if not _is_staged_copy_of(staging_path, restart_filename):
+        return restart_filename
+
+    if os.path.exists(restart_filename) and os.path.getmtime(restart_filename) > os.path.getmtime(staging_path):
+        return restart_filename
+
+    return staging_path
+
+
+# Zarr files that describe the layout of a store, as opposed to chunk data
+_ZARR_METADATA_FILES = {"zarr.json", ".zarray", ".zgroup", ".zattrs", ".zmetadata"}
+
+
+def _merge_store(source, dest, include_metadata):
+    """Copy all chunks of a Zarr store into another one, which may be filled by other processes."""
+    for root, _, files in os.walk(source):
+        dest_dir = os.path.join(dest, os.path.relpath(root, source))
+        os.makedirs(dest_dir, exist_ok=True)
+
+        for filename in files:
+            if include_metadata or filename not in _ZARR_METADATA_FILES:
+                shutil.copy2(os.path.join(root, filename), os.path.join(dest_dir, filename))
+
+
+def _wait_for_drained(marker_dir):
+    """Wait until all processes copied their part of a restart, as long as they make progress."""
+    num_drained = 0
+    last_progress = time.monotonic()
+
+    while True:
+        drained = len(os.listdir(marker_dir))
+
+        if drained == runtime_state.proc_num:
+            return
+
+        if drained > num_drained:
+            num_drained, last_progress = drained, time.monotonic()
+        elif time.monotonic() - last_progress > runtime_settings.io_timeout:
+            raise RuntimeError(f"Timed out waiting for staged restarts of other processes ({marker_dir})")
+
+        time.sleep(0.1)
+
+
+# staged restarts that are copied to their final location already
+_drained_restarts = []
+
+
+def _drain_restart(staging_path, restart_filename):
+    """Copy a staged restart to its final location. Runs in a background thread."""
+    # copy under a different name first, so an interrupted copy never replaces a complete restart
+    partial_path = _get_partial_path(restart_filename)
+
+    if runtime_state.proc_num == 1:
+        _remove_path(partial_path)
+
+        # copy2 preserves modification times, used to find the most recent copy
+        if os.path.isdir(staging_path):
+            shutil.copytree(staging_path, partial_path, copy_function=shutil.copy2)
+        else:
+            shutil.copy2(staging_path, partial_path)
+    else:
+        # chunks of different processes do not overlap, metadata is the same everywhere
+        _merge_store(staging_path, partial_path, include_metadata=runtime_state.proc_rank == 0)
+
+        marker_dir = _get_drained_marker_dir(restart_filename)
+        with open(os.path.join(marker_dir, f"rank{runtime_state.proc_rank}"), "w"):
+            pass
+
+    if runtime_state.proc_rank == 0:
+        if runtime_state.proc_num > 1:
+            _wait_for_drained(marker_dir)
+
+        if os.path.isdir(restart_filename):
+            shutil.rmtree(restart_filename)
+
+        os.replace(partial_path, restart_filename)
+
+        if runtime_state.proc_num > 1:
+            _remove_path(marker_dir)
+
+    logger.debug(f"Copied staged restart {staging_path} to {restart_filename}")
+
+    # only keep the most recent restart in the staging area
+    for path in _drained_restarts:
+        if path != staging_path:
+            _remove_path(_get_complete_marker(path))
+            _remove_path(path)
+
+    _drained_restarts[:] = [staging_path]
+
+
+_restart_writer = None
+
+
+def _stage_restart(partial_path, staging_path, restart_filename):
+    global _restart_writer
+
+    if os.path.exists(staging_path):
+        # a restart with the same name may still be copied
+        flush_staged_restarts()
+        _remove_path(_get_complete_marker(staging_path))
+        _remove_path(staging_path)
+
+    if runtime_state.proc_num > 1:
+        # every process merges its part into the same location, clear leftovers of interrupted copies
+        barrier()
+
+        if runtime_state.proc_rank == 0:
+            _remove_path(_get_partial_path(restart_filename))
+            _remove_path(_get_drained_marker_dir(restart_filename))
+            os.makedirs(_get_drained_marker_dir(restart_filename))
+
+        barrier()
+
+    os.replace(partial_path, staging_path)
+
+    with open(_get_complete_marker(staging_path), "w") as f:
+        f.write(os.path.abspath(restart_filename))
+
+    if _restart_writer is None:
+        _restart_writer = writer.BackgroundWriter()
+        atexit.register(flush_staged_restarts)
+
+    _restart_writer.submit(_drain_restart, staging_path, restart_filename)
+
+
+def flush_staged_restarts():
+    """Wait until all staged restarts are copied to their final location."""
+    if _restart_writer is not None:
+        _restart_writer.flush()
+
+
+def _get_restart_groups(state):
+    """Get dimensions, metadata, and variable container of all restart groups."""
+    groups = {}
+
+    restart_vars = {var: meta for var, meta in state.var_meta.items() if meta.write_to_restart and meta.active}
+    groups["core"] = (state.dimensions, restart_vars, state.variables)
+
+    for diag_name, diagnostic in state.diagnostics.items():
+        if not diagnostic.var_meta:
+            # nothing to do
+            continue
+
+        dimensions = dict(state.dimensions)
+        if diagnostic.extra_dimensions:
+            dimensions.update(diagnostic.extra_dimensions)
+
+        restart_vars = {var: meta for var, meta in diagnostic.var_meta.items() if meta.write_to_restart and meta.active}
+        groups[diag_name] = (dimensions, restart_vars, diagnostic.variables)
+
+    return groups
+
+
+def _to_bits(arr):
+    arr = onp.asarray(arr)
+    return arr.view(f"uint{8 * arr.dtype.itemsize}")
+
+
+def encode_delta(arr, base):
+    """Bitwise difference (XOR) of two arrays. Bits that did not change are zero, which
+    compresses well."""
+    return _to_bits(arr) ^ _to_bits(base)
+
+
+def decode_delta(delta, base):
+    """Inverse of :func:`encode_delta`."""
+    return (onp.asarray(delta) ^ _to_bits(base)).view(onp.asarray(base).dtype)
+
+
+# last full restart of each model state, which is the reference of the following delta restarts
+_delta_bases = weakref.WeakKeyDictionary()
+
+
+def _read_delta_base(state, base_filename):
+    """Read the data of all restart groups from a full restart, or return None if it does not exist."""
+    if runtime_state.proc_num > 1 and _get_staging_path(base_filename) is not None:
+        # staged copies only contain part of the base, wait until it is complete in its final location
+        flush_staged_restarts()
+        barrier()
+
+    input_filename = _find_restart_file(base_filename)
+
+    if not os.path.exists(input_filename):
+        return None
+
+    base_data = {}
+
+    with _open_restart_file(input_filename, "r") as infile:
+        for groupname, (dimensions, restart_vars, _) in _get_restart_groups(state).items():
+            if groupname in infile:
+                _, base_data[groupname] = read_from_h5(
+                    dimensions, restart_vars, infile, groupname, state.settings.enable_cyclic_x
+                )
+
+    return base_data
+
+
+def _get_delta_base(state, restart_filename, restart_data):
+    """Get the file name and data of the full restart to write a delta against, or None if a
+    full restart is due."""
+    settings = state.settings
+    delta_base = _delta_bases.get(state)
+
+    if settings.restart_num_deltas <= 0 or delta_base is None:
+        return None
+
+    if delta_base["num_deltas"] >= settings.restart_num_deltas:
+        return None
+
+    # never overwrite the base
+    if os.path.abspath(delta_base["filename"]) == os.path.abspath(restart_filename):
+        return None
+
+    # read back instead of keeping a copy of the whole model state in memory
+    base_data = _read_delta_base(state, delta_base["filename"])
+
+    if base_data is None or base_data.keys() != restart_data.keys():
+        return None
+
+    for groupname, group_data in restart_data.items():
+        if base_data[groupname].keys() != group_data.keys():
+            return None
+
+        for key, var in group_data.items():
+            base_var = base_data[groupname][key]
+            if base_var.shape != var.shape or base_var.dtype != var.dtype:
+                return None
+
+    return delta_base["filename"], base_data
+
+
+def _count_nonzero_bytes(restart_data):
+    """Number of non-zero bytes in restart data, over all processes.
+
+    Zero bytes compress to almost nothing, so this is a cheap estimate of the size of a
+    restart file.
+    """
+    nonzero_bytes = sum(
+        int(onp.count_nonzero(onp.asarray(var).reshape(-1).view("uint8")))
+        for group_data in restart_data.values()
+        for var in group_data.values()
+    )
+
+    if runtime_state.proc_num > 1:
+        nonzero_bytes = runtime_settings.mpi_comm.allreduce(nonzero_bytes)
+
+    return nonzero_bytes
+
+
+def _get_delta_compression():
+    # deltas have many leading zero bits, shuffling groups them together
+    codec = h5tools.resolve_codec()
+
+    if codec is None:
+        return "none"
+
+    if "shuffle" not in codec:
+        codec = f"shuffle+{codec}"
+
+    return codec
+
+
 def read_restart(state):
+    from veros.core.operators import numpy as npx
+
     settings = state.settings
 
     if not settings.restart_input_filename:
@@ -81,48 +557,52 @@ def read_restart(state):
     statedict.update(state.settings.items())
     restart_filename = settings.restart_input_filename.format(**statedict)
 
-    if not os.path.isfile(restart_filename):
+    input_filename = _find_restart_file(restart_filename)
+
+    if not os.path.exists(input_filename):
         raise IOError(f"restart file {restart_filename} not found")
 
-    logger.info(f"Reading restart data from {restart_filename}")
+    logger.info(f"Reading restart data from {input_filename}")
+
+    with contextlib.ExitStack() as stack:
+        infile = stack.enter_context(_open_restart_file(input_filename, "r"))
+        stack.enter_context(state.variables.unlock())
 
-    with h5tools.threaded_io(restart_filename, "r") as infile, state.variables.unlock():
-        # core restart
-        restart_vars = {var: meta for var, meta in state.var_meta.items() if meta.write_to_restart and meta.active}
-        _, restart_data = read_from_h5(state.dimensions, restart_vars, infile, "core", settings.enable_cyclic_x)
+        base_file = None
+        base_filename = infile.attrs.get("delta_base")
 
-        for key in restart_vars.keys():
-            try:
-                var_data = restart_data[key]
-            except KeyError:
-                raise RuntimeError(f"No restart data found for variable {key} in {restart_filename}") from None
+        if base_filename is not None:
+            # delta restart, path to base is relative to the delta
+            base_filename = os.path.join(os.path.dirname(restart_filename), base_filename)
+            base_input_filename = _find_restart_file(base_filename)
 
-            setattr(state.variables, key, var_data)
+            if not os.path.exists(base_input_filename):
+                raise IOError(f"base restart file {base_filename} of delta restart {restart_filename} not found")
 
-        # diagnostic restarts
-        for diag_name, diagnostic in state.diagnostics.items():
-            if not diagnostic.var_meta:
-                # nothing to do
-                continue
+            logger.info(f"Reading base of delta restart from {base_input_filename}")
+            base_file = stack.enter_context(_open_restart_file(base_input_filename, "r"))
 
-            dimensions = dict(state.dimensions)
-            if diagnostic.extra_dimensions:
-                dimensions.update(diagnostic.extra_dimensions)
+        for groupname, (dimensions, restart_vars, variables) in _get_restart_groups(state).items():
+            _, restart_data = read_from_h5(dimensions, restart_vars, infile, groupname, settings.enable_cyclic_x)
 
-            restart_vars = {
-                var: meta for var, meta in diagnostic.var_meta.items() if meta.write_to_restart and meta.active
-            }
-            _, restart_data = read_from_h5(dimensions, restart_vars, infile, diag_name, settings.enable_cyclic_x)
+            if base_file is not None:
+                _, base_data = read_from_h5(dimensions, restart_vars, base_file, groupname, settings.enable_cyclic_x)
+                restart_data = {
+                    key: npx.asarray(decode_delta(delta, base_data[key]))
+                    for key, delta in restart_data.items()
+                    if key in base_data
+                }
 
             for key in restart_vars.keys():
                 try:
                     var_data = restart_data[key]
                 except KeyError:
+                    source = "" if groupname == "core" else f' (from diagnostic "{groupname}")'
                     raise RuntimeError(
-                        f'No restart data found for variable {key} in {restart_filename} (from diagnostic "{diag_name}")'
+                        f"No restart data found for variable {key} in {restart_filename}{source}"
                     ) from None
 
-                setattr(diagnostic.variables, key, var_data)
+                setattr(variables, key, var_data)
 
     return state
 
@@ -149,27 +629,75 @@ def write_restart(state, force=False):
     statedict.update(state.settings.items())
     restart_filename = settings.restart_output_filename.format(**statedict)
 
-    logger.info(f"Writing restart file {restart_filename}")
-
-    with h5tools.threaded_io(restart_filename, "w") as outfile:
-        # core restart
-        vs = state.variables
-        restart_vars = {var: meta for var, meta in state.var_meta.items() if meta.write_to_restart and meta.active}
-        restart_data = {var: getattr(vs, var) for var in restart_vars}
-        write_to_h5(state.dimensions, restart_vars, restart_data, outfile, "core")
-
-        # diagnostic restarts
-        for diag_name, diagnostic in state.diagnostics.items():
-            if not diagnostic.var_meta:
-                # nothing to do
-                continue
-
-            dimensions = dict(state.dimensions)
-            if diagnostic.extra_dimensions:
-                dimensions.update(diagnostic.extra_dimensions)
-
-            restart_vars = {
-                var: meta for var, meta in diagnostic.var_meta.items() if meta.write_to_restart and meta.active
-            }
-            restart_data = {var: getattr(diagnostic.variables, var) for var in restart_vars}
-            write_to_h5(dimensions, restart_vars, restart_data, outfile, diag_name)
+    write_group = write_to_zarr if zarrtools.is_zarr_path(restart_filename) else write_to_h5
+
+    restart_groups = _get_restart_groups(state)
+    restart_data = {
+        groupname: {key: getattr(variables, key) for key in restart_vars}
+        for groupname, (_, restart_vars, variables) in restart_groups.items()
+    }
+
+    base_filename = None
+    delta_base = _get_delta_base(state, restart_filename, restart_data)
+
+    if delta_base is not None:
+        base_filename, base_data = delta_base
+        delta_data = {
+            groupname: {key: encode_delta(var, base_data[groupname][key]) for key, var in group_data.items()}
+            for groupname, group_data in restart_data.items()
+        }
+
+        # deltas grow with the distance to their base, start over once they do not pay off
+        size_ratio = _count_nonzero_bytes(delta_data) / max(_count_nonzero_bytes(restart_data), 1)
+        if size_ratio > settings.restart_delta_max_fraction:
+            logger.debug(f"Delta restart would be {size_ratio:.0%} of the size of a full restart")
+            base_filename = None
+
+    if base_filename is None:
+        logger.info(f"Writing restart file {restart_filename}")
+    else:
+        logger.info(f"Writing delta restart file {restart_filename} (base: {base_filename})")
+
+    staging_path = _get_staging_path(restart_filename)
+
+    # with multiple processes, every process stages its own copy
+    local = staging_path is not None and runtime_state.proc_num > 1
+
+    if staging_path is None:
+        output_filename = restart_filename
+    else:
+        # written synchronously to fast storage, copied to the final location in the background
+        os.makedirs(runtime_settings.restart_staging_dir, exist_ok=True)
+        output_filename = _get_partial_path(staging_path)
+        _remove_path(output_filename)
+
+    if local:
+        write_group = functools.partial(write_to_zarr, shared=False)
+
+    with _open_restart_file(output_filename, "w", threaded=staging_path is None, local=local) as outfile:
+        if base_filename is not None:
+            base_path = os.path.relpath(base_filename, os.path.dirname(restart_filename) or ".")
+
+            if runtime_state.proc_rank == 0 or local or not zarrtools.is_zarr_path(restart_filename):
+                outfile.attrs["delta_base"] = base_path
+
+        for groupname, (dimensions, restart_vars, _) in restart_groups.items():
+            if base_filename is None:
+                write_group(dimensions, restart_vars, restart_data[groupname], outfile, groupname)
+            else:
+                write_group(
+                    dimensions,
+                    restart_vars,
+                    delta_data[groupname],
+                    outfile,
+                    groupname,
+                    compression=_get_delta_compression(),
+                )
+
+    if base_filename is not None:
+        _delta_bases[state]["num_deltas"] += 1
+    elif settings.restart_num_deltas > 0:
+        _delta_bases[state] = dict(filename=restart_filename, num_deltas=0)
+
+    if staging_path is not None:
+        _stage_restart(output_filename, staging_path, restart_filename)
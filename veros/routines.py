@@ -46,6 +46,7 @@ class RoutineStack:
 
 CURRENT_CONTEXT = threading.local()
 CURRENT_CONTEXT.is_dist_safe = True
+CURRENT_CONTEXT.is_fusing = False
 CURRENT_CONTEXT.routine_stack = RoutineStack()
 
 
@@ -114,7 +115,7 @@ def _is_method(function):
 # routine
 
 
-def veros_routine(function=None, *, dist_safe=True, local_variables=()):
+def veros_routine(function=None, *, dist_safe=True, local_variables=(), traceable=True):
     """
     .. note::
 
@@ -134,6 +135,11 @@ def veros_routine(function=None, *, dist_safe=True, local_variables=()):
             must include all variables retrieved from the state object throughout the routine (inputs
             *and* outputs).
 
+        traceable (bool): If set to False, this routine is never traced as part of a fused time step
+            (see the ``fuse_timestep`` runtime setting) and is always executed eagerly instead.
+            Use this for routines that depend on concrete values of the state, or call into libraries
+            that cannot operate on traced arrays.
+
     Example:
        >>> from veros import VerosSetup, veros_routine
        >>>
@@ -152,7 +158,9 @@ def veros_routine(function=None, *, dist_safe=True, local_variables=()):
         if narg >= num_params:
             raise TypeError("Veros routines must take at least one argument")
 
-        routine = VerosRoutine(function, state_argnum=narg, dist_safe=dist_safe, local_variables=local_variables)
+        routine = VerosRoutine(
+            function, state_argnum=narg, dist_safe=dist_safe, local_variables=local_variables, traceable=traceable
+        )
         routine = functools.wraps(function)(routine)
         return routine
 
@@ -165,7 +173,7 @@ def veros_routine(function=None, *, dist_safe=True, local_variables=()):
 class VerosRoutine:
     """Do not instantiate directly!"""
 
-    def __init__(self, function, dist_safe=True, local_variables=(), state_argnum=0):
+    def __init__(self, function, dist_safe=True, local_variables=(), state_argnum=0, traceable=True):
         if isinstance(local_variables, str):
             local_variables = (local_variables,)
 
@@ -173,6 +181,7 @@ class VerosRoutine:
         self.dist_safe = dist_safe
         self.local_variables = local_variables
         self.state_argnum = state_argnum
+        self.traceable = traceable
         self.name = _get_func_name(self.function)
 
     def __call__(self, *args, **kwargs):
@@ -185,6 +194,9 @@ class VerosRoutine:
         if not isinstance(veros_state, VerosState):
             raise TypeError(f"Argument {self.state_argnum} to this Veros routine must be a VerosState object")
 
+        if CURRENT_CONTEXT.is_fusing and not self.traceable:
+            raise NonTraceableRoutineError(f"Routine {self.name} cannot be traced")
+
         timer = veros_state.profile_timers[self.name]
 
         with ExitStack() as es:
@@ -356,6 +368,175 @@ class VerosKernel:
         return f"<{self.__class__.__name__} {self.name} at {hex(id(self))}>"
 
 
+# fused execution
+
+
+class NonTraceableRoutineError(Exception):
+    pass
+
+
+def _get_trace_errors():
+    import jax.errors
+
+    return (
+        NonTraceableRoutineError,
+        jax.errors.ConcretizationTypeError,
+        jax.errors.TracerArrayConversionError,
+        jax.errors.TracerIntegerConversionError,
+    )
+
+
+class FusedRoutineChain:
+    """Executes a sequence of Veros routines as few compiled functions as possible (JAX only).
+
+    Consecutive routines that can be traced are fused into a single jitted function. Only
+    variables that are modified by a fused segment are returned from it, and their input
+    buffers are donated to the compiled function. Routines marked as non-traceable, or that
+    fail to trace, are executed eagerly and split the chain into several fused segments.
+
+    Arguments:
+        state: The VerosState object the routines will be called with.
+        routines (Sequence[Tuple[str, VerosRoutine]]): Pairs of timer names and routines to execute.
+
+    """
+
+    def __init__(self, state, routines):
+        import jax
+
+        self.routines = tuple(routines)
+
+        variables = state.variables
+        self._fields = tuple(variables.fields())
+        self._treedef = jax.tree_util.tree_structure(variables)
+
+        # scalars are never donated so outside references (e.g. to vs.time) stay valid
+        self._scalar_idx = frozenset(i for i, var in enumerate(self._fields) if state.var_meta[var].dims is None)
+
+        self.segments = self._build_segments(state)
+
+    def _trace_routines(self, state, routines, leaves):
+        import jax
+
+        traced_variables = jax.tree_util.tree_unflatten(self._treedef, leaves)
+
+        orig_variables = state._variables
+        orig_fusing = CURRENT_CONTEXT.is_fusing
+
+        try:
+            state._variables = traced_variables
+            CURRENT_CONTEXT.is_fusing = True
+
+            for routine in routines:
+                routine(state)
+
+            return jax.tree_util.tree_leaves(state._variables)
+
+        finally:
+            state._variables = orig_variables
+            CURRENT_CONTEXT.is_fusing = orig_fusing
+
+    def _is_traceable(self, state, name, routine):
+        import jax
+
+        try:
+            jax.eval_shape(
+                functools.partial(self._trace_routines, state, (routine,)),
+                jax.tree_util.tree_leaves(state.variables),
+            )
+        except _get_trace_errors() as exc:
+            logger.debug(f"Executing {name} eagerly in fused time step ({type(exc).__name__})")
+            return False
+
+        return True
+
+    def _get_modified_leaves(self, state, routines):
+        import jax
+
+        modified_idx = []
+
+        def record_modified(leaves):
+            out = self._trace_routines(state, routines, leaves)
+            # unmodified variables are passed through as the very same tracer
+            modified_idx.extend(i for i, (old, new) in enumerate(zip(leaves, out)) if new is not old)
+            return out
+
+        jax.eval_shape(record_modified, jax.tree_util.tree_leaves(state.variables))
+        return tuple(modified_idx)
+
+    def _compile_segment(self, state, routines):
+        import jax
+
+        modified_idx = self._get_modified_leaves(state, routines)
+        donated_idx = tuple(i for i in modified_idx if i not in self._scalar_idx)
+        kept_idx = tuple(i for i in range(len(self._fields)) if i not in donated_idx)
+
+        def fused_segment(donated, kept):
+            leaves = [None] * len(self._fields)
+
+            for i, leaf in zip(donated_idx, donated):
+                leaves[i] = leaf
+
+            for i, leaf in zip(kept_idx, kept):
+                leaves[i] = leaf
+
+            out = self._trace_routines(state, routines, leaves)
+            return [out[i] for i in modified_idx]
+
+        fused_segment = jax.jit(fused_segment, donate_argnums=(0,))
+        return fused_segment, donated_idx, kept_idx, modified_idx
+
+    def _build_segments(self, state):
+        segments = []
+        fused_routines = []
+
+        def flush_fused_routines():
+            if not fused_routines:
+                return
+
+            segments.append((None, self._compile_segment(state, tuple(fused_routines))))
+            fused_routines.clear()
+
+        for name, routine in self.routines:
+            if self._is_traceable(state, name, routine):
+                fused_routines.append(routine)
+                continue
+
+            flush_fused_routines()
+            segments.append((name, routine))
+
+        flush_fused_routines()
+        return segments
+
+    def __call__(self, state):
+        import jax
+
+        for name, segment in self.segments:
+            if name is not None:
+                with state.timers[name]:
+                    segment(state)
+                continue
+
+            fused_segment, donated_idx, kept_idx, modified_idx = segment
+            leaves = jax.tree_util.tree_leaves(state.variables)
+
+            kept = [leaves[i] for i in kept_idx]
+
+            # donated buffers must not alias each other or any other argument
+            donated = []
+            seen_buffers = set(id(leaf) for leaf in kept)
+            for i in donated_idx:
+                leaf = leaves[i]
+                if id(leaf) in seen_buffers:
+                    leaf = leaf.copy()
+                seen_buffers.add(id(leaf))
+                donated.append(leaf)
+
+            out = fused_segment(donated, kept)
+
+            # by-pass validation, outputs have the same shape and dtype as the inputs
+            vars(state.variables).update((self._fields[i], leaf) for i, leaf in zip(modified_idx, out))
+
+
 def is_veros_routine(func):
     if isinstance(func, functools.partial):
         func = func.func
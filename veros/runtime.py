@@ -79,7 +79,7 @@ def set_log_all_processes(val):
 
 DEVICES = ("cpu", "gpu", "tpu")
 FLOAT_TYPES = ("float64", "float32")
-LINEAR_SOLVERS = ("scipy", "scipy_jax", "petsc", "best")
+LINEAR_SOLVERS = ("scipy", "scipy_jax", "petsc", "krylov", "multigrid", "best")
 
 
 # settings
@@ -93,6 +93,10 @@ AVAILABLE_SETTINGS = {
     "float_type": RuntimeSetting(parse_choice(FLOAT_TYPES), "float64"),
     "linear_solver": RuntimeSetting(parse_choice(LINEAR_SOLVERS), "best"),
     "petsc_options": RuntimeSetting(str, ""),
+    "solver_cache_dir": RuntimeSetting(str, ""),
+    "solver_history_size": RuntimeSetting(int, 0),
+    "solver_rtol": RuntimeSetting(float, 0.0),
+    "multigrid_correction_factor": RuntimeSetting(float, 1.8),
     "monitor_streamfunction_residual": RuntimeSetting(parse_bool, True),
     "num_proc": RuntimeSetting(parse_two_ints, (1, 1), read_from_env=False),
     "profile_mode": RuntimeSetting(parse_bool, False),
@@ -100,13 +104,20 @@ AVAILABLE_SETTINGS = {
     "mpi_comm": RuntimeSetting(check_mpi_comm, _default_mpi_comm(), read_from_env=False),
     "log_all_processes": RuntimeSetting(set_log_all_processes, False),
     "use_io_threads": RuntimeSetting(parse_bool, False),
+    "async_output": RuntimeSetting(parse_bool, False),
+    "output_flush_interval": RuntimeSetting(int, 0),
     "io_timeout": RuntimeSetting(float, 20),
+    "restart_staging_dir": RuntimeSetting(str, ""),
+    "restart_memory_map": RuntimeSetting(parse_bool, False),
     "hdf5_gzip_compression": RuntimeSetting(parse_bool, True),
+    "hdf5_compression": RuntimeSetting(str, "gzip:1"),
     "force_overwrite": RuntimeSetting(parse_bool, False),
     "diskless_mode": RuntimeSetting(parse_bool, False),
     "pyom_compatibility_mode": RuntimeSetting(parse_bool, False),
     "setup_file": RuntimeSetting(str, None, read_from_env=False),
     "use_special_tdma": RuntimeSetting(parse_bool, None),
+    "fuse_timestep": RuntimeSetting(parse_bool, False),
+    "inplace_updates": RuntimeSetting(parse_bool, False),
 }
 
 
@@ -137,6 +137,18 @@ SETTINGS = {
         "File name of restart output. May contain Python format syntax that is substituted with Veros attributes.",
     ),
     "restart_frequency": Setting(0, float, "Frequency (in seconds) to write restart data"),
+    "restart_num_deltas": Setting(
+        0,
+        int,
+        "Number of delta restarts written between two full restarts. Delta restarts only contain the difference "
+        "to the previous full restart, which has to be kept. If 0, only full restarts are written.",
+    ),
+    "restart_delta_max_fraction": Setting(
+        0.5,
+        float,
+        "Write a full restart instead of a delta restart if the delta would be larger than this fraction of a "
+        "full restart (estimated from the number of non-zero bytes).",
+    ),
     # New
     "kappaH_min": Setting(0.0, float, "minimum value for vertical diffusivity"),
     "enable_kappaH_profile": Setting(
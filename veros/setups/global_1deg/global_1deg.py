@@ -1,9 +1,10 @@
 import os
 import h5netcdf
 
-from veros import VerosSetup, tools, time, veros_routine, veros_kernel, KernelOutput
+from veros import VerosSetup, tools, time, distributed, veros_routine, veros_kernel, KernelOutput
 from veros.variables import Variable, allocate
 from veros.core.operators import numpy as npx, update, update_multiply, at
+from veros.core.utilities import enforce_boundaries_batched
 
 BASE_PATH = os.path.dirname(os.path.realpath(__file__))
 DATA_FILES = tools.get_assets("global_1deg", os.path.join(BASE_PATH, "assets.json"))
@@ -98,12 +99,22 @@ class GlobalOneDegreeSetup(VerosSetup):
             tauy=Variable("tauy", ("xt", "yt", "nmonths"), "", "", time_dependent=False),
         )
 
-    def _read_forcing(self, var):
+    def _read_forcing(self, var, window=None):
+        """Read forcing variable, optionally only the given horizontal window (x, y)"""
         from veros.core.operators import numpy as npx
 
         with h5netcdf.File(DATA_FILES["forcing"], "r") as infile:
             var = infile.variables[var]
-            return npx.asarray(var).T
+
+            if window is None:
+                return npx.asarray(var).T
+
+            return npx.asarray(var[(Ellipsis,) + tuple(window[::-1])]).T
+
+    def _get_local_window(self, state):
+        """Horizontal slice of the global grid that belongs to this process"""
+        window, _ = distributed.get_chunk_slices(state.dimensions["xt"], state.dimensions["yt"], ("xt", "yt"))
+        return window
 
     @veros_routine
     def set_grid(self, state):
@@ -122,15 +133,17 @@ class GlobalOneDegreeSetup(VerosSetup):
             vs.coriolis_t, at[...], 2 * settings.omega * npx.sin(vs.yt[npx.newaxis, :] / 180.0 * settings.pi)
         )
 
-    @veros_routine(dist_safe=False, local_variables=["kbot"])
+    @veros_routine
     def set_topography(self, state):
         import numpy as onp
 
         vs = state.variables
         settings = state.settings
 
-        bathymetry_data = self._read_forcing("bathymetry")
-        salt_data = self._read_forcing("salinity")[:, :, ::-1]
+        # every process only reads its own part of the input data
+        window = self._get_local_window(state)
+        bathymetry_data = self._read_forcing("bathymetry", window)
+        salt_data = self._read_forcing("salinity", window)[:, :, ::-1]
 
         mask_salt = salt_data == 0.0
         vs.kbot = update(vs.kbot, at[2:-2, 2:-2], 1 + npx.sum(mask_salt.astype("int"), axis=2))
@@ -141,6 +154,7 @@ class GlobalOneDegreeSetup(VerosSetup):
 
         # close some channels
         i, j = onp.indices((settings.nx, settings.ny))
+        i, j = i[window], j[window]
 
         mask_channel = (i >= 207) & (i < 214) & (j < 5)  # i = 208,214; j = 1,5
         vs.kbot = update_multiply(vs.kbot, at[2:-2, 2:-2], ~mask_channel)
@@ -153,28 +167,7 @@ class GlobalOneDegreeSetup(VerosSetup):
         mask_channel = (i >= 269) & (i < 271) & (j == 130)  # i = 270,271; j = 131
         vs.kbot = update_multiply(vs.kbot, at[2:-2, 2:-2], ~mask_channel)
 
-    @veros_routine(
-        dist_safe=False,
-        local_variables=[
-            "t_star",
-            "s_star",
-            "qnec",
-            "qnet",
-            "qsol",
-            "divpen_shortwave",
-            "taux",
-            "tauy",
-            "temp",
-            "salt",
-            "forc_iw_bottom",
-            "forc_iw_surface",
-            "kbot",
-            "maskT",
-            "maskW",
-            "zw",
-            "dzt",
-        ],
-    )
+    @veros_routine
     def set_initial_conditions(self, state):
         vs = state.variables
         settings = state.settings
@@ -183,48 +176,60 @@ class GlobalOneDegreeSetup(VerosSetup):
         efold1_shortwave = 0.35
         efold2_shortwave = 23.0
 
+        window = self._get_local_window(state)
+
         # initial conditions
-        temp_data = self._read_forcing("temperature")
+        temp_data = self._read_forcing("temperature", window)
         vs.temp = update(vs.temp, at[2:-2, 2:-2, :, 0], temp_data[..., ::-1] * vs.maskT[2:-2, 2:-2, :])
         vs.temp = update(vs.temp, at[2:-2, 2:-2, :, 1], temp_data[..., ::-1] * vs.maskT[2:-2, 2:-2, :])
 
-        salt_data = self._read_forcing("salinity")
+        salt_data = self._read_forcing("salinity", window)
         vs.salt = update(vs.salt, at[2:-2, 2:-2, :, 0], salt_data[..., ::-1] * vs.maskT[2:-2, 2:-2, :])
         vs.salt = update(vs.salt, at[2:-2, 2:-2, :, 1], salt_data[..., ::-1] * vs.maskT[2:-2, 2:-2, :])
 
         # wind stress on MIT grid
-        vs.taux = update(vs.taux, at[2:-2, 2:-2, :], self._read_forcing("tau_x"))
-        vs.tauy = update(vs.tauy, at[2:-2, 2:-2, :], self._read_forcing("tau_y"))
+        vs.taux = update(vs.taux, at[2:-2, 2:-2, :], self._read_forcing("tau_x", window))
+        vs.tauy = update(vs.tauy, at[2:-2, 2:-2, :], self._read_forcing("tau_y", window))
 
-        qnet_data = self._read_forcing("q_net")
+        qnet_data = self._read_forcing("q_net", window)
         vs.qnet = update(vs.qnet, at[2:-2, 2:-2, :], -qnet_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
-        qnec_data = self._read_forcing("dqdt")
+        qnec_data = self._read_forcing("dqdt", window)
         vs.qnec = update(vs.qnec, at[2:-2, 2:-2, :], qnec_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
-        qsol_data = self._read_forcing("swf")
+        qsol_data = self._read_forcing("swf", window)
         vs.qsol = update(vs.qsol, at[2:-2, 2:-2, :], -qsol_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         # SST and SSS
-        sst_data = self._read_forcing("sst")
+        sst_data = self._read_forcing("sst", window)
         vs.t_star = update(vs.t_star, at[2:-2, 2:-2, :], sst_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
-        sss_data = self._read_forcing("sss")
+        sss_data = self._read_forcing("sss", window)
         vs.s_star = update(vs.s_star, at[2:-2, 2:-2, :], sss_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         if settings.enable_idemix:
-            tidal_energy_data = self._read_forcing("tidal_energy")
+            tidal_energy_data = self._read_forcing("tidal_energy", window)
             mask = (
                 npx.maximum(0, vs.kbot[2:-2, 2:-2] - 1)[:, :, npx.newaxis]
                 == npx.arange(settings.nz)[npx.newaxis, npx.newaxis, :]
             )
-            tidal_energy_data *= vs.maskW[2:-2, 2:-2, :][mask].reshape(settings.nx, settings.ny) / settings.rho_0
+            tidal_energy_data *= vs.maskW[2:-2, 2:-2, :][mask].reshape(tidal_energy_data.shape) / settings.rho_0
             vs.forc_iw_bottom = update(vs.forc_iw_bottom, at[2:-2, 2:-2], tidal_energy_data)
 
-            wind_energy_data = self._read_forcing("wind_energy")
+            wind_energy_data = self._read_forcing("wind_energy", window)
             wind_energy_data *= vs.maskW[2:-2, 2:-2, -1] / settings.rho_0 * 0.2
             vs.forc_iw_surface = update(vs.forc_iw_surface, at[2:-2, 2:-2], wind_energy_data)
 
+        # fill overlap with neighboring subdomains; like before, ghost cells
+        # at the global boundary are left untouched
+        forcing_vars = ["taux", "tauy", "qnet", "qnec", "qsol", "t_star", "s_star"]
+        if settings.enable_idemix:
+            forcing_vars += ["forc_iw_bottom", "forc_iw_surface"]
+
+        exchanged = enforce_boundaries_batched([getattr(vs, var) for var in forcing_vars], False)
+        for var, arr in zip(forcing_vars, exchanged):
+            setattr(vs, var, arr)
+
         """
         Initialize penetration profile for solar radiation and store divergence in divpen
         note that pen is set to 0.0 at the surface instead of 1.0 to compensate for the
@@ -236,23 +236,27 @@ class GlobalFlexibleResolutionSetup(VerosSetup):
         xt_forc = xt_forc[data_subset[0]]
         yt_forc = yt_forc[data_subset[1]]
 
+        # interpolation weights are shared by all fields on the same grid
+        t_regridder = veros.tools.Regridder((xt_forc, yt_forc, zt_forc), t_grid)
+
         # initial conditions
         temp_raw = self._get_data("temperature", idx=data_subset)[..., ::-1]
-        temp_data = veros.tools.interpolate((xt_forc, yt_forc, zt_forc), temp_raw, t_grid)
+        temp_data = t_regridder(temp_raw)
         vs.temp = update(vs.temp, at[2:-2, 2:-2, :, :], (temp_data * vs.maskT[2:-2, 2:-2, :])[..., npx.newaxis])
 
         salt_raw = self._get_data("salinity", idx=data_subset)[..., ::-1]
-        salt_data = veros.tools.interpolate((xt_forc, yt_forc, zt_forc), salt_raw, t_grid)
+        salt_data = t_regridder(salt_raw)
         vs.salt = update(vs.salt, at[2:-2, 2:-2, :, :], (salt_data * vs.maskT[2:-2, 2:-2, :])[..., npx.newaxis])
 
         # wind stress on MIT grid
         time_grid = (vs.xt[2:-2], vs.yt[2:-2], npx.arange(12))
+        time_regridder = veros.tools.Regridder((xt_forc, yt_forc, npx.arange(12)), time_grid)
         taux_raw = self._get_data("tau_x", idx=data_subset)
-        taux_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), taux_raw, time_grid)
+        taux_data = time_regridder(taux_raw)
         vs.taux = update(vs.taux, at[2:-2, 2:-2, :], taux_data)
 
         tauy_raw = self._get_data("tau_y", idx=data_subset)
-        tauy_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), tauy_raw, time_grid)
+        tauy_data = time_regridder(tauy_raw)
         vs.tauy = update(vs.tauy, at[2:-2, 2:-2, :], tauy_data)
 
         vs.taux = enforce_boundaries(vs.taux, settings.enable_cyclic_x)
@@ -260,24 +264,24 @@ class GlobalFlexibleResolutionSetup(VerosSetup):
 
         # Qnet and dQ/dT and Qsol
         qnet_raw = self._get_data("q_net", idx=data_subset)
-        qnet_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), qnet_raw, time_grid)
+        qnet_data = time_regridder(qnet_raw)
         vs.qnet = update(vs.qnet, at[2:-2, 2:-2, :], -qnet_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         qnec_raw = self._get_data("dqdt", idx=data_subset)
-        qnec_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), qnec_raw, time_grid)
+        qnec_data = time_regridder(qnec_raw)
         vs.qnec = update(vs.qnec, at[2:-2, 2:-2, :], qnec_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         qsol_raw = self._get_data("swf", idx=data_subset)
-        qsol_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), qsol_raw, time_grid)
+        qsol_data = time_regridder(qsol_raw)
         vs.qsol = update(vs.qsol, at[2:-2, 2:-2, :], -qsol_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         # SST and SSS
         sst_raw = self._get_data("sst", idx=data_subset)
-        sst_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), sst_raw, time_grid)
+        sst_data = time_regridder(sst_raw)
         vs.t_star = update(vs.t_star, at[2:-2, 2:-2, :], sst_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         sss_raw = self._get_data("sss", idx=data_subset)
-        sss_data = veros.tools.interpolate((xt_forc, yt_forc, npx.arange(12)), sss_raw, time_grid)
+        sss_data = time_regridder(sss_raw)
         vs.s_star = update(vs.s_star, at[2:-2, 2:-2, :], sss_data * vs.maskT[2:-2, 2:-2, -1, npx.newaxis])
 
         if settings.enable_idemix:
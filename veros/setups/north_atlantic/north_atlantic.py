@@ -7,9 +7,10 @@ from PIL import Image
 import scipy.spatial
 import scipy.ndimage
 
-from veros import VerosSetup, veros_routine, veros_kernel, KernelOutput
+from veros import VerosSetup, veros_routine, veros_kernel, KernelOutput, distributed
 from veros.variables import Variable
 from veros.core.operators import numpy as npx, update, at
+from veros.core.utilities import enforce_boundaries_batched
 import veros.tools
 
 BASE_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -17,6 +18,92 @@ DATA_FILES = veros.tools.get_assets("north_atlantic", os.path.join(BASE_PATH, "a
 TOPO_MASK_FILE = os.path.join(BASE_PATH, "topo_mask.png")
 
 
+#: Initial number of grid cells around each subdomain that are searched for valid values to fill holes
+FILL_HALO = 8
+
+
+def _fill_holes_in_window(data, ndim, crop, open_edges):
+    """Replace NaN values by the nearest finite value along the first ``ndim`` axes (as
+    :func:`veros.tools.fill_holes`), for data in a window of the global grid.
+
+    Returns None if the nearest finite value of any cell in ``crop`` could lie outside of
+    the window. ``open_edges`` tells for the first two axes whether the window ends before
+    the lower and upper boundary of the global grid.
+    """
+    import numpy as onp
+
+    data = onp.array(data)
+    records = data.reshape(data.shape[:ndim] + (-1,))
+
+    # cells outside of the window are at least this far away
+    reach = onp.full(data.shape[:ndim], onp.inf)
+    for axis, (open_lower, open_upper) in enumerate(open_edges):
+        index = onp.arange(data.shape[axis]).reshape((-1,) + (1,) * (ndim - axis - 1))
+        if open_lower:
+            reach = onp.minimum(reach, index + 1)
+        if open_upper:
+            reach = onp.minimum(reach, data.shape[axis] - index)
+
+    for record in range(records.shape[-1]):
+        invalid = onp.isnan(records[..., record])
+
+        if not invalid.any():
+            continue
+
+        if invalid.all():
+            if onp.isfinite(reach).any():
+                return None
+            continue
+
+        distance, nearest_valid = scipy.ndimage.distance_transform_edt(invalid, return_indices=True)
+
+        if onp.any(distance[crop] >= reach[crop]):
+            return None
+
+        records[..., record] = records[..., record][tuple(nearest_valid)]
+
+    return data
+
+
+def _interpolate_local(read_window, coords, interp_coords, local_slice, missing_value=None):
+    """Interpolate input data to the local subdomain, with the same result as interpolating
+    to the global grid with :func:`veros.tools.interpolate`.
+
+    Arguments:
+       read_window: Callable that reads the input data in the given (x, y) window.
+       coords: Coordinates of the input grid.
+       interp_coords: Coordinates of the global model grid (horizontal coordinates without
+          ghost cells).
+       local_slice: Part of the horizontal model grid that belongs to this process.
+
+    Only the input data around the subdomain is read. Holes are filled on the subdomain
+    and a halo around it, which is extended until it contains the nearest valid value of
+    every cell.
+    """
+    halo = FILL_HALO
+
+    while True:
+        extended = tuple(
+            slice(max(s.start - halo, 0), min(s.stop + halo, c.size)) for s, c in zip(local_slice, interp_coords)
+        )
+        extended_coords = tuple(c[e] for c, e in zip(interp_coords, extended)) + tuple(interp_coords[2:])
+
+        window = veros.tools.get_interpolation_window(coords[:2], extended_coords[:2])
+        window_coords = tuple(c[w] for c, w in zip(coords, window)) + tuple(coords[2:])
+
+        regridder = veros.tools.Regridder(window_coords, extended_coords)
+        var = regridder(read_window(window), missing_value=missing_value, fill=False)
+
+        crop = tuple(slice(s.start - e.start, s.stop - e.start) for s, e in zip(local_slice, extended))
+        open_edges = tuple((e.start > 0, e.stop < c.size) for e, c in zip(extended, interp_coords))
+        var = _fill_holes_in_window(var, len(interp_coords), crop, open_edges)
+
+        if var is not None:
+            return npx.asarray(var[crop])
+
+        halo *= 2
+
+
 class NorthAtlanticSetup(VerosSetup):
     """A regional model of the North Atlantic, inspired by `Smith et al., 2000`_.
 
@@ -122,7 +209,7 @@ class NorthAtlanticSetup(VerosSetup):
             vs.coriolis_t, at[...], 2 * settings.omega * npx.sin(vs.yt[npx.newaxis, :] / 180.0 * settings.pi)
         )
 
-    @veros_routine(dist_safe=False, local_variables=["kbot", "xt", "yt", "zt"])
+    @veros_routine
     def set_topography(self, state):
         import numpy as onp
 
@@ -130,13 +217,19 @@ class NorthAtlanticSetup(VerosSetup):
         settings = state.settings
 
         with h5netcdf.File(DATA_FILES["topography"], "r") as topo_file:
-            topo_x, topo_y, topo_bottom_depth = (self._get_data(topo_file, k) for k in ("x", "y", "z"))
+            topo_x, topo_y = (self._get_data(topo_file, k) for k in ("x", "y"))
+
+            # every process reads its own subdomain, plus the reach of the smoothing kernel
+            sigma = (len(topo_x) / settings.nx, len(topo_y) / settings.ny)
+            window = veros.tools.get_interpolation_window(
+                (topo_x, topo_y), (vs.xt[2:-2], vs.yt[2:-2]), margin=tuple(int(4 * s + 0.5) + 1 for s in sigma)
+            )
+            topo_bottom_depth = self._get_data(topo_file, "z", window)
 
-        topo_mask = npx.flipud(npx.asarray(Image.open(TOPO_MASK_FILE))).T
+        topo_x, topo_y = topo_x[window[0]], topo_y[window[1]]
+        topo_mask = npx.flipud(npx.asarray(Image.open(TOPO_MASK_FILE))).T[window]
         topo_bottom_depth = npx.where(topo_mask, 0, topo_bottom_depth)
-        topo_bottom_depth = scipy.ndimage.gaussian_filter(
-            topo_bottom_depth, sigma=(len(topo_x) / settings.nx, len(topo_y) / settings.ny)
-        )
+        topo_bottom_depth = scipy.ndimage.gaussian_filter(topo_bottom_depth, sigma=sigma)
         interp_coords = npx.meshgrid(vs.xt[2:-2], vs.yt[2:-2], indexing="ij")
         interp_coords = npx.rollaxis(npx.asarray(interp_coords), 0, 3)
         z_interp = scipy.interpolate.interpn(
@@ -158,95 +251,68 @@ class NorthAtlanticSetup(VerosSetup):
         )
         vs.kbot = npx.where(vs.kbot < settings.nz, vs.kbot, 0)
 
-    def _get_data(self, f, var):
-        """Retrieve variable from h5netcdf file"""
+    def _get_data(self, f, var, window=None):
+        """Retrieve variable from h5netcdf file, optionally only the given horizontal window (x, y)"""
         var_obj = f.variables[var]
-        return npx.array(var_obj).T
-
-    @veros_routine(
-        dist_safe=False,
-        local_variables=[
-            "tau",
-            "xt",
-            "yt",
-            "zt",
-            "temp",
-            "maskT",
-            "salt",
-            "taux",
-            "tauy",
-            "sst_clim",
-            "sss_clim",
-            "sst_rest",
-            "sss_rest",
-            "t_star",
-            "s_star",
-            "rest_tscl",
-        ],
-    )
+
+        if window is None:
+            return npx.array(var_obj).T
+
+        return npx.array(var_obj[(Ellipsis,) + tuple(window[::-1])]).T
+
+    @veros_routine
     def set_initial_conditions(self, state):
         vs = state.variables
+        settings = state.settings
 
-        with h5netcdf.File(DATA_FILES["forcing"], "r") as forcing_file:
-            t_hor = (vs.xt[2:-2], vs.yt[2:-2])
-            t_grid = (vs.xt[2:-2], vs.yt[2:-2], vs.zt)
+        # global grid coordinates, every process only reads and interpolates input data around its own subdomain
+        local_slice, _ = distributed.get_chunk_slices(settings.nx, settings.ny, ("xt", "yt"))
+        t_hor = tuple(
+            distributed.allgather_pieces(coords[2:-2], (s,), (n,))
+            for coords, s, n in zip((vs.xt, vs.yt), local_slice, (settings.nx, settings.ny))
+        )
+        t_grid = t_hor + (vs.zt,)
 
+        def interpolate(infile, key, coords, interp_coords, index=Ellipsis, missing_value=None):
+            def read_window(window):
+                return self._get_data(infile, key, window)[index]
+
+            return _interpolate_local(read_window, coords, interp_coords, local_slice, missing_value=missing_value)
+
+        # input data is stored upside down
+        flip_z = (Ellipsis, slice(None, None, -1))
+
+        with h5netcdf.File(DATA_FILES["forcing"], "r") as forcing_file:
             forc_coords = [self._get_data(forcing_file, k) for k in ("xt", "yt", "zt")]
             forc_coords[0] = forc_coords[0] - 360
             forc_coords[2] = -0.01 * forc_coords[2][::-1]
 
-            temp_raw = self._get_data(forcing_file, "temp_ic")[..., ::-1]
-            temp = veros.tools.interpolate(forc_coords, temp_raw, t_grid, missing_value=-1e20)
+            temp = interpolate(forcing_file, "temp_ic", forc_coords, t_grid, index=flip_z, missing_value=-1e20)
             vs.temp = update(vs.temp, at[2:-2, 2:-2, :, vs.tau], vs.maskT[2:-2, 2:-2, :] * temp)
 
-            salt_raw = self._get_data(forcing_file, "salt_ic")[..., ::-1]
-            salt = 35.0 + 1000 * veros.tools.interpolate(forc_coords, salt_raw, t_grid, missing_value=-1e20)
+            salt = 35.0 + 1000 * interpolate(
+                forcing_file, "salt_ic", forc_coords, t_grid, index=flip_z, missing_value=-1e20
+            )
             vs.salt = update(vs.salt, at[2:-2, 2:-2, :, vs.tau], vs.maskT[2:-2, 2:-2, :] * salt)
 
             forc_u_coords_hor = [self._get_data(forcing_file, k) for k in ("xu", "yu")]
             forc_u_coords_hor[0] = forc_u_coords_hor[0] - 360
 
-            taux = self._get_data(forcing_file, "taux")
-            tauy = self._get_data(forcing_file, "tauy")
-            for k in range(12):
-                vs.taux = update(
-                    vs.taux,
-                    at[2:-2, 2:-2, k],
-                    (veros.tools.interpolate(forc_u_coords_hor, taux[..., k], t_hor, missing_value=-1e20) / 10.0),
-                )
-                vs.tauy = update(
-                    vs.tauy,
-                    at[2:-2, 2:-2, k],
-                    (veros.tools.interpolate(forc_u_coords_hor, tauy[..., k], t_hor, missing_value=-1e20) / 10.0),
-                )
+            for key in ("taux", "tauy"):
+                tau = interpolate(forcing_file, key, forc_u_coords_hor, t_hor, missing_value=-1e20)
+                setattr(vs, key, update(getattr(vs, key), at[2:-2, 2:-2, :], tau / 10.0))
 
             # heat flux and salinity restoring
 
             sst_clim, sss_clim, sst_rest, sss_rest = [
-                forcing_file.variables[k][...].T for k in ("sst_clim", "sss_clim", "sst_rest", "sss_rest")
+                interpolate(forcing_file, k, forc_coords[:-1], t_hor, missing_value=-1e20)
+                for k in ("sst_clim", "sss_clim", "sst_rest", "sss_rest")
             ]
 
-        for k in range(12):
-            vs.sst_clim = update(
-                vs.sst_clim,
-                at[2:-2, 2:-2, k],
-                veros.tools.interpolate(forc_coords[:-1], sst_clim[..., k], t_hor, missing_value=-1e20),
-            )
-            vs.sss_clim = update(
-                vs.sss_clim,
-                at[2:-2, 2:-2, k],
-                (veros.tools.interpolate(forc_coords[:-1], sss_clim[..., k], t_hor, missing_value=-1e20) * 1000 + 35),
-            )
-            vs.sst_rest = update(
-                vs.sst_rest,
-                at[2:-2, 2:-2, k],
-                (veros.tools.interpolate(forc_coords[:-1], sst_rest[..., k], t_hor, missing_value=-1e20) * 41868.0),
-            )
-            vs.sss_rest = update(
-                vs.sss_rest,
-                at[2:-2, 2:-2, k],
-                (veros.tools.interpolate(forc_coords[:-1], sss_rest[..., k], t_hor, missing_value=-1e20) / 100.0),
-            )
+        vs.sst_clim = update(vs.sst_clim, at[2:-2, 2:-2, :], sst_clim)
+        vs.sss_clim = update(vs.sss_clim, at[2:-2, 2:-2, :], sss_clim * 1000 + 35)
+        vs.sst_rest = update(vs.sst_rest, at[2:-2, 2:-2, :], sst_rest * 41868.0)
+        vs.sss_rest = update(vs.sss_rest, at[2:-2, 2:-2, :], sss_rest / 100.0)
 
         with h5netcdf.File(DATA_FILES["restoring"], "r") as restoring_file:
             rest_coords = [self._get_data(restoring_file, k) for k in ("xt", "yt", "zt")]
@@ -254,25 +320,35 @@ class NorthAtlanticSetup(VerosSetup):
 
             # sponge layers
 
-            vs.rest_tscl = update(
-                vs.rest_tscl,
-                at[2:-2, 2:-2, :],
-                veros.tools.interpolate(rest_coords, self._get_data(restoring_file, "tscl")[..., 0], t_grid),
+            rest_tscl = interpolate(restoring_file, "tscl", rest_coords, t_grid, index=(Ellipsis, 0))
+            vs.rest_tscl = update(vs.rest_tscl, at[2:-2, 2:-2, :], rest_tscl)
+
+            vs.t_star = update(
+                vs.t_star,
+                at[2:-2, 2:-2, :, :],
+                interpolate(restoring_file, "t_star", rest_coords, t_grid, missing_value=0.0),
+            )
+            vs.s_star = update(
+                vs.s_star,
+                at[2:-2, 2:-2, :, :],
+                interpolate(restoring_file, "s_star", rest_coords, t_grid, missing_value=0.0),
             )
 
-            t_star = self._get_data(restoring_file, "t_star")
-            s_star = self._get_data(restoring_file, "s_star")
-            for k in range(12):
-                vs.t_star = update(
-                    vs.t_star,
-                    at[2:-2, 2:-2, :, k],
-                    veros.tools.interpolate(rest_coords, t_star[..., k], t_grid, missing_value=0.0),
-                )
-                vs.s_star = update(
-                    vs.s_star,
-                    at[2:-2, 2:-2, :, k],
-                    veros.tools.interpolate(rest_coords, s_star[..., k], t_grid, missing_value=0.0),
-                )
+        # fill overlap with neighboring subdomains
+        forcing_vars = (
+            "taux",
+            "tauy",
+            "sst_clim",
+            "sss_clim",
+            "sst_rest",
+            "sss_rest",
+            "t_star",
+            "s_star",
+            "rest_tscl",
+        )
+        exchanged = enforce_boundaries_batched([getattr(vs, var) for var in forcing_vars], settings.enable_cyclic_x)
+        for var, arr in zip(forcing_vars, exchanged):
+            setattr(vs, var, arr)
 
     @veros_routine
     def set_forcing(self, state):
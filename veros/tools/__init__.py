@@ -1,6 +1,7 @@
 from veros.tools.assets import get_assets  # noqa: F401
 from veros.tools.setup import (  # noqa: F401
     interpolate,
+    get_interpolation_window,
     fill_holes,
     get_periodic_interval,
     make_cyclic,
@@ -9,3 +10,5 @@ from veros.tools.setup import (  # noqa: F401
     get_stretched_grid_steps,
     get_vinokur_grid_steps,
 )
+from veros.tools.regrid import Regridder  # noqa: F401
+from veros.tools.forcing import ForcingStream  # noqa: F401
@@ -0,0 +1,233 @@
+import concurrent.futures
+
+import numpy as onp
+
+from veros import distributed, logger, time
+from veros.distributed import SCATTERED_DIMENSIONS
+from veros.core.operators import numpy as npx, update, at
+from veros.core.utilities import enforce_boundaries
+
+
+def _open_dataset(path):
+    if str(path).rstrip("/").endswith(".zarr"):
+        import zarr
+
+        return zarr.open_group(path, mode="r"), None
+
+    import h5py
+
+    handle = h5py.File(path, "r")
+    return handle, handle
+
+
+class ForcingStream:
+    """Forcing time series on the model grid that is read from disk while the model runs.
+
+    Only the two records that bracket the current model time are kept in memory, and
+    every process reads only its own subdomain. The following record is read in a
+    background thread while the model keeps stepping.
+
+    The data variable is expected in netCDF order, i.e., with time as first dimension and
+    the model dimensions reversed (e.g. ``(time, yt, xt)``), without ghost cells. netCDF,
+    HDF5, and Zarr (paths ending on ``.zarr``) files are supported.
+
+    Arguments:
+       state: Veros state object.
+       path (str): Path to input file.
+       variable (str): Name of the data variable.
+       dims (tuple): Model dimensions of the data variable.
+       times (:obj:`ndarray`, optional): Model time of each record in seconds. Defaults to
+          the values of ``time_variable`` (given in ``time_unit``).
+       time_variable (str, optional): Name of the time variable in the file.
+       time_unit (str, optional): Unit of the time variable (see :mod:`veros.time`).
+       time_offset (float, optional): Model time (in seconds) at time 0 of the input file.
+       cycle_length (float, optional): Treat records as periodic with this period in
+          seconds (e.g. for climatologies). Otherwise, the first and last records are
+          used before and after the covered time span.
+       prefetch (bool, optional): Whether to read the next record in the background.
+
+    Example:
+       >>> from veros.tools import ForcingStream
+       >>> @veros_routine
+       ... def set_initial_conditions(self, state):
+       ...     self._taux = ForcingStream(state, "era5_6h.nc", "taux", time_unit="hours")
+       >>> @veros_routine
+       ... def set_forcing(self, state):
+       ...     vs = state.variables
+       ...     vs.surface_taux = self._taux.get(vs.time) * vs.maskU[:, :, -1]
+
+    """
+
+    def __init__(
+        self,
+        state,
+        path,
+        variable,
+        dims=("xt", "yt"),
+        times=None,
+        time_variable="time",
+        time_unit="seconds",
+        time_offset=0.0,
+        cycle_length=None,
+        prefetch=True,
+    ):
+        self.path = path
+        self.variable = variable
+        self.dims = tuple(dims)
+        self.cycle_length = cycle_length
+        self.enable_cyclic_x = state.settings.enable_cyclic_x
+
+        self._dataset, self._handle = _open_dataset(path)
+        self._data = self._dataset[variable]
+
+        if times is None:
+            times = time.convert_time(
+                onp.asarray(self._dataset[time_variable][...], dtype="float64"), time_unit, "seconds"
+            )
+
+        self.times = onp.asarray(times, dtype="float64") + time_offset
+
+        if self.times.ndim != 1 or self.times.size != self._data.shape[0]:
+            raise ValueError(f"Number of record times does not match the records of variable {variable}")
+
+        if onp.any(onp.diff(self.times) <= 0):
+            raise ValueError("Record times must be strictly increasing")
+
+        if cycle_length is not None and self.times[-1] - self.times[0] >= cycle_length:
+            raise ValueError("Records span more than one cycle")
+
+        nx, ny = state.dimensions["xt"], state.dimensions["yt"]
+        global_slice, _ = distributed.get_chunk_slices(nx, ny, self.dims)
+        self._file_slice = tuple(global_slice[::-1])
+
+        file_shape = tuple(self._data.shape[1:][::-1])
+        if len(file_shape) != len(self.dims):
+            raise ValueError(f"Variable {variable} does not have dimensions {('time',) + self.dims[::-1]}")
+
+        # local arrays have ghost cells along decomposed dimensions
+        self._local_shape = []
+        self._interior = []
+
+        for dim, size in zip(self.dims, file_shape):
+            if dim in SCATTERED_DIMENSIONS[0] or dim in SCATTERED_DIMENSIONS[1]:
+                axis = 0 if dim in SCATTERED_DIMENSIONS[0] else 1
+                if size != (nx, ny)[axis]:
+                    raise ValueError(f"Size of dimension {dim} of variable {variable} does not match the model grid")
+
+                self._local_shape.append(distributed.get_chunk_size(nx, ny)[axis] + 4)
+                self._interior.append(slice(2, -2))
+            else:
+                self._local_shape.append(size)
+                self._interior.append(slice(None))
+
+        self._local_shape = tuple(self._local_shape)
+        self._interior = tuple(self._interior)
+
+        self._records = {}
+        self._pending = {}
+        self._executor = None
+
+        if prefetch:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="veros-forcing")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_interval(self, current_time):
+        """Get indices and weights of the records bracketing the given time.
+
+        Returns:
+           :obj:`tuple` containing (n1, f1), (n2, f2) (see :func:`veros.tools.get_periodic_interval`).
+        """
+        times = self.times
+        nrec = times.size
+        current_time = float(current_time)
+
+        if self.cycle_length is not None:
+            current_time = times[0] + (current_time - times[0]) % self.cycle_length
+            n1 = int(onp.searchsorted(times, current_time, side="right")) - 1
+            n2 = (n1 + 1) % nrec
+            spacing = (times[n2] - times[n1]) % self.cycle_length
+
+            if spacing == 0:
+                return (n1, 1.0), (n2, 0.0)
+
+            weight_2 = (current_time - times[n1]) / spacing
+            return (n1, 1.0 - weight_2), (n2, weight_2)
+
+        if current_time <= times[0]:
+            return (0, 1.0), (0, 0.0)
+
+        if current_time >= times[-1]:
+            return (nrec - 1, 1.0), (nrec - 1, 0.0)
+
+        n1 = int(onp.searchsorted(times, current_time, side="right")) - 1
+        weight_2 = (current_time - times[n1]) / (times[n1 + 1] - times[n1])
+        return (n1, 1.0 - weight_2), (n1 + 1, weight_2)
+
+    def _read_record(self, record):
+        # runs in the background, so must not communicate with other processes
+        return onp.asarray(self._data[(record,) + self._file_slice]).T
+
+    def _submit(self, record):
+        if record in self._records or record in self._pending:
+            return
+
+        if self._executor is None:
+            return
+
+        self._pending[record] = self._executor.submit(self._read_record, record)
+
+    def _get_record(self, record):
+        if record not in self._records:
+            if record in self._pending:
+                data = self._pending.pop(record).result()
+            else:
+                logger.debug(f"Reading record {record} of forcing variable {self.variable}")
+                data = self._read_record(record)
+
+            arr = update(npx.zeros(self._local_shape, dtype=data.dtype), at[self._interior], data)
+            self._records[record] = enforce_boundaries(arr, self.enable_cyclic_x)
+
+        return self._records[record]
+
+    def get(self, current_time):
+        """Get forcing at the given model time (in seconds), linearly interpolated
+        between records. Returns the local array including ghost cells."""
+        (n1, f1), (n2, f2) = self.get_interval(current_time)
+
+        data_1 = self._get_record(n1)
+        data_2 = self._get_record(n2)
+
+        next_record = n2 + 1
+        if self.cycle_length is not None:
+            next_record %= self.times.size
+
+        # drop records that are no longer needed
+        for record in list(self._records):
+            if record not in (n1, n2):
+                del self._records[record]
+
+        for record in list(self._pending):
+            if record != next_record:
+                self._pending.pop(record).cancel()
+
+        if next_record < self.times.size:
+            self._submit(next_record)
+
+        return f1 * data_1 + f2 * data_2
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self._pending.clear()
+        self._records.clear()
+
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
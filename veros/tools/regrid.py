@@ -0,0 +1,220 @@
+import functools
+import itertools
+import operator
+
+import numpy as onp
+import scipy.sparse
+
+from veros.core.operators import numpy as npx
+from veros.tools.setup import fill_holes
+
+FILE_VERSION = 1
+
+
+class Regridder:
+    """Interpolation between two regular grids with precomputed weights.
+
+    Gives the same results as :func:`veros.tools.interpolate`, but computes the
+    interpolation weights only once. Every call is a sparse matrix product, so
+    interpolating many fields (or all time records of a field at once) on the same pair
+    of grids is much cheaper. Filling missing values re-uses the nearest-neighbor lookup
+    of earlier calls with the same missing cells.
+
+    Arguments:
+       coords: Tuple of coordinate arrays for each dimension of the source grid.
+       interp_coords: Tuple of coordinate arrays to interpolate to.
+       kind (str, optional): Order of interpolation. Supported are `nearest` and
+          `linear` (default).
+
+    Example:
+       >>> regridder = Regridder((lon, lat), (vs.xt[2:-2], vs.yt[2:-2]))
+       >>> print(sst.shape)
+       (360, 180, 12)
+       >>> sst_interp = regridder(sst, missing_value=-1e20)
+       >>> regridder.save("weights_1deg.npz")  # re-use with Regridder.load
+
+    """
+
+    def __init__(self, coords, interp_coords, kind="linear"):
+        if len(coords) != len(interp_coords):
+            raise ValueError("Dimensions of coordinates do not match")
+
+        if kind not in ("linear", "nearest"):
+            raise ValueError(f"Unsupported interpolation kind {kind} (must be linear or nearest)")
+
+        self.kind = kind
+        self.coords = tuple(onp.array(c, dtype="float64") for c in coords)
+        self.interp_coords = tuple(onp.array(c, dtype="float64") for c in interp_coords)
+
+        for c in self.coords:
+            if c.ndim != 1 or c.size < 2:
+                raise ValueError("Source coordinates must be one-dimensional with at least 2 points")
+
+            if not (onp.all(onp.diff(c) > 0) or onp.all(onp.diff(c) < 0)):
+                raise ValueError("Source coordinates must be strictly monotonic")
+
+        indices, weights, out_of_bounds = self._compute_weights()
+        self._set_weights(indices, weights, out_of_bounds)
+
+    @property
+    def source_shape(self):
+        return tuple(c.size for c in self.coords)
+
+    @property
+    def target_shape(self):
+        return tuple(c.size for c in self.interp_coords)
+
+    def _compute_weights(self):
+        dim_indices, dim_weights = [], []
+        out_of_bounds = onp.zeros(self.target_shape, dtype="bool")
+
+        for axis, (source, target) in enumerate(zip(self.coords, self.interp_coords)):
+            index_offset = 0
+            if source[-1] < source[0]:
+                # interpolate on increasing coordinates, then flip indices back
+                source = source[::-1]
+                index_offset = source.size - 1
+
+            # same cell search as scipy.interpolate.interpn
+            lower = onp.clip(onp.searchsorted(source, target, side="right") - 1, 0, source.size - 2)
+            distance = (target - source[lower]) / (source[lower + 1] - source[lower])
+
+            if self.kind == "linear":
+                corner_indices = onp.stack([lower, lower + 1])
+                corner_weights = onp.stack([1 - distance, distance])
+            else:
+                corner_indices = onp.where(distance <= 0.5, lower, lower + 1)[onp.newaxis]
+                corner_weights = onp.ones((1, target.size))
+
+            if index_offset:
+                corner_indices = index_offset - corner_indices
+
+            dim_indices.append(corner_indices)
+            dim_weights.append(corner_weights)
+
+            expand = (onp.newaxis,) * axis + (slice(None),) + (onp.newaxis,) * (len(self.coords) - axis - 1)
+            out_of_bounds |= ((target < source[0]) | (target > source[-1]) | onp.isnan(target))[expand]
+
+        # combine per-dimension weights to weights of all cell corners
+        strides = onp.cumprod((1,) + self.source_shape[:0:-1])[::-1]
+        indices, weights = [], []
+        for corner in itertools.product(*(range(len(w)) for w in dim_weights)):
+            corner_index = onp.ix_(*(stride * idx[c] for idx, c, stride in zip(dim_indices, corner, strides)))
+            corner_weight = onp.ix_(*(w[c] for w, c in zip(dim_weights, corner)))
+            indices.append(functools.reduce(operator.add, corner_index).ravel())
+            weights.append(functools.reduce(operator.mul, corner_weight).ravel())
+
+        return onp.stack(indices, axis=-1), onp.stack(weights, axis=-1), out_of_bounds.ravel()
+
+    def _set_weights(self, indices, weights, out_of_bounds):
+        ntarget, ncorners = indices.shape
+        nsource = int(onp.prod(self.source_shape))
+        indptr = onp.arange(0, ntarget * ncorners + 1, ncorners)
+
+        # corners with zero weight are kept so that missing values propagate like in interpn
+        self._weight_matrix = scipy.sparse.csr_matrix((weights.ravel(), indices.ravel(), indptr), (ntarget, nsource))
+        self._stencil_matrix = scipy.sparse.csr_matrix(
+            (onp.ones(indices.size), indices.ravel(), indptr), (ntarget, nsource)
+        )
+        self._indices = indices
+        self._weights = weights
+        self._out_of_bounds = out_of_bounds
+        self._fill_cache = {}
+
+    def __call__(self, var, missing_value=None, fill=True):
+        """Interpolate data to the target grid.
+
+        Arguments:
+           var (:obj:`ndarray`): Data on the source grid. Trailing dimensions beyond
+              those of the source grid (e.g. time records) are interpolated independently.
+           missing_value (optional): Value denoting cells of missing data in ``var``.
+           fill (bool, optional): Whether `NaN` values should be replaced by the nearest
+              finite value after interpolating. Defaults to ``True``.
+
+        Returns:
+           :obj:`ndarray` of shape ``target_shape + var.shape[len(coords):]``.
+
+        """
+        var = onp.array(var, dtype="float64")
+        ndim = len(self.coords)
+
+        if var.shape[:ndim] != self.source_shape:
+            raise ValueError(f"Expected data with leading dimensions {self.source_shape}, got {var.shape}")
+
+        record_shape = var.shape[ndim:]
+        var = var.reshape(-1, int(onp.prod(record_shape)))
+
+        invalid = onp.isnan(var)
+        if missing_value is not None:
+            invalid |= onp.isclose(var, missing_value)
+
+        out = self._weight_matrix @ onp.where(invalid, 0, var)
+        invalid = ((self._stencil_matrix @ invalid.astype("float64")) > 0) | self._out_of_bounds[:, onp.newaxis]
+        out[invalid] = onp.nan
+
+        if fill:
+            for record in range(out.shape[1]):
+                out[:, record] = out[self._get_fill_index(invalid[:, record]), record]
+
+        return npx.asarray(out.reshape(self.target_shape + record_shape))
+
+    def _get_fill_index(self, invalid):
+        """Index of the nearest valid cell for every target cell (as in :func:`veros.tools.fill_holes`)."""
+        key = invalid.tobytes()
+
+        if key not in self._fill_cache:
+            cell_index = onp.where(invalid, onp.nan, onp.arange(invalid.size, dtype="float64"))
+            filled = onp.asarray(fill_holes(cell_index.reshape(self.target_shape))).ravel()
+            # keep missing values if there is nothing to fill from
+            self._fill_cache[key] = onp.where(onp.isnan(filled), onp.arange(invalid.size), filled).astype("int64")
+
+        return self._fill_cache[key]
+
+    def save(self, path):
+        """Write grids and interpolation weights to a ``.npz`` file."""
+        onp.savez(
+            path,
+            version=FILE_VERSION,
+            kind=self.kind,
+            indices=self._indices,
+            weights=self._weights,
+            out_of_bounds=self._out_of_bounds,
+            **{f"coords_{i}": c for i, c in enumerate(self.coords)},
+            **{f"interp_coords_{i}": c for i, c in enumerate(self.interp_coords)},
+        )
+
+    @classmethod
+    def load(cls, path, coords=None, interp_coords=None, kind=None):
+        """Read a regridder written by :meth:`save`.
+
+        If any of ``coords``, ``interp_coords``, or ``kind`` are given, they are checked
+        against the stored grids, and a :class:`ValueError` is raised if they differ.
+        """
+        with onp.load(path) as infile:
+            if int(infile["version"]) != FILE_VERSION:
+                raise ValueError(f"Regridding weights in {path} were written by an incompatible version")
+
+            ndim = sum(1 for key in infile.files if key.startswith("coords_"))
+
+            regridder = cls.__new__(cls)
+            regridder.kind = str(infile["kind"])
+            regridder.coords = tuple(infile[f"coords_{i}"] for i in range(ndim))
+            regridder.interp_coords = tuple(infile[f"interp_coords_{i}"] for i in range(ndim))
+            regridder._set_weights(infile["indices"], infile["weights"], infile["out_of_bounds"])
+
+        def grids_match(stored, given):
+            return len(stored) == len(given) and all(
+                s.shape == onp.shape(g) and onp.allclose(s, onp.asarray(g, dtype="float64"))
+                for s, g in zip(stored, given)
+            )
+
+        if coords is not None and not grids_match(regridder.coords, coords):
+            raise ValueError(f"Source grid does not match regridding weights in {path}")
+
+        if interp_coords is not None and not grids_match(regridder.interp_coords, interp_coords):
+            raise ValueError(f"Target grid does not match regridding weights in {path}")
+
+        if kind is not None and kind != regridder.kind:
+            raise ValueError(f"Regridding weights in {path} are for interpolation kind {regridder.kind}")
+
+        return regridder
@@ -52,35 +52,110 @@ def interpolate(coords, var, interp_coords, missing_value=None, fill=True, kind=
     return var
 
 
-def fill_holes(data):
+def get_interpolation_window(coords, interp_coords, margin=1):
+    """Find the part of the source grid that is needed to interpolate to the given target
+    coordinates.
+
+    This allows every process to read and interpolate only the source data around its own
+    subdomain (e.g. ``vs.xt[2:-2]`` inside a distributed routine), instead of reading the
+    global data on the first process.
+
+    Arguments:
+       coords: Tuple of monotonic source coordinate arrays for each dimension.
+       interp_coords: Tuple of coordinate arrays to interpolate to.
+       margin (int or tuple, optional): Number of additional source points on each side
+          (for all or each dimension), e.g. for smoothing the source data. Defaults to 1.
+
+    Returns:
+       :obj:`tuple` containing a slice into the source arrays for each dimension.
+
+    Example:
+       >>> window = get_interpolation_window((lon, lat), (vs.xt[2:-2], vs.yt[2:-2]))
+       >>> data = infile.variables["sst"][(Ellipsis,) + window[::-1]].T
+       >>> sst = interpolate((lon[window[0]], lat[window[1]]), data, (vs.xt[2:-2], vs.yt[2:-2]))
+
+    Note:
+       Filling missing values (see :func:`interpolate`) only takes values within the window
+       into account, so filled values close to the window boundary may differ from
+       interpolating the global data.
+
+    """
+    if len(coords) != len(interp_coords):
+        raise ValueError("Dimensions of coordinates do not match")
+
+    if isinstance(margin, int):
+        margin = (margin,) * len(coords)
+
+    if len(margin) != len(coords):
+        raise ValueError("Got different number of margins and dimensions")
+
+    window = []
+
+    for source, target, dim_margin in zip(coords, interp_coords, margin):
+        source = onp.asarray(source, dtype="float64")
+        target = onp.asarray(target, dtype="float64")
+
+        if source.size > 1 and source[-1] < source[0]:
+            # searchsorted needs increasing coordinates
+            source = -source
+            target = -target
+
+        start = onp.searchsorted(source, target.min(), side="right") - 1
+        stop = onp.searchsorted(source, target.max(), side="left") + 1
+        window.append(slice(max(int(start) - dim_margin, 0), min(int(stop) + dim_margin, source.size)))
+
+    return tuple(window)
+
+
+def fill_holes(data, axes=None):
     """A simple inpainting function that replaces NaN values in `data` with the
     nearest finite value.
+
+    Distances are measured in grid points. All holes are filled in a single pass using
+    a Euclidean distance transform.
+
+    Arguments:
+       data (:obj:`ndarray`): Data containing NaN values.
+       axes (tuple, optional): Axes along which to search for the nearest finite value.
+          All other axes are treated as independent records (e.g. time or vertical
+          levels). Defaults to all axes.
+
+    Returns:
+       :obj:`ndarray` of the same shape as ``data``. Records without any finite values
+       are returned unchanged.
+
     """
+    import scipy.ndimage
+
     data = onp.array(data)
-    dim = data.ndim
-    flag = ~onp.isnan(data)
+    invalid = onp.isnan(data)
+
+    if not onp.any(invalid):
+        return npx.asarray(data)
+
+    if axes is None:
+        axes = tuple(range(data.ndim))
 
-    slcs = [slice(None)] * dim
+    if any(not -data.ndim <= axis < data.ndim for axis in axes):
+        raise ValueError(f"Invalid axes {axes} for data with {data.ndim} dimensions")
 
-    while onp.any(~flag):
-        for i in range(dim):
-            slcs1 = slcs[:]
-            slcs2 = slcs[:]
-            slcs1[i] = slice(0, -1)
-            slcs2[i] = slice(1, None)
+    axes = tuple(axis % data.ndim for axis in axes)
+    fill_axes = tuple(range(data.ndim - len(axes), data.ndim))
 
-            slcs1 = tuple(slcs1)
-            slcs2 = tuple(slcs2)
+    # views with the fill axes last, so writing to them modifies data
+    records = onp.moveaxis(data, axes, fill_axes)
+    invalid = onp.moveaxis(invalid, axes, fill_axes)
 
-            # replace from the right
-            repmask = onp.logical_and(~flag[slcs1], flag[slcs2])
-            data[slcs1][repmask] = data[slcs2][repmask]
-            flag[slcs1][repmask] = True
+    for record in onp.ndindex(records.shape[: -len(axes)]):
+        record_invalid = invalid[record]
 
-            # replace from the left
-            repmask = onp.logical_and(~flag[slcs2], flag[slcs1])
-            data[slcs2][repmask] = data[slcs1][repmask]
-            flag[slcs2][repmask] = True
+        if record_invalid.all() or not record_invalid.any():
+            continue
+
+        nearest_valid = scipy.ndimage.distance_transform_edt(
+            record_invalid, return_distances=False, return_indices=True
+        )
+        records[record] = records[record][tuple(nearest_valid)]
 
     return npx.asarray(data)
 
@@ -146,29 +221,36 @@ def make_cyclic(longitude, array=None, wrap=360.0):
     return cyclic_longitudes, cyclic_array
 
 
-def get_coastline_distance(coords, coast_mask, spherical=False, radius=None, num_candidates=None):
-    """Calculate the (approximate) distance of each water cell from the nearest coastline.
+def get_coastline_distance(
+    coords, coast_mask, spherical=False, radius=None, num_candidates=None, subset=None, workers=None, chunk_size=2**18
+):
+    """Calculate the distance of each water cell from the nearest coastline.
+
+    Distances are computed with a KD-tree of all land cells. In spherical coordinates,
+    the tree is built from points on the unit sphere, so the nearest land cell by
+    chord length is also the nearest by great circle distance, and distances are exact.
 
     Arguments:
         coords (tuple of ndarrays): Tuple containing x and y (longitude and latitude)
             coordinate arrays of shape (nx, ny).
         coast_mask (ndarray): Boolean mask indicating whether a cell is a land cell
             (must be same shape as coordinate arrays).
-        spherical (bool): Use spherical instead of Cartesian coordinates.
-            When this is `True`, cyclical boundary conditions are used, and the
-            resulting distances are only approximate. Cells are pre-sorted by
-            Euclidean lon-lat distance, and great circle distances are calculated for
-            the first `num_candidates` elements. Defaults to `False`.
+        spherical (bool): Use spherical instead of Cartesian coordinates, with longitude
+            and latitude given in degrees. Defaults to `False`.
         radius (float): Radius of spherical coordinate system. Must be given when
             `spherical` is `True`.
-        num_candidates (int): Number of candidates to calculate great circle distances
-            for for each water cell. The higher this value, the more accurate the returned
-            distances become when `spherical` is `True`. Defaults to the square root
-            of the number of coastal cells.
+        num_candidates (int): Deprecated and ignored, distances are always exact.
+        subset (tuple of slices): Only calculate distances for this part of the grid,
+            e.g. the local subdomain of the current process (see example). Land cells
+            outside of the subset are still taken into account.
+        workers (int): Number of threads used to query the KD-tree. Defaults to all
+            available cores, or 1 for distributed runs.
+        chunk_size (int): Maximum number of cells that are queried at once, to limit
+            memory consumption.
 
     Returns:
-        :obj:`ndarray` of shape (nx, ny) indicating the distance to the nearest land
-        cell (0 if cell is land).
+        :obj:`ndarray` of shape (nx, ny) (or the shape of ``subset``) indicating the
+        distance to the nearest land cell (0 if cell is land).
 
     Example:
         The following returns coastal distances of all T cells for a spherical Veros setup.
@@ -176,6 +258,14 @@ def get_coastline_distance(coords, coast_mask, spherical=False, radius=None, num
         >>> coords = npx.meshgrid(vs.xt[2:-2], vs.yt[2:-2], indexing='ij')
         >>> dist = tools.get_coastline_distance(coords, vs.kbot > 0, spherical=True, radius=settings.radius)
 
+        Inside a distributed routine, coordinates and mask of the global grid can be used
+        to get distances on the local subdomain only:
+
+        >>> subset, _ = distributed.get_chunk_slices(settings.nx, settings.ny, ("xt", "yt"))
+        >>> dist = tools.get_coastline_distance(
+        ...     global_coords, global_land_mask, spherical=True, radius=settings.radius, subset=subset
+        ... )
+
     """
     if not len(coords) == 2:
         raise ValueError("coords must be lon-lat tuple")
@@ -184,35 +274,46 @@ def get_coastline_distance(coords, coast_mask, spherical=False, radius=None, num
     if spherical and not radius:
         raise ValueError("radius must be given for spherical coordinates")
 
-    watercoords = onp.array([c[~coast_mask] for c in coords]).T
-    if spherical:
-        coastcoords = onp.array(make_cyclic(coords[0][coast_mask], coords[1][coast_mask])).T
-    else:
-        coastcoords = onp.array((coords[0][coast_mask], coords[1][coast_mask])).T
-    coast_kdtree = scipy.spatial.cKDTree(coastcoords)
+    if num_candidates is not None:
+        import warnings
 
-    distance = onp.zeros(coords[0].shape)
+        warnings.warn("num_candidates is ignored, coastline distances are always exact", DeprecationWarning)
 
-    if spherical:
+    if workers is None:
+        from veros import runtime_state
 
-        def spherical_distance(coords1, coords2):
-            """Calculate great circle distance from latitude and longitude"""
-            coords1 *= onp.pi / 180.0
-            coords2 *= onp.pi / 180.0
-            lon1, lon2, lat1, lat2 = coords1[..., 0], coords2[..., 0], coords1[..., 1], coords2[..., 1]
-            return radius * onp.arccos(
-                onp.sin(lat1) * onp.sin(lat2) + onp.cos(lat1) * onp.cos(lat2) * onp.cos(lon1 - lon2)
-            )
+        workers = -1 if runtime_state.proc_num == 1 else 1
 
-        if not num_candidates:
-            num_candidates = int(onp.sqrt(onp.count_nonzero(~coast_mask)))
+    coords = tuple(onp.asarray(c, dtype="float64") for c in coords)
+    coast_mask = onp.asarray(coast_mask, dtype="bool")
 
-        i_nearest = coast_kdtree.query(watercoords, k=num_candidates)[1]
-        approx_nearest = coastcoords[i_nearest]
-        distance[~coast_mask] = onp.min(spherical_distance(approx_nearest, watercoords[..., onp.newaxis, :]), axis=-1)
+    if subset is None:
+        subset = (slice(None), slice(None))
 
-    else:
-        distance[~coast_mask] = coast_kdtree.query(watercoords)[0]
+    def to_points(x, y):
+        if not spherical:
+            return onp.stack((x, y), axis=-1)
+
+        lon, lat = onp.radians(x), onp.radians(y)
+        return onp.stack((onp.cos(lat) * onp.cos(lon), onp.cos(lat) * onp.sin(lon), onp.sin(lat)), axis=-1)
+
+    coast_kdtree = scipy.spatial.cKDTree(to_points(coords[0][coast_mask], coords[1][coast_mask]))
+
+    query_mask = ~coast_mask[subset]
+    query_points = to_points(coords[0][subset][query_mask], coords[1][subset][query_mask])
+
+    water_distance = onp.empty(len(query_points))
+    for start in range(0, len(query_points), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        water_distance[chunk] = coast_kdtree.query(query_points[chunk], workers=workers)[0]
+
+    if spherical:
+        # convert chord length to arc length, no land cells gives infinite distance
+        arc = 2 * radius * onp.arcsin(onp.minimum(water_distance / 2, 1))
+        water_distance = onp.where(onp.isinf(water_distance), onp.inf, arc)
+
+    distance = onp.zeros(query_mask.shape)
+    distance[query_mask] = water_distance
 
     return npx.asarray(distance)
 
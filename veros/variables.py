@@ -443,6 +443,14 @@ VARIABLES = {
         write_to_restart=True,
         mask=_get_psi_mask,
     ),
+    "psi_forc": Variable(
+        "Barotropic forcing",
+        T_HOR,
+        lambda settings: "1/s^2" if settings.enable_streamfunction else "m/s^2",
+        lambda settings: "Forcing of the streamfunction equation"
+        if settings.enable_streamfunction
+        else "Forcing of the surface pressure equation",
+    ),
     "dpsi": Variable(
         "Streamfunction tendency",
         ZETA_HOR + TIMESTEPS,
@@ -41,6 +41,7 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
         self._plugin_interfaces = tuple(load_plugin(p) for p in self.__veros_plugins__)
         self._setup_done = False
+        self._fused_main_loop = None
 
         self.state = get_default_state(plugin_interfaces=self._plugin_interfaces)
 
@@ -200,6 +201,9 @@ class VerosSetup(metaclass=abc.ABCMeta):
             settings.check_setting_conflicts(self.state.settings)
             distributed.validate_decomposition(self.state.dimensions)
 
+            if rs.fuse_timestep and rs.backend != "jax":
+                logger.warning("Fused time steps are only supported by the JAX backend, ignoring fuse_timestep")
+
             self.state.initialize_variables()
 
             self.state.diagnostics.update(diagnostics.create_default_diagnostics(self.state))
@@ -233,69 +237,91 @@ class VerosSetup(metaclass=abc.ABCMeta):
             self.set_forcing(self.state)
             isoneutral.check_isoneutral_slope_crit(self.state)
 
-        self._setup_done = True
+            build_exchange_plans(self.state)
 
-    @veros_routine
-    def step(self, state):
-        from veros import diagnostics, restart
-        from veros.core import idemix, eke, tke, momentum, thermodynamics, advection, utilities, isoneutral, numerics
+        self._setup_done = True
 
-        self._ensure_setup_done()
+    def _get_main_loop_routines(self, state):
+        from veros.core import idemix, eke, tke, momentum, thermodynamics, advection
 
-        vs = state.variables
         settings = state.settings
 
-        with state.timers["diagnostics"]:
-            restart.write_restart(state)
+        routines = [("forcing", self.set_forcing)]
 
-        with state.timers["main"]:
-            with state.timers["forcing"]:
-                self.set_forcing(state)
+        if settings.enable_idemix:
+            routines.append(("idemix", idemix.set_idemix_parameter))
+
+        routines.extend(
+            [
+                ("eke", eke.set_eke_diffusivities),
+                ("tke", tke.set_tke_diffusivities),
+                # the external mode solve is a separate routine, so fused time steps only execute it eagerly
+                ("momentum", momentum.momentum_tendencies),
+                ("momentum", momentum.solve_external_mode),
+                ("momentum", momentum.update_external_mode),
+                ("thermodynamics", thermodynamics.thermodynamics),
+            ]
+        )
 
-            if state.settings.enable_idemix:
-                with state.timers["idemix"]:
-                    idemix.set_idemix_parameter(state)
+        if settings.enable_eke or settings.enable_tke or settings.enable_idemix:
+            routines.append(("advection", advection.calculate_velocity_on_wgrid))
 
-            with state.timers["eke"]:
-                eke.set_eke_diffusivities(state)
+        if settings.enable_eke:
+            routines.append(("eke", eke.integrate_eke))
 
-            with state.timers["tke"]:
-                tke.set_tke_diffusivities(state)
+        if settings.enable_idemix:
+            routines.append(("idemix", idemix.integrate_idemix))
 
-            with state.timers["momentum"]:
-                momentum.momentum(state)
+        if settings.enable_tke:
+            routines.append(("tke", tke.integrate_tke))
 
-            with state.timers["thermodynamics"]:
-                thermodynamics.thermodynamics(state)
+        routines.extend(
+            [
+                ("boundary_exchange", exchange_prognostic_boundaries),
+                ("momentum", momentum.vertical_velocity),
+            ]
+        )
+
+        return routines
 
-            if settings.enable_eke or settings.enable_tke or settings.enable_idemix:
-                with state.timers["advection"]:
-                    advection.calculate_velocity_on_wgrid(state)
+    def _get_fused_main_loop(self, state):
+        from veros.routines import FusedRoutineChain
 
-            with state.timers["eke"]:
-                if state.settings.enable_eke:
-                    eke.integrate_eke(state)
+        with state.settings.unlock():
+            settings_hash = hash(tuple(state.settings.items()))
 
-            with state.timers["idemix"]:
-                if state.settings.enable_idemix:
-                    idemix.integrate_idemix(state)
+        # re-trace if settings have changed
+        if self._fused_main_loop is None or self._fused_main_loop[0] != settings_hash:
+            logger.debug("Tracing fused main loop")
+            fused_main_loop = FusedRoutineChain(state, self._get_main_loop_routines(state))
+            self._fused_main_loop = (settings_hash, fused_main_loop)
 
-            with state.timers["tke"]:
-                if state.settings.enable_tke:
-                    tke.integrate_tke(state)
+        return self._fused_main_loop[1]
+
+    @veros_routine
+    def step(self, state):
+        from veros import diagnostics, restart
+        from veros.core import isoneutral, numerics
+        from veros.core.operators import copy_counter
 
-            with state.timers["boundary_exchange"]:
-                vs.u = utilities.enforce_boundaries(vs.u, settings.enable_cyclic_x)
-                vs.v = utilities.enforce_boundaries(vs.v, settings.enable_cyclic_x)
-                if settings.enable_tke:
-                    vs.tke = utilities.enforce_boundaries(vs.tke, settings.enable_cyclic_x)
-                if settings.enable_eke:
-                    vs.eke = utilities.enforce_boundaries(vs.eke, settings.enable_cyclic_x)
-                if settings.enable_idemix:
-                    vs.E_iw = utilities.enforce_boundaries(vs.E_iw, settings.enable_cyclic_x)
+        self._ensure_setup_done()
+
+        vs = state.variables
+        settings = state.settings
+
+        with state.timers["diagnostics"]:
+            restart.write_restart(state)
 
-            with state.timers["momentum"]:
-                momentum.vertical_velocity(state)
+        copied_bytes = copy_counter.total_bytes
+
+        with state.timers["main"]:
+            if rs.fuse_timestep and rs.backend == "jax":
+                fused_main_loop = self._get_fused_main_loop(state)
+                fused_main_loop(state)
+            else:
+                for timer_name, routine in self._get_main_loop_routines(state):
+                    with state.timers[timer_name]:
+                        routine(state)
 
         with state.timers["plugins"]:
             for plugin in self._plugin_interfaces:
@@ -318,6 +344,9 @@ class VerosSetup(metaclass=abc.ABCMeta):
         # NOTE: benchmarks parse this, do not change / remove
         logger.debug(" Time step took {:.2f}s", state.timers["main"].last_time)
 
+        if rs.backend == "numpy":
+            logger.debug(" Update operators copied {:.2f}MB", (copy_counter.total_bytes - copied_bytes) / 1e6)
+
         # permutate time indices
         vs.taum1, vs.tau, vs.taup1 = vs.tau, vs.taup1, vs.taum1
 
@@ -333,6 +362,7 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
         """
         from veros import restart
+        from veros.io_tools import writer, netcdf as nctools
 
         self._ensure_setup_done()
 
@@ -368,6 +398,12 @@ class VerosSetup(metaclass=abc.ABCMeta):
 
         finally:
             restart.write_restart(self.state, force=True)
+
+            with self.state.timers["diagnostics"]:
+                restart.flush_staged_restarts()
+                writer.flush()
+                nctools.close_output_files()
+
             self._timing_summary()
 
     def _timing_summary(self):
@@ -423,6 +459,74 @@ class VerosSetup(metaclass=abc.ABCMeta):
             print_profile_summary(self.state.profile_timers, self.state.timers["main"].total_time)
 
 
+def _get_prognostic_exchange_vars(settings):
+    exchange_vars = ["u", "v"]
+
+    if settings.enable_tke:
+        exchange_vars.append("tke")
+
+    if settings.enable_eke:
+        exchange_vars.append("eke")
+
+    if settings.enable_idemix:
+        exchange_vars.append("E_iw")
+
+    return exchange_vars
+
+
+def build_exchange_plans(state):
+    """Build the overlap exchange plans used in the main loop ahead of time."""
+    vs = state.variables
+    settings = state.settings
+
+    # batched exchange of prognostic variables
+    exchange_vars = _get_prognostic_exchange_vars(settings)
+    exchange_arrs = [getattr(vs, var) for var in exchange_vars]
+    layouts = [
+        (
+            [arr.shape for arr in exchange_arrs],
+            [arr.dtype for arr in exchange_arrs],
+            [("xt", "yt")] * len(exchange_arrs),
+        )
+    ]
+
+    # single horizontal arrays (see veros.core.utilities.enforce_boundaries)
+    single_layouts = set()
+    for var in vs.fields():
+        dims = state.var_meta[var].dims
+
+        if not dims or len(dims) < 2:
+            continue
+
+        if dims[0] not in distributed.SCATTERED_DIMENSIONS[0] or dims[1] not in distributed.SCATTERED_DIMENSIONS[1]:
+            continue
+
+        arr = getattr(vs, var)
+        single_layouts.add((arr.shape, arr.dtype.str))
+
+        if dims[-1] == "timesteps":
+            single_layouts.add((arr.shape[:-1], arr.dtype.str))
+
+    layouts.extend(([shape], [dtype], [("xt", "yt")]) for shape, dtype in sorted(single_layouts))
+
+    distributed.build_exchange_plans(layouts, settings.enable_cyclic_x)
+
+
+@veros_routine
+def exchange_prognostic_boundaries(state):
+    from veros.core import utilities
+
+    vs = state.variables
+    settings = state.settings
+
+    exchange_vars = _get_prognostic_exchange_vars(settings)
+
+    exchanged = utilities.enforce_boundaries_batched(
+        tuple(getattr(vs, var) for var in exchange_vars), settings.enable_cyclic_x
+    )
+    vs.update(dict(zip(exchange_vars, exchanged)))
+
+
 def print_profile_summary(profile_timers, main_loop_time):
     profile_timings = ["", "Profile timings:", "[total time spent (% of main loop)]", "---"]
     maxwidth = max(len(k) for k in profile_timers.keys())